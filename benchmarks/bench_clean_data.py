@@ -0,0 +1,81 @@
+"""
+Measures peak memory and wall time of cleaning a synthetic frame with the
+schema of the project dataset: the implementation before single-mask cleaning
+(dropna, column selection, one `isin` filter per class and `reset_index`),
+once over every column and once over the selected features only, against
+Transform.clean_data in legacy and mask mode.
+
+Run from the project root:
+    python -m benchmarks.bench_clean_data --rows 10000000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.generator import make_frame
+from configuration.config import BaseConfig as config
+from lessons.transform.transform_data import Transform
+
+
+def baseline_clean(df: pd.DataFrame, features: List[str], classes: Dict[str, list],
+                   subset: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Cleaning as implemented before the single mask, every step copying the frame
+
+    Args:
+        df: Data before cleaning
+        features: Features to select
+        classes: A dictionary storing feature and their classes to select
+        subset: Columns checked for empty fields, every column if None
+
+    Returns:
+        pd.DataFrame: Cleaned data
+    """
+    df = df.dropna(subset=subset)
+    df = df[features]
+    for feature, class_list in classes.items():
+        df = df[df[feature].isin(class_list)]
+    return df.reset_index(drop=True)
+
+
+def measure(clean: Callable[[], pd.DataFrame]) -> tuple:
+    """
+    Args:
+        clean: Function cleaning the data
+
+    Returns:
+        tuple: Wall time in seconds, traced peak in bytes and number of kept rows
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = clean()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"rows: {args.rows}")
+    print(f"{'mode':<16}{'time [s]':>10}{'peak [MiB]':>12}{'rows kept':>12}")
+    modes = {
+        "before": lambda: baseline_clean(df, config.FEATURES, config.CLASSES),
+        "before, subset": lambda: baseline_clean(df, config.FEATURES, config.CLASSES, config.FEATURES),
+        "legacy": lambda: Transform(df, config.FEATURES, config.CLASSES, True).clean_data(),
+        "mask": lambda: Transform(df, config.FEATURES, config.CLASSES, False).clean_data(),
+    }
+    for name, clean in modes.items():
+        elapsed, peak, kept = measure(clean)
+        print(f"{name:<16}{elapsed:>10.3f}{peak / 2**20:>12.1f}{kept:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares ingesting a large CSV file with plain `pd.read_csv` against
+the columnar Feather cache of Loader.
+
+Run from the project root:
+    python -m benchmarks.bench_columnar_cache --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+import pandas as pd
+
+from benchmarks.generator import write_dataset
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """
+    Args:
+        func: Function to time
+        repeat: Number of runs
+
+    Returns:
+        float: Fastest wall time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "dataset.csv")
+        write_dataset(csv_path, args.rows)
+        loader = Loader(None, csv_path,
+                        cache_path=os.path.join(tmp_dir, "dataset.feather"),
+                        categorical_columns=config.CATEGORICAL_COLUMNS)
+
+        read_csv = best_of(lambda: pd.read_csv(csv_path), args.repeat)
+        build = best_of(loader.build_cache, 1)
+        cached = best_of(loader.ingest_data, args.repeat)
+
+    print(f"rows: {args.rows}")
+    print(f"{'pd.read_csv':<24}{read_csv:>10.3f} s")
+    print(f"{'build_cache':<24}{build:>10.3f} s")
+    print(f"{'ingest_data (cached)':<24}{cached:>10.3f} s")
+    print(f"{'speedup':<24}{read_csv / cached:>10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares stored size, download time and ingest time of a synthetic CSV file saved
+uncompressed and compressed with gzip and zstd at several levels.
+
+Run from the project root:
+    python -m benchmarks.bench_compression --rows 1000000 --bandwidth 50
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+from benchmarks.generator import write_dataset
+from lessons.extract.load_data import Loader
+from lessons.extract.stub_server import StubServer
+
+CHUNK_SIZE = 256 * 1024
+CODECS = [("none", "", None), ("gzip", ".gz", 1), ("gzip", ".gz", 6), ("gzip", ".gz", 9),
+          ("zstd", ".zst", 3), ("zstd", ".zst", 10), ("zstd", ".zst", 19)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--bandwidth", type=float, default=50, help="Throughput of the server in MiB/s")
+    args = parser.parse_args()
+    codecs = [codec for codec in CODECS if codec[0] != "zstd" or importlib.util.find_spec("zstandard")]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.csv")
+        write_dataset(source, args.rows)
+        with open(source, 'rb') as file:
+            payload = file.read()
+        throttle = CHUNK_SIZE / (args.bandwidth * 2**20)
+
+        print(f"rows: {args.rows}, size: {len(payload) / 2**20:.1f} MiB, bandwidth: {args.bandwidth:g} MiB/s")
+        print(f"{'codec':<7}{'level':>6}{'stored [MiB]':>14}{'ratio':>7}{'compress [s]':>14}"
+              f"{'download [s]':>14}{'ingest [s]':>12}")
+        for name, suffix, level in codecs:
+            path = os.path.join(tmp_dir, f"dataset_{name}_{level}.csv{suffix}")
+            with StubServer(payload, chunk_size=CHUNK_SIZE) as server:
+                loader = Loader(server.url, path, CHUNK_SIZE, compression_level=level)
+                start = time.perf_counter()
+                loader.save_stream(loader.download_file(stream=True))
+                compress_time = time.perf_counter() - start
+            stored = os.path.getsize(path)
+
+            with open(path, 'rb') as file, StubServer(file.read(), chunk_size=CHUNK_SIZE, throttle=throttle) as server:
+                loader = Loader(server.url + suffix, os.path.join(tmp_dir, f"copy.csv{suffix}"), CHUNK_SIZE)
+                start = time.perf_counter()
+                loader.save_stream(loader.download_file(stream=True))
+                download_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loader.ingest_data()
+            ingest_time = time.perf_counter() - start
+            print(f"{name:<7}{str(level or '-'):>6}{stored / 2**20:>14.1f}{len(payload) / stored:>7.1f}"
+                  f"{compress_time:>14.3f}{download_time:>14.3f}{ingest_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
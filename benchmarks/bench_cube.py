@@ -0,0 +1,63 @@
+"""
+Compares the time to answer several feature and class selections of a synthetic
+CSV file with the eager pandas path and with slicing a precomputed count cube.
+
+Run from the project root:
+    python -m benchmarks.bench_cube --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.generator import write_dataset
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from pipeline.cube import CountCube
+
+QUERIES = [(['platform', 'genre'], {'platform': ['PS4', 'XOne', 'PC', 'WiiU']}),
+           (['platform', 'genre'], {'platform': ['PS4', 'PC'], 'year_of_release': [2015, 2016]}),
+           (['platform', 'rating'], {'rating': ['E', 'M', 'T']}),
+           (['genre', 'year_of_release'], {})]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "dataset.csv")
+        write_dataset(csv_path, args.rows)
+        loader = Loader(None, csv_path)
+
+        start = time.perf_counter()
+        cube = CountCube.for_file(os.path.join(tmp_dir, "dataset.cube.npz"), loader)
+        print(f"rows: {args.rows}, cube: {' x '.join(map(str, cube.counts.shape))}, "
+              f"build: {time.perf_counter() - start:.3f} s")
+
+        start = time.perf_counter()
+        cube = CountCube.for_file(os.path.join(tmp_dir, "dataset.cube.npz"), loader)
+        print(f"load: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        df = loader.ingest_data()
+        print(f"{'query':<84}{'pandas [ms]':>13}{'cube [ms]':>11}")
+        for features, classes in QUERIES:
+            start = time.perf_counter()
+            transform = Transform(df, features, classes)
+            transform.clean_data()
+            transform.group_and_count()
+            expected = transform.sort_data()
+            eager_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = cube.query(features, classes)
+            cube_time = time.perf_counter() - start
+            pd.testing.assert_frame_equal(result, expected)
+            print(f"{str(features) + ' ' + str(classes):<84}{eager_time * 1000:>13.1f}{cube_time * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
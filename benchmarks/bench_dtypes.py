@@ -0,0 +1,45 @@
+"""
+Compares memory, ingest time and transform time of a synthetic dataset
+ingested with the pandas default dtypes and with the BaseConfig.DTYPES profile.
+
+Run from the project root:
+    python -m benchmarks.bench_dtypes --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.generator import write_dataset
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "dataset.csv")
+        write_dataset(csv_path, args.rows)
+
+        print(f"rows: {args.rows}")
+        print(f"{'dtypes':<10}{'memory [MiB]':>14}{'ingest [s]':>12}{'transform [s]':>15}")
+        for name, dtypes in (("default", None), ("profile", config.DTYPES)):
+            start = time.perf_counter()
+            df = Loader(None, csv_path, dtypes=dtypes).ingest_data()
+            ingest_time = time.perf_counter() - start
+            memory = df.memory_usage(deep=True).sum() / 2**20
+
+            start = time.perf_counter()
+            transform = Transform(df, config.FEATURES, config.CLASSES, config.LEGACY_DROPNA, config.ENGINE)
+            transform.clean_data()
+            transform.group_and_count()
+            transform.sort_data()
+            print(f"{name:<10}{memory:>14.1f}{ingest_time:>12.3f}{time.perf_counter() - start:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
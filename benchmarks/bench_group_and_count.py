@@ -0,0 +1,74 @@
+"""
+Compares the groupby and bincount engines of Transform.group_and_count,
+followed by sort_data, on cleaned platform/genre frames of growing size,
+with object and categorical columns.
+
+Run from the project root:
+    python -m benchmarks.bench_group_and_count --rows 1000000 10000000 100000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generator import GENRES
+from configuration.config import BaseConfig as config
+from lessons.transform.transform_data import Transform
+
+
+def make_cleaned_frame(rows: int, categorical: bool, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a frame as returned by `clean_data` for the configured features and classes
+
+    Args:
+        rows: Number of rows
+        categorical: If True, the columns have categorical dtype
+        seed: Seed of the random generator
+
+    Returns:
+        pd.DataFrame: Synthetic cleaned data
+    """
+    rng = np.random.default_rng(seed)
+    platforms = np.array(config.CLASSES["platform"], dtype=object)
+    genres = np.array(GENRES, dtype=object)
+    df = pd.DataFrame({"platform": platforms[rng.integers(0, len(platforms), rows)],
+                       "genre": genres[rng.integers(0, len(genres), rows)]})
+    return df.astype("category") if categorical else df
+
+
+def run(df: pd.DataFrame, engine: str) -> tuple:
+    """
+    Args:
+        df: Cleaned data
+        engine: Counting engine passed to Transform
+
+    Returns:
+        tuple: Wall time in seconds and the sorted counts
+    """
+    transform = Transform(df, config.FEATURES, config.CLASSES, engine=engine)
+    start = time.perf_counter()
+    transform.group_and_count()
+    result = transform.sort_data()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 100_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>12}{'dtype':>13}{'groupby [s]':>13}{'bincount [s]':>14}{'speedup':>10}")
+    for rows in args.rows:
+        for categorical in (False, True):
+            df = make_cleaned_frame(rows, categorical)
+            groupby, expected = run(df, "groupby")
+            bincount, result = run(df, "bincount")
+            pd.testing.assert_frame_equal(result, expected)
+            dtype = "category" if categorical else "object"
+            print(f"{rows:>12}{dtype:>13}{groupby:>13.3f}{bincount:>14.3f}{groupby / bincount:>9.1f}x")
+            del df
+
+
+if __name__ == "__main__":
+    main()
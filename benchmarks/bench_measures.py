@@ -0,0 +1,60 @@
+"""
+Compares computing several measures per platform and genre in one pass of
+Transform.aggregate with a pandas groupby per measure.
+
+Run from the project root:
+    python -m benchmarks.bench_measures --rows 1000000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.generator import make_frame
+from configuration.config import BaseConfig as config
+from lessons.transform.transform_data import Measure, Transform
+
+MEASURES = ["count", "sum:na_sales", "sum:eu_sales", "mean:global_sales", "quantile:global_sales:0.9"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    measures = [Measure.parse(spec) for spec in MEASURES]
+    transform = Transform(df, config.FEATURES, config.CLASSES, measures=measures)
+    cleaned = transform.clean_data()
+
+    start = time.perf_counter()
+    transform.aggregate()
+    result = transform.sort_data()
+    single_pass = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grouped = cleaned.groupby(config.FEATURES, observed=True)
+    columns = {}
+    for measure in measures:
+        if measure.function == "count":
+            columns[measure.name] = grouped.size()
+        elif measure.function == "quantile":
+            columns[measure.name] = grouped[measure.column].quantile(measure.q)
+        else:
+            columns[measure.name] = grouped[measure.column].agg(measure.function)
+    expected = Transform(pd.DataFrame(columns).reset_index(), config.FEATURES, config.CLASSES).sort_data()
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Transform(cleaned[config.FEATURES], config.FEATURES, config.CLASSES).group_and_count()
+    count_only = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    print(f"rows: {args.rows}, groups: {len(result)}, measures: {len(measures)}")
+    print(f"{'count only':<14}{count_only:>8.3f} s")
+    print(f"{'single pass':<14}{single_pass:>8.3f} s")
+    print(f"{'per measure':<14}{separate:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
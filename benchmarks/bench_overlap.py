@@ -0,0 +1,80 @@
+"""
+Compares downloading and then counting a synthetic CSV file from a throttled local
+server with counting it while it downloads. Both use the Loader arguments of the
+configuration, so the eager cache build is part of both timings.
+
+Run from the project root:
+    python -m benchmarks.bench_overlap --rows 1000000 --bandwidth 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.generator import write_dataset
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.extract.stub_server import StubServer
+from lessons.transform.transform_data import Transform
+from pipeline.streaming import StreamingAggregator
+
+CHUNK_SIZE = 256 * 1024
+
+
+def production_loader(url: str, save_path: str) -> Loader:
+    """
+    Args:
+        url: URL of the throttled server
+        save_path: Path to store the data
+
+    Returns:
+        Loader: Loader with the cache and ingestion profile of the configuration
+    """
+    cache_path = os.path.splitext(save_path)[0] + ".feather" if config.CACHE_PATH else None
+    return Loader(url, save_path, CHUNK_SIZE, cache_path, config.CATEGORICAL_COLUMNS,
+                  config.EAGER_CACHE, config.DTYPES, compression_level=config.COMPRESSION_LEVEL)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--bandwidth", type=float, default=50, help="Throughput of the server in MiB/s")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.csv")
+        write_dataset(source, args.rows)
+        with open(source, 'rb') as file:
+            payload = file.read()
+        throttle = CHUNK_SIZE / (args.bandwidth * 2**20)
+
+        with StubServer(payload, chunk_size=CHUNK_SIZE, throttle=throttle) as server:
+            loader = production_loader(server.url, os.path.join(tmp_dir, "sequential.csv"))
+            start = time.perf_counter()
+            loader.fetch_file()
+            network = time.perf_counter() - start
+            transform = Transform(loader.ingest_data(), config.FEATURES, config.CLASSES,
+                                  config.LEGACY_DROPNA, config.ENGINE)
+            transform.clean_data()
+            transform.group_and_count()
+            expected = transform.sort_data()
+            sequential = time.perf_counter() - start
+
+            loader = production_loader(server.url, os.path.join(tmp_dir, "overlapped.csv"))
+            start = time.perf_counter()
+            df = StreamingAggregator(loader, config.FEATURES, config.CLASSES, config.LEGACY_DROPNA,
+                                     config.ENGINE, config.OVERLAP_QUEUE_SIZE).aggregate()
+            overlapped = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(df, expected)
+        print(f"rows: {args.rows}, size: {len(payload) / 2**20:.0f} MiB, bandwidth: {args.bandwidth:g} MiB/s")
+        print(f"{'fetch':<12}{network:>8.3f} s")
+        print(f"{'count':<12}{sequential - network:>8.3f} s")
+        print(f"{'sequential':<12}{sequential:>8.3f} s")
+        print(f"{'overlapped':<12}{overlapped:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures the wall time of ParallelAggregator over CSV shards for a growing
+number of worker processes, against a serial run over the same shards.
+
+Run from the project root:
+    python -m benchmarks.bench_parallel --shards 16 --rows 500000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.generator import write_dataset
+from configuration.config import BaseConfig as config
+from lessons.transform.transform_data import Transform
+from pipeline.parallel import ParallelAggregator, count_shard
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=500_000, help="rows per shard")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for shard in range(args.shards):
+            path = os.path.join(tmp_dir, f"shard_{shard}.csv")
+            write_dataset(path, args.rows, seed=shard)
+            paths.append(path)
+
+        start = time.perf_counter()
+        transform = Transform(None, config.FEATURES, config.CLASSES, engine=config.ENGINE)
+        transform.merge_counts([count_shard(path, config.FEATURES, config.CLASSES, engine=config.ENGINE)
+                                for path in paths])
+        expected = transform.sort_data()
+        serial = time.perf_counter() - start
+        print(f"{'serial':<12}{serial:>10.3f} s")
+
+        for workers in args.workers:
+            aggregator = ParallelAggregator(paths, config.FEATURES, config.CLASSES, workers, engine=config.ENGINE)
+            start = time.perf_counter()
+            result = aggregator.aggregate()
+            elapsed = time.perf_counter() - start
+            pd.testing.assert_frame_equal(result, expected)
+            print(f"{f'{workers} workers':<12}{elapsed:>10.3f} s{serial / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
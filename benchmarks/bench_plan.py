@@ -0,0 +1,68 @@
+"""
+Compares wall time and traced peak memory of the eager Transform with the
+optimized lazy plan, which reads only the needed columns as categoricals.
+
+Run from the project root:
+    python -m benchmarks.bench_plan --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import pandas as pd
+
+from benchmarks.generator import write_dataset
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from pipeline.plan import LazyTransform
+
+
+def measure(run: Callable[[], pd.DataFrame]) -> tuple:
+    """
+    Returns:
+        tuple: Wall time in seconds and traced peak in bytes
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "dataset.csv")
+        write_dataset(csv_path, args.rows)
+        loader = Loader(None, csv_path)
+
+        def eager() -> pd.DataFrame:
+            transform = Transform(loader.ingest_data(), config.FEATURES, config.CLASSES,
+                                  config.LEGACY_DROPNA, config.ENGINE)
+            transform.clean_data()
+            transform.group_and_count()
+            return transform.sort_data()
+
+        def plan(streaming: bool) -> Callable[[], pd.DataFrame]:
+            lazy = LazyTransform(loader, config.FEATURES, config.CLASSES, config.LEGACY_DROPNA, config.ENGINE)
+            lazy.clean_data().group_and_count().sort_data()
+            return lambda: lazy.collect(streaming, config.INGEST_CHUNKSIZE)
+
+        print(f"rows: {args.rows}")
+        print(f"{'mode':<16}{'time [s]':>10}{'peak [MiB]':>12}")
+        for name, run in (("eager", eager), ("plan", plan(False)), ("plan streaming", plan(True))):
+            elapsed, peak = measure(run)
+            print(f"{name:<16}{elapsed:>10.3f}{peak / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares the render time per chart of the default BarPlot with its fast
+mode, which draws one collection on a reused Agg figure without pyplot.
+
+Run from the project root:
+    python -m benchmarks.bench_render --charts 100
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from lessons.visualize.visualization import BarPlot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--charts", type=int, default=100)
+    args = parser.parse_args()
+
+    transform = Transform(Loader(None, config.DATA_PATH).ingest_data(), config.FEATURES, config.CLASSES)
+    transform.clean_data()
+    transform.group_and_count()
+    df = transform.sort_data()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plot_path = os.path.join(tmp_dir, "graph.png")
+        print(f"{'mode':<10}{'ms/chart':>10}{'charts/min':>12}{'open figures':>14}")
+        for name, make_plot in (("default", lambda: BarPlot()), ("fast", lambda: BarPlot(fast=True))):
+            bar_plot = make_plot()
+            start = time.perf_counter()
+            for _ in range(args.charts):
+                if name == "default":
+                    bar_plot = make_plot()
+                bar_plot.create_plot(df)
+                bar_plot.save_image(plot_path)
+            per_chart = (time.perf_counter() - start) / args.charts
+            print(f"{name:<10}{per_chart * 1000:>10.1f}{60 / per_chart:>12.0f}{len(plt.get_fignums()):>14}")
+
+
+if __name__ == "__main__":
+    main()
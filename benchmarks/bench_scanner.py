@@ -0,0 +1,60 @@
+"""
+Compares the time to count platform/genre pairs of a synthetic CSV file
+with the eager pandas path, the lazy plan and the memory-mapped scanner.
+
+Run from the project root:
+    python -m benchmarks.bench_scanner --rows 2000000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.generator import write_dataset
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from pipeline.plan import LazyTransform
+from pipeline.scanner import MmapCounter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "dataset.csv")
+        write_dataset(csv_path, args.rows)
+        loader = Loader(None, csv_path)
+
+        def eager() -> pd.DataFrame:
+            transform = Transform(loader.ingest_data(), config.FEATURES, config.CLASSES, engine=config.ENGINE)
+            transform.clean_data()
+            transform.group_and_count()
+            return transform.sort_data()
+
+        def plan() -> pd.DataFrame:
+            lazy = LazyTransform(loader, config.FEATURES, config.CLASSES, engine=config.ENGINE)
+            return lazy.clean_data().group_and_count().sort_data().collect()
+
+        runs = [("pandas", eager), ("plan", plan)]
+        runs += [(f"scan, {workers} workers", MmapCounter(csv_path, config.FEATURES, config.CLASSES, workers).count)
+                 for workers in sorted({1, args.workers})]
+
+        print(f"rows: {args.rows}, size: {os.path.getsize(csv_path) / 2**20:.0f} MiB")
+        expected = None
+        for name, run in runs:
+            start = time.perf_counter()
+            df = run()
+            elapsed = time.perf_counter() - start
+            expected = df if expected is None else expected
+            pd.testing.assert_frame_equal(df, expected)
+            print(f"{name:<20}{elapsed:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Load-tests the chart service on localhost: starts it on a synthetic CSV file,
+sends chart requests for random platform subsets from concurrent clients and
+reports client-side latencies next to the cost of one chart in a fresh process.
+
+Run from the project root:
+    python -m benchmarks.bench_service --rows 1000000 --requests 2000 --clients 8
+    python -m benchmarks.bench_service --socket
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+from benchmarks.generator import PLATFORMS, write_dataset
+from pipeline.service import UnixHTTPConnection
+
+COLD_CHART = """
+import sys
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from lessons.visualize.visualization import BarPlot
+transform = Transform(Loader(None, sys.argv[1], dtypes=config.DTYPES).ingest_data(), config.FEATURES, config.CLASSES)
+transform.clean_data()
+transform.group_and_count()
+bar_plot = BarPlot(fast=True)
+bar_plot.create_plot(transform.sort_data())
+bar_plot.render_png()
+"""
+
+
+def free_port() -> int:
+    """
+    Returns:
+        int: A port nothing listens on at the moment
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_ready(connect: Callable[[], http.client.HTTPConnection], timeout: float = 120) -> None:
+    """
+    Args:
+        connect: Function opening a connection to the service
+        timeout: Seconds to wait for the service to load the data
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = connect()
+            connection.request("GET", "/metrics")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run_client(connect: Callable[[], http.client.HTTPConnection], paths: List[str]) -> List[float]:
+    """
+    Args:
+        connect: Function opening a connection to the service
+        paths: Request paths sent one after another over one connection
+
+    Returns:
+        List[float]: Latency of every request in seconds
+    """
+    connection = connect()
+    latencies = []
+    for path in paths:
+        start = time.perf_counter()
+        connection.request("GET", path)
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"{path}: {response.status} {body[:200]!r}")
+    connection.close()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--distinct", type=int, default=64, help="Number of distinct charts requested")
+    parser.add_argument("--socket", action="store_true", help="Use a Unix socket instead of a TCP port")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "dataset.csv")
+        write_dataset(data_path, args.rows)
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", COLD_CHART, data_path], check=True, capture_output=True)
+        cold = time.perf_counter() - start
+
+        command = [sys.executable, "-m", "pipeline.service", "--data", data_path]
+        if args.socket:
+            socket_path = os.path.join(tmp_dir, "charts.sock")
+            command += ["--socket", socket_path]
+            connect = lambda: UnixHTTPConnection(socket_path)
+        else:
+            port = free_port()
+            command += ["--port", str(port)]
+            connect = lambda: http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+        rng = random.Random(0)
+        charts = [sorted(rng.sample(PLATFORMS, rng.randint(2, len(PLATFORMS)))) for _ in range(args.distinct)]
+        paths = ["/chart?features=platform,genre&classes=" + json.dumps({"platform": chart}).replace(" ", "")
+                 for chart in (rng.choice(charts) for _ in range(args.requests))]
+
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            start = time.perf_counter()
+            wait_ready(connect)
+            startup = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.clients) as executor:
+                latencies = sum(executor.map(run_client, [connect] * args.clients,
+                                             [paths[client::args.clients] for client in range(args.clients)]), [])
+            elapsed = time.perf_counter() - start
+
+            connection = connect()
+            connection.request("GET", "/metrics")
+            metrics = json.loads(connection.getresponse().read())
+            connection.close()
+        finally:
+            server.terminate()
+            server.wait()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"rows: {args.rows}, requests: {args.requests}, clients: {args.clients}, "
+          f"distinct charts: {args.distinct}, transport: {'unix socket' if args.socket else 'tcp'}")
+    print(f"{'cold process per chart':<26}{cold * 1000:>10.1f} ms")
+    print(f"{'service startup':<26}{startup * 1000:>10.1f} ms")
+    print(f"{'client p50':<26}{p50:>10.2f} ms")
+    print(f"{'client p99':<26}{p99:>10.2f} ms")
+    print(f"{'server p50':<26}{metrics['p50_ms']:>10.2f} ms")
+    print(f"{'server p99':<26}{metrics['p99_ms']:>10.2f} ms")
+    print(f"{'throughput':<26}{args.requests / elapsed:>10.1f} charts/s")
+    print(f"{'cache hits':<26}{metrics['hits']:>10d} / {metrics['requests']}")
+
+
+if __name__ == "__main__":
+    main()
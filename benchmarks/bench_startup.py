@@ -0,0 +1,114 @@
+"""
+Measures the import time of the pipeline entry points with `python -X importtime`
+and fails when an entry point got slower than a baseline or imports a heavy library.
+
+Run from the project root:
+    python -m benchmarks.bench_startup --output startup.json
+    python -m benchmarks.bench_startup --baseline startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.suite import compare
+
+ENTRY_POINTS = ["main", "pipeline.memo", "pipeline.instrumentation",
+                "lessons.extract.load_data", "lessons.visualize.visualization"]
+HEAVY_LIBRARIES = ["pandas", "matplotlib", "pyarrow", "requests"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    Args:
+        output: Standard error of a process run with `-X importtime`
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds of every imported module
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Imports a module in a fresh interpreter
+
+    Args:
+        module: Dotted name of the module
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds of every module imported with it
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def run_startup(modules: List[str], repeats: int) -> Dict[str, Any]:
+    """
+    Args:
+        modules: Dotted names of the entry points
+        repeats: Number of fresh interpreters per entry point
+
+    Returns:
+        Dict[str, Any]: Import time of every entry point in seconds, in the format of `run_suite`,
+            and the heavy libraries each of them imports
+    """
+    results = {"metadata": {"python": sys.version.split()[0], "repeats": repeats}, "stages": {}, "heavy": {}}
+    for module in modules:
+        runs, heavy = [], set()
+        for _ in range(repeats):
+            times = measure(module)
+            runs.append(times.get(module, 0) / 1e6)
+            heavy.update(name for name in times if name.split(".")[0] in HEAVY_LIBRARIES)
+        results["stages"][module] = {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+        results["heavy"][module] = sorted({name.split(".")[0] for name in heavy})
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=ENTRY_POINTS)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Path of the JSON results")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed relative slowdown of an import median")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="Slowdowns below this many seconds are ignored")
+    args = parser.parse_args()
+
+    results = run_startup(args.modules, args.repeats)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    print(f"{'module':<34}{'min [ms]':>10}{'median [ms]':>13}  heavy imports")
+    for module, timing in results["stages"].items():
+        print(f"{module:<34}{timing['min'] * 1000:>10.1f}{timing['median'] * 1000:>13.1f}"
+              f"  {', '.join(results['heavy'][module]) or '-'}")
+    failed = any(results["heavy"].values())
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            rows = compare(results, json.load(file), args.threshold, args.min_delta)
+        print(f"\n{'module':<34}{'baseline [ms]':>15}{'current [ms]':>14}{'ratio':>8}")
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['stage']:<34}{row['baseline'] * 1000:>15.1f}{row['current'] * 1000:>14.1f}"
+                  f"{row['ratio']:>8.2f}{flag}")
+        failed = failed or any(row["regression"] for row in rows)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
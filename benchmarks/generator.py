@@ -0,0 +1,106 @@
+"""
+Generates synthetic game-sales data with the schema of data/dataset.csv.
+
+Run from the project root:
+    python -m benchmarks.generator data/synthetic.csv --rows 1000000 --platforms 10 --genres 12
+"""
+import argparse
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ["PS4", "XOne", "PC", "WiiU", "3DS", "PSV", "PS3", "X360", "Wii", "DS"]
+GENRES = ["Action", "Adventure", "Fighting", "Misc", "Platform", "Puzzle",
+          "Racing", "Role-Playing", "Shooter", "Simulation", "Sports", "Strategy"]
+RATINGS = ["E", "T", "M", "E10+"]
+COLUMNS = ["name", "platform", "year_of_release", "genre", "publisher",
+           "na_sales", "eu_sales", "jp_sales", "other_sales", "global_sales",
+           "critic_score", "critic_count", "user_score", "user_count", "developer", "rating"]
+
+
+def labels(known: List[str], count: int, prefix: str) -> np.ndarray:
+    """
+    Args:
+        known: Real labels used first
+        count: Number of labels
+        prefix: Prefix of generated labels once the real ones run out
+
+    Returns:
+        np.ndarray: Object array of labels
+    """
+    extra = [f"{prefix}{i}" for i in range(max(0, count - len(known)))]
+    return np.array((known + extra)[:count], dtype=object)
+
+
+def make_frame(rows: int, platforms: int = len(PLATFORMS), genres: int = len(GENRES), seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a frame with the columns of the project dataset. Scores, developer
+    and rating are missing in a large share of the rows as in the real data,
+    and some game names contain commas and quotes
+
+    Args:
+        rows: Number of rows
+        platforms: Number of distinct platforms
+        genres: Number of distinct genres
+        seed: Seed of the random generator
+
+    Returns:
+        pd.DataFrame: Synthetic data
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(values: np.ndarray) -> np.ndarray:
+        return values[rng.integers(0, len(values), rows)]
+
+    def with_gaps(values: np.ndarray, share: float) -> np.ndarray:
+        values = values.astype(object) if values.dtype.kind in "OU" else values.astype(float)
+        values[rng.random(rows) < share] = None if values.dtype == object else np.nan
+        return values
+
+    names = np.array([f"Game {i}" if i % 7 else f"Game {i}, \"Deluxe\" Edition" for i in range(1000)], dtype=object)
+    sales = {f"{region}_sales": rng.exponential(0.3, rows).round(2) for region in ("na", "eu", "jp", "other")}
+    return pd.DataFrame({
+        "name": pick(names),
+        "platform": pick(labels(PLATFORMS, platforms, "Platform")),
+        "year_of_release": with_gaps(rng.integers(1990, 2017, rows), 0.02),
+        "genre": pick(labels(GENRES, genres, "Genre")),
+        "publisher": pick(np.array([f"Publisher {i}" for i in range(300)], dtype=object)),
+        **sales,
+        "global_sales": sum(sales.values()).round(2),
+        "critic_score": with_gaps(rng.integers(20, 99, rows), 0.5),
+        "critic_count": with_gaps(rng.integers(1, 100, rows), 0.5),
+        "user_score": with_gaps(rng.integers(0, 100, rows) / 10, 0.4),
+        "user_count": with_gaps(rng.integers(1, 5000, rows), 0.5),
+        "developer": with_gaps(pick(np.array([f"Studio {i}" for i in range(500)])), 0.4),
+        "rating": with_gaps(pick(np.array(RATINGS)), 0.4),
+    }, columns=COLUMNS)
+
+
+def write_dataset(path: str, rows: int, platforms: int = len(PLATFORMS), genres: int = len(GENRES),
+                  seed: int = 0, chunk_rows: int = 1_000_000) -> None:
+    """
+    Writes a synthetic CSV file in chunks, so memory does not grow with the number of rows
+
+    Args:
+        path: Path of the generated file
+        rows: Number of rows
+        platforms: Number of distinct platforms
+        genres: Number of distinct genres
+        seed: Seed of the random generator
+        chunk_rows: Number of rows generated at once
+    """
+    for chunk, start in enumerate(range(0, max(rows, 1), chunk_rows)):
+        frame = make_frame(min(chunk_rows, rows - start), platforms, genres, seed + chunk)
+        frame.to_csv(path, mode='w' if chunk == 0 else 'a', header=chunk == 0, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--platforms", type=int, default=len(PLATFORMS))
+    parser.add_argument("--genres", type=int, default=len(GENRES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_dataset(args.path, args.rows, args.platforms, args.genres, args.seed)
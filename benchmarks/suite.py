@@ -0,0 +1,167 @@
+"""
+Times every pipeline stage on a synthetic dataset, fully offline: the data
+is served to download_file by a local HTTP stand-in.
+
+Run from the project root:
+    python -m benchmarks.suite --rows 1000000 --output results.json
+    python -m benchmarks.suite --rows 1000000 --baseline results.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+
+from benchmarks.generator import PLATFORMS, GENRES, write_dataset
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.extract.stub_server import StubServer
+from lessons.transform.transform_data import Transform
+from lessons.visualize.visualization import BarPlot
+
+STAGES = ["download_file", "save_file", "ingest_data", "clean_data",
+          "group_and_count", "sort_data", "create_plot", "save_image"]
+
+
+def run_once(url: str, tmp_dir: str, fast_plot: bool) -> Dict[str, float]:
+    """
+    Runs the whole pipeline once, timing every stage separately
+
+    Args:
+        url: URL of the served dataset
+        tmp_dir: Directory for the downloaded file and the chart
+        fast_plot: Rendering mode passed to BarPlot
+
+    Returns:
+        Dict[str, float]: Wall time of every stage in seconds
+    """
+    timings = {}
+
+    def timed(stage: str, call: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = call()
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    loader = Loader(url, os.path.join(tmp_dir, "dataset.csv"))
+    response = timed("download_file", loader.download_file)
+    timed("save_file", lambda: loader.save_file(response))
+    df = timed("ingest_data", loader.ingest_data)
+    transform = Transform(df, config.FEATURES, config.CLASSES, config.LEGACY_DROPNA, config.ENGINE)
+    timed("clean_data", transform.clean_data)
+    timed("group_and_count", transform.group_and_count)
+    counts = timed("sort_data", transform.sort_data)
+    bar_plot = BarPlot(fast_plot)
+    timed("create_plot", lambda: bar_plot.create_plot(counts))
+    timed("save_image", lambda: bar_plot.save_image(os.path.join(tmp_dir, "graph.png")))
+    return timings
+
+
+def run_suite(rows: int, platforms: int, genres: int, seed: int, repeats: int, fast_plot: bool) -> Dict[str, Any]:
+    """
+    Args:
+        rows: Number of rows of the synthetic dataset
+        platforms: Number of distinct platforms
+        genres: Number of distinct genres
+        seed: Seed of the generator
+        repeats: Number of pipeline runs
+        fast_plot: Rendering mode passed to BarPlot
+
+    Returns:
+        Dict[str, Any]: Parameters of the run and min/median/all timings of every stage
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.csv")
+        write_dataset(source, rows, platforms, genres, seed)
+        with open(source, 'rb') as file:
+            payload = file.read()
+        with StubServer(payload) as server:
+            runs = [run_once(server.url, tmp_dir, fast_plot) for _ in range(repeats)]
+
+    return {
+        "metadata": {"rows": rows, "platforms": platforms, "genres": genres, "seed": seed,
+                     "repeats": repeats, "bytes": len(payload), "fast_plot": fast_plot,
+                     "engine": config.ENGINE, "legacy_dropna": config.LEGACY_DROPNA,
+                     "python": platform.python_version(), "pandas": pd.__version__,
+                     "numpy": np.__version__, "matplotlib": matplotlib.__version__,
+                     "machine": platform.machine(), "cpus": os.cpu_count(),
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "stages": {stage: {"min": min(run[stage] for run in runs),
+                           "median": statistics.median(run[stage] for run in runs),
+                           "runs": [run[stage] for run in runs]}
+                   for stage in STAGES},
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_delta: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Args:
+        results: Output of `run_suite`
+        baseline: Stored output of an earlier `run_suite`
+        threshold: Allowed relative slowdown of the median, e.g. 0.2 for 20%
+        min_delta: Slowdowns below this many seconds are timer noise and never flagged
+
+    Returns:
+        List[Dict[str, Any]]: Stages present in both runs with their medians, ratio and regression flag
+    """
+    rows = []
+    for stage, current in results["stages"].items():
+        if stage not in baseline["stages"]:
+            continue
+        before = baseline["stages"][stage]["median"]
+        ratio = current["median"] / before if before > 0 else float("inf")
+        rows.append({"stage": stage, "baseline": before, "current": current["median"],
+                     "ratio": ratio,
+                     "regression": ratio > 1 + threshold and current["median"] - before > min_delta})
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--platforms", type=int, default=len(PLATFORMS))
+    parser.add_argument("--genres", type=int, default=len(GENRES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--default-plot", action="store_true", help="Time the default BarPlot instead of the fast mode")
+    parser.add_argument("--output", help="Path of the JSON results")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown of a stage median")
+    parser.add_argument("--min-delta", type=float, default=0.001, help="Slowdowns below this many seconds are ignored")
+    args = parser.parse_args()
+
+    results = run_suite(args.rows, args.platforms, args.genres, args.seed, args.repeats, not args.default_plot)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    print(f"rows: {args.rows}, repeats: {args.repeats}")
+    print(f"{'stage':<18}{'min [ms]':>10}{'median [ms]':>13}")
+    for stage, timing in results["stages"].items():
+        print(f"{stage:<18}{timing['min'] * 1000:>10.1f}{timing['median'] * 1000:>13.1f}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            rows = compare(results, json.load(file), args.threshold, args.min_delta)
+        print(f"\n{'stage':<18}{'baseline [ms]':>15}{'current [ms]':>14}{'ratio':>8}")
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['stage']:<18}{row['baseline'] * 1000:>15.1f}{row['current'] * 1000:>14.1f}"
+                  f"{row['ratio']:>8.2f}{flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
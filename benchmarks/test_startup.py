@@ -0,0 +1,26 @@
+from unittest import TestCase
+from benchmarks.bench_startup import ENTRY_POINTS, parse_importtime, run_startup
+
+
+class TestStartup(TestCase):
+    """
+    Unit tests for the startup benchmark, focusing on import time parsing and lazy imports of entry points
+    """
+    def test_parse_importtime(self):
+        """
+        Tests that the cumulative time of every module is read from `-X importtime` output
+        """
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   _io\n"
+                  "import time:       300 |       4500 | lessons.extract.load_data\n"
+                  "unrelated line\n")
+        self.assertEqual(parse_importtime(output), {"_io": 120, "lessons.extract.load_data": 4500})
+
+    def test_entry_points_skip_heavy_libraries(self):
+        """
+        Tests that every entry point is timed and imports none of the heavy libraries
+        """
+        results = run_startup(ENTRY_POINTS, repeats=1)
+        self.assertEqual(set(results["stages"]), set(ENTRY_POINTS))
+        self.assertTrue(all(timing["median"] > 0 for timing in results["stages"].values()))
+        self.assertEqual(results["heavy"], {module: [] for module in ENTRY_POINTS})
@@ -0,0 +1,70 @@
+from unittest import TestCase
+from benchmarks.generator import COLUMNS, make_frame, write_dataset
+from benchmarks.suite import STAGES, compare, run_suite
+import os
+import tempfile
+import pandas as pd
+
+
+class TestGenerator(TestCase):
+    """
+    Unit tests for the synthetic dataset generator, focusing on schema, reproducibility and chunked writing
+    """
+    def test_make_frame_schema(self):
+        """
+        Tests that a generated frame has the dataset schema and the requested cardinalities
+        """
+        df = make_frame(1000, platforms=3, genres=15, seed=1)
+        self.assertEqual(df.columns.tolist(), COLUMNS)
+        self.assertEqual(len(df), 1000)
+        self.assertEqual(df["platform"].nunique(), 3)
+        self.assertEqual(df["genre"].nunique(), 15)
+        self.assertTrue(df["rating"].isna().any())
+
+    def test_make_frame_reproducible(self):
+        """
+        Tests that the same seed generates the same frame
+        """
+        pd.testing.assert_frame_equal(make_frame(500, seed=7), make_frame(500, seed=7))
+
+    def test_write_dataset_in_chunks(self):
+        """
+        Tests that a dataset written in chunks has every row and a single header
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "data.csv")
+            write_dataset(path, 2500, seed=3, chunk_rows=1000)
+            df = pd.read_csv(path)
+        self.assertEqual(len(df), 2500)
+        self.assertEqual(df.columns.tolist(), COLUMNS)
+
+
+class TestSuite(TestCase):
+    """
+    Unit tests for the benchmark suite, focusing on stage timings and baseline comparison
+    """
+    def test_run_suite_times_every_stage(self):
+        """
+        Tests that every pipeline stage is timed once per repeat
+        """
+        results = run_suite(rows=2000, platforms=4, genres=5, seed=0, repeats=2, fast_plot=True)
+        self.assertEqual(list(results["stages"]), STAGES)
+        for timing in results["stages"].values():
+            self.assertEqual(len(timing["runs"]), 2)
+            self.assertLessEqual(timing["min"], timing["median"])
+        self.assertEqual(results["metadata"]["rows"], 2000)
+
+    def test_compare_flags_regressions(self):
+        """
+        Tests that stages slower than the baseline above the threshold are flagged, except for timer noise
+        """
+        baseline = {"stages": {"clean_data": {"median": 1.0}, "sort_data": {"median": 0.0001}}}
+        results = {"stages": {"clean_data": {"median": 1.5}, "sort_data": {"median": 0.0003},
+                              "save_image": {"median": 2.0}}}
+        rows = {row["stage"]: row for row in compare(results, baseline, threshold=0.2)}
+
+        self.assertEqual(set(rows), {"clean_data", "sort_data"})
+        self.assertTrue(rows["clean_data"]["regression"])
+        self.assertAlmostEqual(rows["clean_data"]["ratio"], 1.5)
+        self.assertFalse(rows["sort_data"]["regression"])
+        self.assertFalse(compare(results, baseline, threshold=0.6)[0]["regression"])
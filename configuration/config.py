@@ -7,8 +7,53 @@ class BaseConfig:
     Class storing base parameters
     """
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    DATA_PATH = os.path.join(BASE_DIR, "data/dataset.csv")
+    COMPRESSION = ""
+    COMPRESSION_LEVEL = None
+    DATA_PATH = os.path.join(BASE_DIR, "data/dataset.csv" + {"gzip": ".gz", "zstd": ".zst"}.get(COMPRESSION, ""))
     DATA_URL = "https://drive.usercontent.google.com/download?id=1Cw2wO3lHHJ13B1w4p-FgX1SHVtlUtfga&export=download&authuser=0&confirm=t&uuid=9a6e08b8-8a24-43b3-9713-02140da60817&at=AN_67v0A06kVxvTX977sTQolmtrD:1729850216110"
     FEATURES = ['platform', 'genre']
     CLASSES = {"platform": ["PS4", "XOne", "PC", "WiiU"]}
-    GRAPH_PATH = os.path.join(BASE_DIR, "data/graphs/graph.png")
\ No newline at end of file
+    LEGACY_DROPNA = False
+    ENGINE = "bincount"
+    WORKERS = os.cpu_count()
+    SHARDS_PATTERN = os.path.join(BASE_DIR, "data/shards/*.csv")
+    GRAPH_PATH = os.path.join(BASE_DIR, "data/graphs/graph.png")
+    FAST_PLOT = False
+    PROFILE = os.environ.get("PIPELINE_PROFILE", "")
+    PROFILE_TRACEMALLOC = os.environ.get("PIPELINE_TRACEMALLOC") == "1"
+    MEMORY_REPORT = os.environ.get("PIPELINE_MEMORY_REPORT") == "1"
+    CHUNK_SIZE = 1024 * 1024
+    STREAMING_INGEST = False
+    MMAP_SCAN = False
+    INCREMENTAL = False
+    INCREMENTAL_STATE_PATH = os.path.join(BASE_DIR, "data/dataset.counts.json")
+    INGEST_CHUNKSIZE = 100_000
+    CACHE_PATH = os.path.join(BASE_DIR, "data/dataset.feather")
+    CATEGORICAL_COLUMNS = ['platform', 'genre', 'publisher', 'rating']
+    DTYPES = {'platform': 'category', 'genre': 'category', 'publisher': 'category',
+              'developer': 'category', 'rating': 'category', 'user_score': 'category',
+              'year_of_release': 'Int16', 'critic_score': 'Int8', 'critic_count': 'Int16', 'user_count': 'Int32',
+              'na_sales': 'float32', 'eu_sales': 'float32', 'jp_sales': 'float32',
+              'other_sales': 'float32', 'global_sales': 'float32'}
+    EAGER_CACHE = True
+    RESULT_CACHE_DIR = os.path.join(BASE_DIR, "data/.cache")
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    FETCH_MAX_AGE = 3600
+    SOURCES = []
+    DOWNLOAD_WORKERS = 8
+    DOWNLOAD_PER_HOST = 4
+    DOWNLOAD_RETRIES = 3
+    DOWNLOAD_BACKOFF = 0.5
+    COUNT_CUBE = False
+    CUBE_PATH = os.path.join(BASE_DIR, "data/dataset.cube.npz")
+    CUBE_DIMENSIONS = ['platform', 'genre', 'year_of_release', 'rating']
+    OVERLAP_INGEST = False
+    OVERLAP_QUEUE_SIZE = 16
+
+    MEASURES = []
+    PLOT_VALUE = None
+    SERVICE_HOST = "127.0.0.1"
+    SERVICE_PORT = 8765
+    SERVICE_SOCKET = ""
+    SERVICE_CACHE_SIZE = 128
+    SERVICE_POLL_INTERVAL = 1.0
\ No newline at end of file
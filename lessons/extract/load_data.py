@@ -1,31 +1,80 @@
-import requests
+from __future__ import annotations
+import hashlib
+import json
 import logging
-import pandas as pd
+import os
+import time
+import zlib
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import requests
+
+SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+CONTENT_TYPES = {"application/gzip": "gzip", "application/x-gzip": "gzip", "application/zstd": "zstd"}
 
 class Loader:
     """
     Class to handle loading operations
     """
 
-    def __init__(self, url: str, save_path: str) -> None:
+    def __init__(self, 
+                 url: str, 
+                 save_path: str, 
+                 chunk_size: int = 1024 * 1024,
+                 cache_path: Optional[str] = None,
+                 categorical_columns: Optional[List[str]] = None,
+                 eager_cache: bool = False,
+                 dtypes: Optional[Dict[str, Any]] = None,
+                 session: Optional[requests.Session] = None,
+                 compression_level: Optional[int] = None
+                 ) -> None:
         """
         Args:
             url: URL to download data
             save_path: Path to store the data
+            chunk_size: Number of bytes written to disk at once when streaming
+            cache_path: Path of the columnar Feather cache of the data, no cache if None
+            categorical_columns: Columns stored with categorical dtype in the cache
+            eager_cache: If True, the cache is built right after the file is saved
+            dtypes: Ingestion profile, data types of the columns used instead of 
+                the pandas defaults, e.g. 'category' or 'float32'
+            session: Session whose pooled connections are reused by the downloads,
+                a new connection per download if None
+            compression_level: Level of the codec given by the suffix of `save_path`,
+                `.gz` for gzip and `.zst` for zstd, the codec default if None
         """
         self.url = url
         self.save_path = save_path
+        self.chunk_size = chunk_size
+        self.cache_path = cache_path
+        self.categorical_columns = categorical_columns or []
+        self.eager_cache = eager_cache
+        self.dtypes = dtypes or {}
+        self.session = session
+        self.compression_level = compression_level
+        self.up_to_date = False
 
     
-    def download_file(self) -> requests.Response:
+    def download_file(self, stream: bool = False, headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """
         Downloads a CSV file from specified URL to specified path
 
+        Args:
+            stream: If True, the body is not read into memory and has to be
+                consumed with `save_stream`
+            headers: Additional request headers
+
         Returns:
             requests.Response: The HTTP response object containing the CSV file data
         """
+        import requests
         try:
-            response = requests.get(url=self.url)
+            client = self.session if self.session is not None else requests
+            response = client.get(url=self.url, stream=stream, headers=headers)
             response.raise_for_status()
             logging.info("Successfully downloaded data")
             return response
@@ -42,24 +91,604 @@ class Loader:
         """
         try:
             if response.status_code == 200:
+                content = b"".join(self._recode([response.content], self._source_codec(response)))
                 with open(self.save_path, 'wb') as file:
-                    file.write(response.content)
+                    file.write(content)
                 logging.info("File successfully saved data into: %s", self.save_path)
+                if self.eager_cache and self.cache_path is not None:
+                    self.build_cache()
         except FileNotFoundError as e:
             logging.error("File path does not exist: %s", e)
 
-    def ingest_data(self) -> pd.DataFrame:
+    def save_stream(self,
+                    response: requests.Response,
+                    on_chunk: Optional[Callable[[bytes], None]] = None,
+                    defer_cache: bool = False
+                    ) -> int:
+        """
+        Saves a streamed response chunk by chunk into a temporary file, 
+        which replaces the file under specified path once the body is complete.
+        A `206 Partial Content` response is appended to the partial file left
+        by an interrupted download. A source compressed differently than the 
+        suffix of specified path asks for is recompressed on the fly
+
+        Args:
+            response: The HTTP response object opened with `stream=True`
+            on_chunk: Function called with the uncompressed bytes of every chunk 
+                right after it is written, e.g. to parse the data while it arrives.
+                If it raises, the partial file is removed and the error is raised again
+            defer_cache: If True, the eager cache is left to the caller, e.g. to build 
+                it once the data passed to `on_chunk` has been parsed
+
+        Returns:
+            int: Number of bytes written
+        """
+        import requests
+        part_path = self.save_path + ".part"
+        digest = hashlib.sha256()
+        written = 0
+        offset = 0
+        start = time.perf_counter()
+        source = self._source_codec(response)
+        recoded = source != self._codec(self.save_path)
+        try:
+            if response.status_code == 206:
+                offset = self._resume_offset(response, part_path, digest)
+            elif response.status_code != 200:
+                return written
+            with open(part_path, 'ab' if offset else 'wb') as file:
+                for chunk in self._recode(response.iter_content(chunk_size=self.chunk_size), source, on_chunk):
+                    file.write(chunk)
+                    digest.update(chunk)
+                    written += len(chunk)
+            os.replace(part_path, self.save_path)
+        except FileNotFoundError as e:
+            logging.error("File path does not exist: %s", e)
+            return 0
+        except requests.exceptions.RequestException as e:
+            logging.error("Download interrupted after %d bytes: %s", written, e)
+            if not recoded and self._is_resumable(response):
+                metadata = self.read_metadata()
+                metadata["partial"] = self._validators(response)
+                self._write_metadata(metadata)
+                logging.info("Partial download kept for resume: %s", part_path)
+            elif os.path.exists(part_path):
+                os.remove(part_path)
+            raise e
+        except Exception as e:
+            logging.error("Download aborted after %d bytes: %s", written, e)
+            self.drop_partial()
+            raise e
+        finally:
+            response.close()
+
+        metadata = self._validators(response)
+        metadata.update(size=offset + written, sha256=digest.hexdigest())
+        self._write_metadata(metadata)
+        self.up_to_date = True
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        logging.info("File successfully streamed %d bytes into: %s (%.0f bytes/s)",
+                     written, self.save_path, written / elapsed)
+        if self.eager_cache and self.cache_path is not None and not defer_cache:
+            self.build_cache()
+        return written
+
+    def _recode(self,
+                chunks: Iterable[bytes],
+                source: Optional[str],
+                on_chunk: Optional[Callable[[bytes], None]] = None
+                ) -> Iterator[bytes]:
+        """
+        Converts downloaded bytes into the bytes stored under specified path, 
+        decompressing the source and compressing it with the codec given by
+        the suffix of the path one chunk at a time. Bytes already compressed 
+        with that codec are stored unchanged
+
+        Args:
+            chunks: Consecutive downloaded bytes
+            source: Codec the downloaded bytes are compressed with, None if uncompressed
+            on_chunk: Function called with the uncompressed bytes of every chunk
+
+        Returns:
+            Iterator[bytes]: Consecutive bytes to store
+        """
+        target = self._codec(self.save_path)
+        decompress = self._decompressor(source) if source and (source != target or on_chunk) else None
+        compressor = self._compressor(target) if target and source != target else None
+        for chunk in chunks:
+            data = decompress(chunk) if decompress else chunk
+            if on_chunk is not None:
+                on_chunk(data)
+            if source == target:
+                yield chunk
+            elif compressor is not None:
+                yield compressor.compress(data)
+            else:
+                yield data
+        if compressor is not None:
+            yield compressor.flush()
+
+    def _compressor(self, codec: str) -> Any:
+        """
+        Args:
+            codec: "gzip" or "zstd"
+
+        Returns:
+            Any: Streaming compressor with `compress` and `flush` methods
+        """
+        if codec == "gzip":
+            level = -1 if self.compression_level is None else self.compression_level
+            return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        zstandard = self._zstandard()
+        level = 3 if self.compression_level is None else self.compression_level
+        return zstandard.ZstdCompressor(level=level).compressobj()
+
+    def _decompressor(self, codec: str) -> Callable[[bytes], bytes]:
+        """
+        Args:
+            codec: "gzip" or "zstd"
+
+        Returns:
+            Callable[[bytes], bytes]: Function decompressing consecutive chunks of a stream 
+                of one or more concatenated gzip members or zstd frames
+        """
+        if codec == "gzip":
+            def create() -> Any:
+                return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            create = self._zstandard().ZstdDecompressor().decompressobj
+        decompressors = [create()]
+
+        def decompress(data: bytes) -> bytes:
+            parts = []
+            while data:
+                parts.append(decompressors[0].decompress(data))
+                if not decompressors[0].eof:
+                    break
+                data = decompressors[0].unused_data
+                decompressors[0] = create()
+            return b"".join(parts)
+        return decompress
+
+    @staticmethod
+    def _zstandard() -> Any:
+        """
+        Returns:
+            module: The optional `zstandard` package
+        """
+        try:
+            import zstandard
+        except ImportError as e:
+            logging.error("The zstd codec requires the zstandard package: %s", e)
+            raise e
+        return zstandard
+
+    @property
+    def compressed(self) -> bool:
+        """
+        Returns:
+            bool: True if the file under specified path is stored compressed
+        """
+        return self._codec(self.save_path) is not None
+
+    @staticmethod
+    def _codec(path: str) -> Optional[str]:
+        """
+        Args:
+            path: Path or URL path of a file
+
+        Returns:
+            Optional[str]: Codec given by the suffix of the path, None if uncompressed
+        """
+        return next((codec for suffix, codec in SUFFIXES.items() if path.lower().endswith(suffix)), None)
+
+    @staticmethod
+    def _source_codec(response: requests.Response) -> Optional[str]:
+        """
+        Args:
+            response: The HTTP response object
+
+        Returns:
+            Optional[str]: Codec the file itself is compressed with, given by the suffix 
+                of the URL or the Content-Type, None if uncompressed. A Content-Encoding 
+                of the transfer is already decoded by requests
+        """
+        url, headers = getattr(response, "url", None), getattr(response, "headers", None)
+        codec = Loader._codec(urlsplit(url).path) if isinstance(url, str) else None
+        content_type = (headers.get("Content-Type") or "") if isinstance(headers, Mapping) else ""
+        return codec or CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+    def fetch_file(self) -> bool:
+        """
+        Downloads the file only if the remote copy differs from the local one.
+        Validators stored in the metadata sidecar make an unchanged file cost 
+        a single `304 Not Modified` round trip, and a partial file left by 
+        an interrupted download is resumed with a Range request. If the Range 
+        request fails, e.g. with `416 Range Not Satisfiable`, the partial file 
+        is dropped and the whole file is requested again. `up_to_date` tells 
+        whether the saved file matches the remote one afterwards, which the 
+        return value cannot, as it is False both for an unchanged file and a failure
+
+        Returns:
+            bool: True if the file under specified path has been rewritten
+        """
+        self.up_to_date = False
+        headers = self.conditional_headers()
+        response = self.download_file(stream=True, headers=headers)
+        if response is None and "Range" in headers:
+            logging.info("Partial download cannot be resumed, downloading the whole file: %s", self.save_path)
+            self.drop_partial()
+            response = self.download_file(stream=True, headers=self.conditional_headers())
+        if response is None:
+            return False
+        if response.status_code == 304:
+            response.close()
+            logging.info("File is up to date: %s", self.save_path)
+            self.up_to_date = True
+            return False
+        return self.save_stream(response) > 0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Returns:
+            Dict[str, str]: Range headers resuming a partial download, or validators
+                of the saved file turning an unchanged download into `304 Not Modified`
+        """
+        metadata = self.read_metadata()
+        partial = metadata.get("partial")
+        part_path = self.save_path + ".part"
+        headers = {}
+        if partial and os.path.exists(part_path):
+            headers["Range"] = f"bytes={os.path.getsize(part_path)}-"
+            strong_etag = partial["etag"] and not partial["etag"].startswith("W/")
+            headers["If-Range"] = partial["etag"] if strong_etag else partial["last_modified"]
+            headers["Accept-Encoding"] = "identity"
+        elif os.path.exists(self.save_path) and metadata.get("size") == os.path.getsize(self.save_path):
+            if metadata.get("etag"):
+                headers["If-None-Match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                headers["If-Modified-Since"] = metadata["last_modified"]
+        return headers
+
+    def drop_partial(self) -> None:
+        """
+        Removes the partial file of an interrupted download and its validators,
+        so the next fetch requests the whole file
+        """
+        part_path = self.save_path + ".part"
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        metadata = self.read_metadata()
+        if metadata.pop("partial", None) is not None:
+            self._write_metadata(metadata)
+
+    def read_metadata(self) -> Dict[str, Any]:
+        """
+        Reads the metadata sidecar stored next to specified path
+
+        Returns:
+            Dict[str, Any]: ETag, Last-Modified, size and SHA-256 of the saved file, 
+                empty if nothing has been saved yet
+        """
+        try:
+            with open(self.save_path + ".meta.json", 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_metadata(self, metadata: Dict[str, Any]) -> None:
+        """
+        Atomically replaces the metadata sidecar
+
+        Args:
+            metadata: Content of the sidecar
+        """
+        meta_path = self.save_path + ".meta.json"
+        with open(meta_path + ".tmp", 'w') as file:
+            json.dump(metadata, file)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _resume_offset(self, response: requests.Response, part_path: str, digest: Any) -> int:
+        """
+        Checks that a partial response continues the partial file and feeds 
+        the bytes already on disk into the content hash
+
+        Args:
+            response: The HTTP response object with status `206 Partial Content`
+            part_path: Path of the partial file
+            digest: Hash object of the whole file
+
+        Returns:
+            int: Number of bytes already on disk
+        """
+        import requests
+        offset = os.path.getsize(part_path)
+        content_range = response.headers.get("Content-Range", "")
+        if not content_range.startswith(f"bytes {offset}-"):
+            os.remove(part_path)
+            raise requests.exceptions.InvalidHeader(
+                f"Content-Range '{content_range}' does not continue {offset} bytes on disk")
+        with open(part_path, 'rb') as file:
+            for block in iter(lambda: file.read(self.chunk_size), b""):
+                digest.update(block)
+        return offset
+
+    @staticmethod
+    def _validators(response: requests.Response) -> Dict[str, Optional[str]]:
+        """
+        Args:
+            response: The HTTP response object
+
+        Returns:
+            Dict[str, Optional[str]]: ETag and Last-Modified headers of the response
+        """
+        return {"etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")}
+
+    @staticmethod
+    def _is_resumable(response: requests.Response) -> bool:
+        """
+        Args:
+            response: The HTTP response object
+
+        Returns:
+            bool: True if an interrupted transfer can be continued with a Range request
+        """
+        etag = response.headers.get("ETag") or ""
+        has_validator = (etag and not etag.startswith("W/")) or response.headers.get("Last-Modified")
+        encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+        return bool(has_validator) and not encoded
+
+    def ingest_data(self, usecols: Optional[List[str]] = None, dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """
         Ingests data as DataFrame from defined path
 
+        Args:
+            usecols: Columns to parse, all columns if None
+            dtype: Data types of columns overriding the ingestion profile, e.g. 
+                a categorical type, which turns values outside its categories 
+                into missing values
+
         Return:
             pd.DataFrame: Data in DataFrame
         """
+        import pandas as pd
         try:
-            df = pd.read_csv(self.save_path)
-            return df
+            if self.cache_path is not None:
+                return self._ingest_cached(usecols, dtype)
+            parse, convert = self._split_dtypes(self._dtypes(dtype))
+            df = pd.read_csv(self.save_path, usecols=usecols, dtype=parse)
+            return self._convert(df, convert)
         except FileNotFoundError as e:
             logging.error("The specified file path does not exist: %s. Error message: %s", self.save_path, e)
             raise e
 
+    def ingest_chunks(self, 
+                      usecols: Optional[List[str]] = None, 
+                      chunksize: int = 100_000, 
+                      dtype: Optional[Dict[str, Any]] = None
+                      ) -> Iterator[pd.DataFrame]:
+        """
+        Ingests data from defined path as a stream of DataFrames, 
+        so only one chunk of rows is held in memory at a time
+
+        Args:
+            usecols: Columns to parse, all columns if None
+            chunksize: Number of rows in each chunk
+            dtype: Data types of columns
+
+        Returns:
+            Iterator[pd.DataFrame]: Consecutive chunks of the data
+        """
+        import pandas as pd
+        try:
+            parse, convert = self._split_dtypes(self._dtypes(dtype))
+            chunks = pd.read_csv(self.save_path, usecols=usecols, chunksize=chunksize, dtype=parse)
+            return (self._convert(chunk, convert) for chunk in chunks) if convert else chunks
+        except FileNotFoundError as e:
+            logging.error("The specified file path does not exist: %s. Error message: %s", self.save_path, e)
+            raise e
+
+    def ingest_stream(self,
+                      chunks: Iterable[bytes],
+                      usecols: Optional[List[str]] = None,
+                      dtype: Optional[Dict[str, Any]] = None,
+                      block_size: int = 4 * 1024 * 1024
+                      ) -> Iterator[pd.DataFrame]:
+        """
+        Ingests CSV data while its bytes arrive, e.g. from a download. Bytes 
+        are gathered into blocks of at least `block_size` bytes ending after 
+        a newline outside quoted fields, and every block is parsed with the 
+        header of the data
+
+        Args:
+            chunks: Consecutive bytes of the CSV data, starting with the header
+            usecols: Columns to parse, all columns if None
+            dtype: Data types of columns
+            block_size: Minimal number of bytes parsed at once
+
+        Returns:
+            Iterator[pd.DataFrame]: Consecutive blocks of the data
+        """
+        import io
+        import pandas as pd
+        parse, convert = self._split_dtypes(self._dtypes(dtype))
+        header, buffer = None, bytearray()
+
+        def parse_block(block: bytes) -> pd.DataFrame:
+            return self._convert(pd.read_csv(io.BytesIO(header + block), usecols=usecols, dtype=parse), convert)
+
+        for chunk in chunks:
+            buffer += chunk
+            if header is None:
+                end = buffer.find(b"\n")
+                if end == -1:
+                    continue
+                header = bytes(buffer[:end + 1])
+                del buffer[:end + 1]
+            if len(buffer) >= block_size:
+                end = self._last_row_end(buffer)
+                if end > 0:
+                    yield parse_block(bytes(buffer[:end]))
+                    del buffer[:end]
+        if header is not None and buffer.strip():
+            yield parse_block(bytes(buffer))
+
+    @staticmethod
+    def _last_row_end(buffer: bytearray) -> int:
+        """
+        Args:
+            buffer: Bytes of CSV rows, starting outside a quoted field
+
+        Returns:
+            int: Offset right after the last newline outside quoted fields, 0 if there is none
+        """
+        end = buffer.rfind(b"\n")
+        while end != -1 and buffer.count(b'"', 0, end) % 2:
+            end = buffer.rfind(b"\n", 0, end)
+        return end + 1
+
+    def build_cache(self) -> pd.DataFrame:
+        """
+        Parses the CSV file and stores it as an uncompressed Feather file, which 
+        later ingests memory-map instead of parsing the text again. The cache 
+        is keyed on size, modification time and SHA-256 of the CSV file
+        and on the data types it is stored with
+
+        Returns:
+            pd.DataFrame: Data in DataFrame
+        """
+        import pandas as pd
+        key = self._source_key()
+        parse, convert = self._split_dtypes(self._cache_dtypes())
+        df = self._convert(pd.read_csv(self.save_path, dtype=parse), convert)
+
+        df.to_feather(self.cache_path + ".tmp", compression='uncompressed')
+        os.replace(self.cache_path + ".tmp", self.cache_path)
+        with open(self.cache_path + ".key.json", 'w') as file:
+            json.dump(key, file)
+        logging.info("Columnar cache built: %s", self.cache_path)
+        return df
+
+    def _ingest_cached(self, usecols: Optional[List[str]] = None, dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Ingests data from the Feather cache, building it first if it is
+        missing or does not match the CSV file
+
+        Args:
+            usecols: Columns to read, all columns if None
+            dtype: Data types the columns are converted to
+
+        Returns:
+            pd.DataFrame: Data in DataFrame
+        """
+        import pyarrow.feather as feather
+        try:
+            with open(self.cache_path + ".key.json", 'r') as file:
+                cached_key = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cached_key = {}
+
+        stat = os.stat(self.save_path)
+        stale = (cached_key.get("size") != stat.st_size or cached_key.get("dtypes") != self._cache_dtypes()
+                 or not os.path.exists(self.cache_path))
+        if not stale and cached_key.get("mtime_ns") != stat.st_mtime_ns:
+            key = self._source_key()
+            stale = cached_key.get("sha256") != key["sha256"]
+            if not stale:
+                with open(self.cache_path + ".key.json", 'w') as file:
+                    json.dump(key, file)
+
+        if stale:
+            df = self.build_cache()
+            df = df if usecols is None else df[usecols]
+        else:
+            table = feather.read_table(self.cache_path, columns=usecols, memory_map=True)
+            logging.info("Data ingested from columnar cache: %s", self.cache_path)
+            df = table.to_pandas(split_blocks=True)
+        return df.astype(dtype) if dtype else df
 
+    def _dtypes(self, dtype: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            dtype: Data types overriding the ingestion profile
+
+        Returns:
+            Optional[Dict[str, Any]]: Data types passed to `pd.read_csv`, None for the pandas defaults
+        """
+        return {**self.dtypes, **(dtype or {})} or None
+
+    @staticmethod
+    def _split_dtypes(dtypes: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Nullable integer columns are parsed as float64 and converted afterwards,
+        which is several times faster than parsing them as nullable integers
+
+        Args:
+            dtypes: Data types of the columns
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Dict[str, Any]]: Data types passed to 
+                `pd.read_csv` and the nullable integer types to convert to
+        """
+        import pandas as pd
+        if not dtypes:
+            return dtypes, {}
+        convert = {column: dtype for column, dtype in dtypes.items()
+                   if isinstance(pd.api.types.pandas_dtype(dtype), pd.api.extensions.ExtensionDtype)
+                   and pd.api.types.is_integer_dtype(dtype)}
+        return {**dtypes, **{column: 'float64' for column in convert}}, convert
+
+    @staticmethod
+    def _convert(df: pd.DataFrame, convert: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Args:
+            df: Parsed data
+            convert: Data types to convert columns to, missing columns are skipped
+
+        Returns:
+            pd.DataFrame: Converted data
+        """
+        convert = {column: dtype for column, dtype in convert.items() if column in df.columns}
+        return df.astype(convert) if convert else df
+
+    @staticmethod
+    def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Logs the memory used by every column, including the Python objects of text columns
+
+        Args:
+            df: Ingested data
+
+        Returns:
+            pd.DataFrame: Data type and memory in MiB of every column, with the total in the last row
+        """
+        import pandas as pd
+        usage = df.memory_usage(deep=True, index=False) / 2**20
+        report = pd.DataFrame({'dtype': df.dtypes.astype(str), 'MiB': usage})
+        report.loc['total'] = ['', usage.sum()]
+        logging.info("Memory usage of ingested data:\n%s", report.round(3).to_string())
+        return report
+
+    def _source_key(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Size, modification time and SHA-256 of the CSV file, 
+                and the data types the cache is stored with
+        """
+        stat = os.stat(self.save_path)
+        digest = hashlib.sha256()
+        with open(self.save_path, 'rb') as file:
+            for block in iter(lambda: file.read(self.chunk_size), b""):
+                digest.update(block)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest(),
+                "dtypes": self._cache_dtypes()}
+
+    def _cache_dtypes(self) -> Dict[str, str]:
+        """
+        Returns:
+            Dict[str, str]: Data types of the cached columns, categorical columns and the ingestion profile
+        """
+        dtypes = {column: 'category' for column in self.categorical_columns}
+        dtypes.update({column: str(dtype) for column, dtype in self.dtypes.items()})
+        return dtypes
@@ -0,0 +1,175 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Request handler serving the payload of the owning StubServer
+    """
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.stub.lock:
+            self.server.stub.connections += 1
+
+    def do_GET(self) -> None:
+        stub = self.server.stub
+        with stub.lock:
+            stub.requests.append(dict(self.headers))
+            stub.active += 1
+            stub.max_active = max(stub.max_active, stub.active)
+            failing = len(stub.requests) <= stub.fail_first
+        # A request stops counting as active before its answer is sent, as the client
+        # may start its next request as soon as the answer has arrived
+        try:
+            time.sleep(stub.latency)
+        finally:
+            with stub.lock:
+                stub.active -= 1
+        if failing:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_payload(stub)
+
+    def _send_payload(self, stub: "StubServer") -> None:
+        payload = stub.payload
+
+        if stub.etag is not None and self.headers.get("If-None-Match") == stub.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        validators = (stub.etag, stub.last_modified)
+        if range_header and stub.etag is not None and (if_range is None or if_range in validators):
+            start = int(range_header.split("=")[1].split("-")[0])
+        if start and start >= len(payload):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(payload)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        end = len(payload) if stub.truncate_at is None else max(start, stub.truncate_at)
+        if start:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", stub.content_type)
+        self.send_header("Content-Length", str(len(payload) - start))
+        if stub.etag is not None:
+            self.send_header("ETag", stub.etag)
+            self.send_header("Accept-Ranges", "bytes")
+        if stub.last_modified is not None:
+            self.send_header("Last-Modified", stub.last_modified)
+        self.end_headers()
+
+        view = memoryview(payload)[:end]
+        try:
+            for offset in range(start, end, stub.chunk_size):
+                self.wfile.write(view[offset:offset + stub.chunk_size])
+                time.sleep(stub.throttle)
+        except ConnectionError:
+            self.close_connection = True
+            return
+        self.close_connection = not stub.keep_alive or end < len(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _KeepAliveHandler(_StubHandler):
+    """
+    Request handler keeping HTTP/1.1 connections open between requests
+    """
+    protocol_version = "HTTP/1.1"
+
+
+class StubServer:
+    """
+    Local HTTP server standing in for the remote data source in tests and benchmarks
+    """
+
+    def __init__(self,
+                 payload: bytes,
+                 truncate_at: Optional[int] = None,
+                 chunk_size: int = 64 * 1024,
+                 etag: Optional[str] = None,
+                 last_modified: Optional[str] = None,
+                 latency: float = 0.0,
+                 fail_first: int = 0,
+                 keep_alive: bool = False,
+                 throttle: float = 0.0,
+                 content_type: str = "text/csv"
+                 ) -> None:
+        """
+        Args:
+            payload: Bytes served for every GET request
+            truncate_at: If set, the connection is dropped once this offset of the payload is sent
+            chunk_size: Number of bytes written to the socket at once
+            etag: If set, the server answers conditional and Range requests using this validator
+            last_modified: Value of the Last-Modified header
+            latency: Number of seconds every request waits before it is answered
+            fail_first: Number of first requests answered with `503 Service Unavailable`
+            keep_alive: If True, connections stay open between requests
+            throttle: Number of seconds the server waits after writing every chunk
+            content_type: Value of the Content-Type header
+        """
+        self.payload = payload
+        self.truncate_at = truncate_at
+        self.chunk_size = chunk_size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.latency = latency
+        self.fail_first = fail_first
+        self.keep_alive = keep_alive
+        self.throttle = throttle
+        self.content_type = content_type
+        self.requests = []
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Returns:
+            str: URL under which the payload is served
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/dataset.csv"
+
+    def start(self) -> "StubServer":
+        """
+        Starts serving on a free localhost port in a background thread
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler if self.keep_alive else _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Shuts the server down and releases its port
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
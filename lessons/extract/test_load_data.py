@@ -1,5 +1,13 @@
-from unittest import mock, TestCase
+from unittest import mock, skipUnless, TestCase
 from load_data import Loader
+from stub_server import StubServer
+import gzip
+import hashlib
+import importlib.util
+import io
+import os
+import tempfile
+import tracemalloc
 import requests
 import pandas as pd
 
@@ -30,7 +38,22 @@ class TestLoader(TestCase):
         self.assertIsNotNone(response)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content, b"Test data")
-    
+
+    @mock.patch('requests.get')
+    def test_download_file_session(self, mock_get: mock.Mock):
+        """
+        Tests that a given session downloads the file instead of `requests.get`
+        """
+        session = mock.Mock()
+        session.get.return_value.status_code = 200
+
+        loader = Loader(self.url, self.save_path, session=session)
+        response = loader.download_file(stream=True)
+
+        self.assertEqual(response.status_code, 200)
+        session.get.assert_called_once_with(url=self.url, stream=True, headers=None)
+        mock_get.assert_not_called()
+
     @mock.patch('requests.get')
     def test_download_file_failure(self, mock_get: mock.Mock):
         """
@@ -92,7 +115,7 @@ class TestLoader(TestCase):
         loader = Loader(self.url, self.save_path)
         result = loader.ingest_data()
 
-        mock_read_csv.assert_called_once_with(self.save_path)
+        mock_read_csv.assert_called_once_with(self.save_path, usecols=None, dtype=None)
         pd.testing.assert_frame_equal(result, mock_df)
 
     @mock.patch('pandas.read_csv')
@@ -107,3 +130,475 @@ class TestLoader(TestCase):
             with self.assertRaises(FileNotFoundError):
                 loader.ingest_data()
             self.assertIn("The specified file path does not exist", log.output[0])
+
+    def test_ingest_chunks(self):
+        """
+        Tests that chunked ingestion parses only the selected columns in chunks of the requested size
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = os.path.join(tmp_dir, "dataset.csv")
+            pd.DataFrame({'platform': ['PS4', 'PC', 'XOne'],
+                          'genre': ['Action', 'Sports', 'Action'],
+                          'year_of_release': [2015, 2016, 2014]}).to_csv(save_path, index=False)
+
+            loader = Loader(self.url, save_path)
+            chunks = list(loader.ingest_chunks(['platform', 'genre'], chunksize=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(chunks[0].columns.tolist(), ['platform', 'genre'])
+
+    def test_ingest_chunks_wrong_path(self):
+        """
+        Tests error handling when ingesting chunks from a non-existent file path
+        """
+        loader = Loader(self.url, "non_existent_dir/dataset.csv")
+
+        with self.assertLogs(level='ERROR') as log:
+            with self.assertRaises(FileNotFoundError):
+                loader.ingest_chunks()
+            self.assertIn("The specified file path does not exist", log.output[0])
+
+
+class TestLoaderStreaming(TestCase):
+    """
+    Unit tests for streaming downloads against a local HTTP server
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Builds a payload large enough to expose buffering of the whole body
+        """
+        row = b"Call of Duty: Black Ops 3,PS4,2015,Shooter,Activision,6.03,5.86,0.36,2.38,14.63,,,,,,\n"
+        cls.payload = row * (16 * 1024 * 1024 // len(row))
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_stream_success(self):
+        """
+        Tests that the streamed body lands in specified path and no temporary file is left behind
+        """
+        with StubServer(self.payload) as server:
+            loader = Loader(server.url, self.save_path, chunk_size=64 * 1024)
+            response = loader.download_file(stream=True)
+            written = loader.save_stream(response)
+
+        self.assertEqual(written, len(self.payload))
+        with open(self.save_path, 'rb') as file:
+            self.assertEqual(file.read(), self.payload)
+        self.assertFalse(os.path.exists(self.save_path + ".part"))
+
+    def test_save_stream_on_chunk(self):
+        """
+        Tests that every written chunk is handed to the callback in order
+        """
+        chunks = []
+        with StubServer(self.payload) as server:
+            loader = Loader(server.url, self.save_path, chunk_size=64 * 1024)
+            loader.save_stream(loader.download_file(stream=True), on_chunk=chunks.append)
+
+        self.assertEqual(b"".join(chunks), self.payload)
+
+    def test_ingest_stream(self):
+        """
+        Tests that data parsed while its bytes arrive equals the data read from the file
+        """
+        payload = b'name,platform,genre\n' + b'"Call of Duty, ""Black Ops""",PS4,Shooter\n"Multi\nline",PC,Action\nPlain,,Sports\n' * 20
+        with open(self.save_path, 'wb') as file:
+            file.write(payload)
+        loader = Loader(None, self.save_path)
+        chunks = [payload[offset:offset + 7] for offset in range(0, len(payload), 7)]
+
+        blocks = list(loader.ingest_stream(iter(chunks), usecols=['name', 'platform'], block_size=50))
+        self.assertGreater(len(blocks), 1)
+        pd.testing.assert_frame_equal(pd.concat(blocks, ignore_index=True),
+                                      pd.read_csv(self.save_path, usecols=['name', 'platform']))
+
+    def test_save_stream_memory(self):
+        """
+        Tests that peak memory while streaming stays far below the size of the body
+        """
+        with StubServer(self.payload) as server:
+            loader = Loader(server.url, self.save_path, chunk_size=64 * 1024)
+            tracemalloc.start()
+            response = loader.download_file(stream=True)
+            loader.save_stream(response)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        self.assertLess(peak, len(self.payload) // 8)
+
+    def test_save_stream_interrupted(self):
+        """
+        Tests that a dropped connection keeps the previous file and removes the partial download
+        """
+        with open(self.save_path, 'wb') as file:
+            file.write(b"previous data")
+
+        with StubServer(self.payload, truncate_at=len(self.payload) // 2) as server:
+            loader = Loader(server.url, self.save_path)
+            response = loader.download_file(stream=True)
+            with self.assertLogs(level='ERROR') as log:
+                with self.assertRaises(requests.exceptions.RequestException):
+                    loader.save_stream(response)
+                self.assertIn("Download interrupted", log.output[0])
+
+        with open(self.save_path, 'rb') as file:
+            self.assertEqual(file.read(), b"previous data")
+        self.assertFalse(os.path.exists(self.save_path + ".part"))
+
+    def test_save_stream_aborted_by_callback(self):
+        """
+        Tests that an error raised by the chunk callback removes the partial download
+        """
+        def on_chunk(chunk):
+            raise RuntimeError("Parsing stopped")
+
+        with StubServer(self.payload, etag='"v1"') as server:
+            loader = Loader(server.url, self.save_path)
+            response = loader.download_file(stream=True)
+            with self.assertLogs(level='ERROR') as log:
+                with self.assertRaises(RuntimeError):
+                    loader.save_stream(response, on_chunk=on_chunk)
+                self.assertIn("Download aborted", log.output[0])
+
+        self.assertFalse(os.path.exists(self.save_path))
+        self.assertFalse(os.path.exists(self.save_path + ".part"))
+        self.assertNotIn("partial", loader.read_metadata())
+
+
+class TestLoaderFetch(TestCase):
+    """
+    Unit tests for conditional and resumable downloads against a local HTTP server
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.payload = b"name,platform,genre\n" + b"Halo 5,XOne,Shooter\n" * 50000
+        self.server = StubServer(self.payload, etag='"v1"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT").start()
+        self.loader = Loader(self.server.url, self.save_path, chunk_size=16 * 1024)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp_dir.cleanup()
+
+    def read_saved(self) -> bytes:
+        with open(self.save_path, 'rb') as file:
+            return file.read()
+
+    def test_fetch_file_writes_metadata(self):
+        """
+        Tests that a first fetch saves the file and records its validators, size and hash
+        """
+        self.assertTrue(self.loader.fetch_file())
+
+        metadata = self.loader.read_metadata()
+        self.assertEqual(self.read_saved(), self.payload)
+        self.assertEqual(metadata["etag"], '"v1"')
+        self.assertEqual(metadata["last_modified"], "Wed, 21 Oct 2015 07:28:00 GMT")
+        self.assertEqual(metadata["size"], len(self.payload))
+        self.assertEqual(metadata["sha256"], hashlib.sha256(self.payload).hexdigest())
+
+    def test_fetch_file_not_modified(self):
+        """
+        Tests that an unchanged remote file is answered with 304 and not rewritten
+        """
+        self.loader.fetch_file()
+        mtime = os.path.getmtime(self.save_path)
+
+        with self.assertLogs(level='INFO') as log:
+            self.assertFalse(self.loader.fetch_file())
+            self.assertIn("File is up to date", log.output[-1])
+
+        self.assertEqual(self.server.requests[-1]["If-None-Match"], '"v1"')
+        self.assertEqual(self.server.requests[-1]["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT")
+        self.assertEqual(os.path.getmtime(self.save_path), mtime)
+
+    def test_fetch_file_up_to_date(self):
+        """
+        Tests that a saved or unchanged file is reported up to date and a failed fetch is not
+        """
+        self.loader.fetch_file()
+        self.assertTrue(self.loader.up_to_date)
+        self.loader.fetch_file()
+        self.assertTrue(self.loader.up_to_date)
+
+        self.server.stop()
+        with self.assertLogs(level='ERROR'):
+            self.assertFalse(self.loader.fetch_file())
+        self.assertFalse(self.loader.up_to_date)
+
+    def test_fetch_file_changed(self):
+        """
+        Tests that a changed remote file is downloaded again
+        """
+        self.loader.fetch_file()
+        self.server.payload = self.payload + b"Forza 6,XOne,Racing\n"
+        self.server.etag = '"v2"'
+
+        self.assertTrue(self.loader.fetch_file())
+        self.assertEqual(self.read_saved(), self.server.payload)
+        self.assertEqual(self.loader.read_metadata()["etag"], '"v2"')
+
+    def test_fetch_file_resumes_partial_download(self):
+        """
+        Tests that a dropped connection is resumed with a Range request on the next fetch
+        """
+        half = len(self.payload) // 2
+        self.server.truncate_at = half
+        with self.assertLogs(level='ERROR'):
+            with self.assertRaises(requests.exceptions.RequestException):
+                self.loader.fetch_file()
+        kept = os.path.getsize(self.save_path + ".part")
+        self.assertTrue(0 < kept <= half)
+
+        self.server.truncate_at = None
+        self.assertTrue(self.loader.fetch_file())
+
+        self.assertEqual(self.server.requests[-1]["Range"], f"bytes={kept}-")
+        self.assertEqual(self.server.requests[-1]["If-Range"], '"v1"')
+        self.assertEqual(self.read_saved(), self.payload)
+        self.assertEqual(self.loader.read_metadata()["sha256"], hashlib.sha256(self.payload).hexdigest())
+        self.assertNotIn("partial", self.loader.read_metadata())
+        self.assertFalse(os.path.exists(self.save_path + ".part"))
+
+    def test_fetch_file_unsatisfiable_range(self):
+        """
+        Tests that a partial download the server cannot resume is dropped and the whole file is downloaded
+        """
+        self.server.truncate_at = len(self.payload) - 10
+        with self.assertLogs(level='ERROR'):
+            with self.assertRaises(requests.exceptions.RequestException):
+                self.loader.fetch_file()
+        self.assertIn("partial", self.loader.read_metadata())
+
+        self.server.truncate_at = None
+        self.server.payload = self.payload[:10]
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(self.loader.fetch_file())
+            self.assertTrue(any("416" in line for line in log.output))
+
+        self.assertNotIn("Range", self.server.requests[-1])
+        self.assertEqual(self.read_saved(), self.payload[:10])
+        self.assertNotIn("partial", self.loader.read_metadata())
+        self.assertFalse(os.path.exists(self.save_path + ".part"))
+
+
+class TestLoaderCompression(TestCase):
+    """
+    Unit tests for compressed sources and compressed storage against a local HTTP server
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.payload = b"name,platform,genre\n" + b"Halo 5,XOne,Shooter\nFIFA 16,PS4,Sports\n" * 20000
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_compress_plain_source(self):
+        """
+        Tests that a plain source is gzipped on the fly, parsed from the compressed
+        file and revalidated against the size of the compressed file
+        """
+        chunks = []
+        with StubServer(self.payload, etag='"v1"') as server:
+            loader = Loader(server.url, self.path("dataset.csv.gz"), chunk_size=16 * 1024, compression_level=9)
+            loader.save_stream(loader.download_file(stream=True), on_chunk=chunks.append)
+            self.assertFalse(loader.fetch_file())
+
+        with open(loader.save_path, 'rb') as file:
+            stored = file.read()
+        self.assertEqual(gzip.decompress(stored), self.payload)
+        self.assertLess(len(stored), len(self.payload) // 10)
+        self.assertEqual(loader.read_metadata()["size"], len(stored))
+        self.assertEqual(b"".join(chunks), self.payload)
+        pd.testing.assert_frame_equal(loader.ingest_data(), pd.read_csv(io.BytesIO(self.payload)))
+
+    def test_decompress_compressed_source(self):
+        """
+        Tests that a gzipped source of several members is stored uncompressed under a plain path
+        """
+        half = len(self.payload) // 2
+        with StubServer(gzip.compress(self.payload[:half]) + gzip.compress(self.payload[half:])) as server:
+            loader = Loader(server.url + ".gz", self.path("dataset.csv"), chunk_size=1000)
+            loader.save_stream(loader.download_file(stream=True))
+
+        with open(loader.save_path, 'rb') as file:
+            self.assertEqual(file.read(), self.payload)
+
+    def test_keep_compressed_source(self):
+        """
+        Tests that a source compressed with the codec of the path is stored unchanged,
+        while the callback still gets the uncompressed bytes
+        """
+        compressed = gzip.compress(self.payload)
+        chunks = []
+        with StubServer(compressed, content_type="application/gzip") as server:
+            loader = Loader(server.url, self.path("dataset.csv.gz"), chunk_size=1000)
+            loader.save_file(loader.download_file())
+            loader.save_stream(loader.download_file(stream=True), on_chunk=chunks.append)
+
+        with open(loader.save_path, 'rb') as file:
+            self.assertEqual(file.read(), compressed)
+        self.assertEqual(b"".join(chunks), self.payload)
+
+    def test_interrupted_compression(self):
+        """
+        Tests that an interrupted download being compressed is dropped instead of kept for resume
+        """
+        with StubServer(self.payload, etag='"v1"', truncate_at=len(self.payload) // 2) as server:
+            loader = Loader(server.url, self.path("dataset.csv.gz"))
+            with self.assertRaises(requests.exceptions.RequestException):
+                loader.save_stream(loader.download_file(stream=True))
+
+        self.assertFalse(os.path.exists(loader.save_path + ".part"))
+        self.assertNotIn("partial", loader.read_metadata())
+
+    @skipUnless(importlib.util.find_spec("zstandard"), "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        """
+        Tests that a plain source is stored with zstd and recompressed from zstd to gzip
+        """
+        with StubServer(self.payload) as server:
+            loader = Loader(server.url, self.path("dataset.csv.zst"), compression_level=10)
+            loader.save_stream(loader.download_file(stream=True))
+        pd.testing.assert_frame_equal(loader.ingest_data(), pd.read_csv(io.BytesIO(self.payload)))
+
+        with open(loader.save_path, 'rb') as file, StubServer(file.read()) as server:
+            loader = Loader(server.url + ".zst", self.path("dataset.csv.gz"))
+            loader.save_stream(loader.download_file(stream=True))
+        with open(loader.save_path, 'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()), self.payload)
+
+
+class TestLoaderCache(TestCase):
+    """
+    Unit tests for the columnar cache of the ingested data
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.cache_path = os.path.join(self.tmp_dir.name, "dataset.feather")
+        self.df = pd.DataFrame({'platform': ['PS4', 'PC', 'XOne'],
+                                'genre': ['Action', 'Sports', 'Action'],
+                                'na_sales': [6.03, 0.5, 1.2]})
+        self.df.to_csv(self.save_path, index=False)
+        self.loader = Loader("http://test.com", self.save_path, 
+                             cache_path=self.cache_path, 
+                             categorical_columns=['platform', 'genre'])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_ingest_data_builds_cache(self):
+        """
+        Tests that the first ingest parses the CSV file and stores categorical columns in the cache
+        """
+        result = self.loader.ingest_data()
+
+        self.assertTrue(os.path.exists(self.cache_path))
+        self.assertEqual(result['platform'].dtype, 'category')
+        self.assertEqual(result['na_sales'].dtype, 'float64')
+        pd.testing.assert_frame_equal(result.astype({'platform': object, 'genre': object}), self.df)
+
+    def test_ingest_data_reads_cache(self):
+        """
+        Tests that a later ingest reads the cache instead of parsing the CSV file, even after its mtime changed
+        """
+        expected = self.loader.ingest_data()
+        os.utime(self.save_path, ns=(0, 0))
+
+        with mock.patch('pandas.read_csv') as mock_read_csv:
+            result = self.loader.ingest_data()
+            mock_read_csv.assert_not_called()
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_ingest_data_rebuilds_stale_cache(self):
+        """
+        Tests that the cache is rebuilt once the CSV file changes
+        """
+        self.loader.ingest_data()
+        changed = pd.concat([self.df, self.df], ignore_index=True)
+        changed.to_csv(self.save_path, index=False)
+
+        result = self.loader.ingest_data()
+        self.assertEqual(len(result), len(changed))
+
+    def test_save_file_eager_cache(self):
+        """
+        Tests that the cache is built right after saving when eager caching is enabled
+        """
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        with open(self.save_path, 'rb') as file:
+            mock_response.content = file.read()
+
+        self.loader.eager_cache = True
+        self.loader.save_file(mock_response)
+
+        self.assertTrue(os.path.exists(self.cache_path))
+
+
+    def test_ingest_data_rebuilds_cache_for_new_profile(self):
+        """
+        Tests that the cache is rebuilt once the ingestion profile changes
+        """
+        self.loader.ingest_data()
+        self.loader.dtypes = {'na_sales': 'float32'}
+
+        result = self.loader.ingest_data()
+        self.assertEqual(result['na_sales'].dtype, 'float32')
+
+
+class TestLoaderProfile(TestCase):
+    """
+    Unit tests for the dtype-aware ingestion profile
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.df = pd.DataFrame({'platform': ['PS4', 'PC', None, 'PS4'],
+                                'year_of_release': [2015, None, 2016, 2014],
+                                'na_sales': [6.03, 0.5, 1.2, 0.25]})
+        self.df.to_csv(self.save_path, index=False)
+        self.dtypes = {'platform': 'category', 'year_of_release': 'Int16', 'na_sales': 'float32'}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_ingest_data_with_profile(self):
+        """
+        Tests that the profile sets compact data types and keeps missing values
+        """
+        result = Loader(None, self.save_path, dtypes=self.dtypes).ingest_data()
+
+        self.assertEqual(result.dtypes.astype(str).to_dict(), self.dtypes)
+        self.assertEqual(result['platform'].isna().tolist(), self.df['platform'].isna().tolist())
+        self.assertEqual(result['year_of_release'].isna().tolist(), self.df['year_of_release'].isna().tolist())
+
+    def test_ingest_data_dtype_overrides_profile(self):
+        """
+        Tests that data types passed to the ingest take precedence over the profile
+        """
+        loader = Loader(None, self.save_path, dtypes=self.dtypes)
+        result = loader.ingest_data(dtype={'na_sales': 'float64'})
+
+        self.assertEqual(result['na_sales'].dtype, 'float64')
+        self.assertEqual(result['platform'].dtype, 'category')
+
+    def test_memory_report(self):
+        """
+        Tests that the report lists the memory of every column and their total
+        """
+        df = Loader(None, self.save_path).ingest_data()
+        report = Loader.memory_report(df)
+
+        self.assertEqual(report.index.tolist(), df.columns.tolist() + ['total'])
+        self.assertAlmostEqual(report.loc['total', 'MiB'], df.memory_usage(deep=True, index=False).sum() / 2**20)
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from transform_data import Transform
+from transform_data import Measure, Transform
 import pandas as pd
 
 
@@ -26,6 +26,38 @@ class TestTransform(TestCase):
 
         pd.testing.assert_frame_equal(result_df, expected_df)
 
+    def test_clean_data_keeps_empty_unselected_fields(self):
+        """
+        Tests that empty fields outside the selected features do not delete samples
+        """
+        df = pd.DataFrame({'feature1': ['X', 'Y', 'X', None],
+                           'feature2': ['A', 'B', 'B', 'B'],
+                           'feature3': [None, None, 3.1, 1.73]})
+        features = ['feature1', 'feature2']
+        classes = {'feature2': ['B']}
+
+        expected_df = pd.DataFrame({'feature1': ['Y', 'X'],
+                                    'feature2': ['B', 'B']})
+
+        transform = Transform(df, features, classes)
+        pd.testing.assert_frame_equal(transform.clean_data(), expected_df)
+
+    def test_clean_data_legacy_dropna(self):
+        """
+        Tests that legacy cleaning deletes samples with an empty field in any column
+        """
+        df = pd.DataFrame({'feature1': ['X', 'Y', 'X', None],
+                           'feature2': ['A', 'B', 'B', 'B'],
+                           'feature3': [None, None, 3.1, 1.73]})
+        features = ['feature1', 'feature2']
+        classes = {'feature2': ['B']}
+
+        expected_df = pd.DataFrame({'feature1': ['X'],
+                                    'feature2': ['B']})
+
+        transform = Transform(df, features, classes, legacy_dropna=True)
+        pd.testing.assert_frame_equal(transform.clean_data(), expected_df)
+
     def test_clean_data_key_error(self):
         """
         Tests data cleaning when a specified feature is missing from the DataFrame
@@ -62,6 +94,48 @@ class TestTransform(TestCase):
         
         pd.testing.assert_frame_equal(result_df, expected_df)
 
+    def test_group_and_count_categorical(self):
+        """
+        Tests that categorical features are counted only for observed pairs
+        """
+        df = pd.DataFrame({'feature1': pd.Categorical(['Y', 'X', 'Y', 'X']),
+                           'feature2': pd.Categorical(['B', 'A', 'B', 'B'])})
+
+        transform = Transform(df, ['feature1', 'feature2'], {})
+        result_df = transform.group_and_count()
+
+        self.assertEqual(result_df['feature1'].astype(str).tolist(), ['X', 'X', 'Y'])
+        self.assertEqual(result_df['feature2'].astype(str).tolist(), ['A', 'B', 'B'])
+        self.assertEqual(result_df['count'].tolist(), [1, 1, 2])
+
+    def test_group_and_count_bincount_matches_groupby(self):
+        """
+        Tests that the bincount engine gives the same sorted result as grouping and sorting
+        """
+        df = pd.DataFrame({'feature1': ['B', 'A', 'C', 'A', 'B', 'A'],
+                           'feature2': [2, 1, 1, 1, 3, 2]})
+        features = ['feature1', 'feature2']
+        classes = {'feature1': ['B', 'A', 'C']}
+
+        groupby = Transform(df, features, classes)
+        groupby.group_and_count()
+        expected_df = groupby.sort_data()
+
+        bincount = Transform(df, features, classes, engine="bincount")
+        result_df = bincount.group_and_count()
+
+        pd.testing.assert_frame_equal(result_df, expected_df)
+        pd.testing.assert_frame_equal(bincount.sort_data(), expected_df)
+
+    def test_group_and_count_bincount_failure(self):
+        """
+        Tests handling of invalid DataFrame input when counting with the bincount engine
+        """
+        transform = Transform(None, ['feature1', 'feature2'], {'feature2': ['B']}, engine="bincount")
+        with self.assertLogs(level='ERROR') as log:
+            self.assertIsNone(transform.group_and_count())
+            self.assertIn("Data need to be in pandas.DataFrame format", log.output[0])
+
     def test_group_and_count_failure(self):
         """
         Tests handling of invalid DataFrame input when grouping and counting
@@ -95,6 +169,40 @@ class TestTransform(TestCase):
         result_df = transform.sort_data()
         pd.testing.assert_frame_equal(result_df, expected_df)
 
+    def test_clean_and_sort_with_unselected_class_feature(self):
+        """
+        Tests that classes of a feature which is not selected only filter the samples
+        """
+        df = pd.DataFrame({'feature1': ['B', 'A', 'A', 'B'],
+                           'feature2': ['X', 'X', 'Y', 'X'],
+                           'year': [2015, 2015, 2015, 2016]})
+        features = ['feature1', 'feature2']
+        classes = {'feature1': ['B', 'A'], 'year': [2015]}
+
+        expected_df = pd.DataFrame({'feature1': pd.Categorical(['B', 'A', 'A'], categories=['B', 'A'], ordered=True),
+                                    'feature2': ['X', 'X', 'Y'],
+                                    'count': [1, 1, 1]})
+
+        transform = Transform(df, features, classes)
+        transform.clean_data()
+        transform.group_and_count()
+        pd.testing.assert_frame_equal(transform.sort_data(), expected_df)
+
+    def test_clean_data_compact_dtypes(self):
+        """
+        Tests that classes filter categorical and nullable integer columns as they filter the default types
+        """
+        df = pd.DataFrame({'feature1': ['B', 'A', 'A', 'B', None],
+                           'feature2': ['X', 'X', 'Y', 'X', 'Y'],
+                           'year': [2015, None, 2015, 2016, 2015]})
+        features = ['feature1', 'feature2']
+        classes = {'feature1': ['B', 'A'], 'year': [2015]}
+        compact = df.astype({'feature1': 'category', 'feature2': 'category', 'year': 'Int16'})
+
+        expected_df = Transform(df, features, classes).clean_data()
+        result_df = Transform(compact, features, classes).clean_data()
+        pd.testing.assert_frame_equal(result_df.astype(object), expected_df)
+
     def test_sort_data_key_error(self):
         """
         Tests handling of missing features in DataFrame when sorting data
@@ -111,5 +219,115 @@ class TestTransform(TestCase):
             result_df = transform.sort_data()
             self.assertIsNone(result_df)
             self.assertIn("Provided features are not found in the DataFrame", log.output[0])
-   
 
+    def test_aggregate_chunks_matches_eager(self):
+        """
+        Tests that aggregating chunks gives the same result as cleaning, grouping and counting the whole data
+        """
+        df = pd.DataFrame({'feature1': ['X', 'Y', 'X', 'Z', 'Y', 'X', None, 'Y'],
+                           'feature2': ['A', 'B', 'A', 'B', None, 'B', 'A', 'A'],
+                           'feature3': [1.4, 2.9, 3.1, 1.73, 0.2, None, 5.0, 0.3]})
+        features = ['feature1', 'feature2']
+        classes = {'feature1': ['Y', 'X']}
+
+        eager = Transform(df, features, classes)
+        eager.clean_data()
+        expected_df = eager.group_and_count()
+
+        chunks = [df.iloc[start:start + 3] for start in range(0, len(df), 3)]
+        result_df = Transform(None, features, classes).aggregate_chunks(chunks)
+
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_aggregate_chunks_bincount(self):
+        """
+        Tests that aggregating chunks with the bincount engine gives the same sorted result as the groupby engine
+        """
+        df = pd.DataFrame({'feature1': ['X', 'Y', 'X', 'Z', 'Y', 'X', None, 'Y'],
+                           'feature2': ['A', 'B', 'A', 'B', 'C', 'B', 'A', 'A']})
+        features = ['feature1', 'feature2']
+        classes = {'feature1': ['Y', 'X']}
+        chunks = [df.iloc[start:start + 3] for start in range(0, len(df), 3)]
+
+        groupby = Transform(None, features, classes)
+        groupby.aggregate_chunks(chunks)
+        bincount = Transform(None, features, classes, engine="bincount")
+        bincount.aggregate_chunks(chunks)
+
+        pd.testing.assert_frame_equal(bincount.sort_data(), groupby.sort_data())
+
+    def test_aggregate_chunks_key_error(self):
+        """
+        Tests handling of missing features in the chunks
+        """
+        chunks = [pd.DataFrame({'feature1': ['X', 'Y']})]
+        transform = Transform(None, ['feature1', 'feature2'], {'feature1': ['X']})
+
+        with self.assertLogs(level='ERROR') as log:
+            self.assertIsNone(transform.aggregate_chunks(chunks))
+            self.assertIn("Error while cleaning the data", log.output[0])
+
+
+    def test_aggregate_matches_pandas(self):
+        """
+        Tests that all measures computed in one pass equal separate pandas aggregations, skipping empty values
+        """
+        df = pd.DataFrame({'feature1': ['X', 'Y', 'X', 'Z', 'Y', 'X', None, 'Y', 'X'],
+                           'feature2': ['A', 'B', 'A', 'B', 'C', 'A', 'A', 'B', 'B'],
+                           'sales': [1.0, 2.5, None, 4.0, 0.5, 3.0, 9.0, 1.5, None]})
+        features = ['feature1', 'feature2']
+        classes = {'feature1': ['Y', 'X']}
+        measures = [Measure.parse(spec) for spec in ["count", "sum:sales", "mean:sales",
+                                                     "quantile:sales:0.5", "quantile:sales:0.9"]]
+
+        transform = Transform(df, features, classes, measures=measures)
+        transform.clean_data()
+        transform.group_and_count()
+        result_df = transform.sort_data()
+
+        selected = df[df['feature1'].isin(classes['feature1']) & df['feature2'].notna()]
+        grouped = selected.groupby(features)['sales']
+        expected_df = pd.DataFrame({'count': grouped.size(), 'sales_sum': grouped.sum(),
+                                    'sales_mean': grouped.mean(), 'sales_q0.5': grouped.quantile(0.5),
+                                    'sales_q0.9': grouped.quantile(0.9)}).reset_index()
+        expected_df['feature1'] = pd.Categorical(expected_df['feature1'], categories=classes['feature1'], ordered=True)
+        expected_df = expected_df.sort_values(features).reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_aggregate_empty_group_values(self):
+        """
+        Tests that a group whose measured values are all empty has a zero sum and no mean or quantile
+        """
+        df = pd.DataFrame({'feature1': ['X', 'Y'], 'feature2': ['A', 'A'], 'sales': [None, 2.0]})
+        measures = [Measure("sum", "sales"), Measure("mean", "sales"), Measure("quantile", "sales", 0.5)]
+
+        transform = Transform(df, ['feature1', 'feature2'], {}, measures=measures)
+        transform.clean_data()
+        result_df = transform.group_and_count()
+
+        self.assertEqual(result_df['sales_sum'].tolist(), [0.0, 2.0])
+        self.assertTrue(pd.isna(result_df['sales_mean'][0]))
+        self.assertTrue(pd.isna(result_df['sales_q0.5'][0]))
+        self.assertEqual(result_df['sales_q0.5'][1], 2.0)
+
+    def test_aggregate_key_error(self):
+        """
+        Tests handling of a measured column missing from the data
+        """
+        df = pd.DataFrame({'feature1': ['X'], 'feature2': ['A']})
+        transform = Transform(df, ['feature1', 'feature2'], {}, measures=[Measure("sum", "sales")])
+
+        with self.assertLogs(level='ERROR') as log:
+            self.assertIsNone(transform.aggregate())
+            self.assertIn("Error while aggregating the data", log.output[0])
+
+    def test_measure_parse(self):
+        """
+        Tests parsing of measures and the names of their columns
+        """
+        self.assertEqual(Measure.parse("count").name, "count")
+        self.assertEqual(Measure.parse("mean:na_sales"), Measure("mean", "na_sales"))
+        self.assertEqual(Measure.parse("quantile:na_sales:0.9").name, "na_sales_q0.9")
+        with self.assertRaises(ValueError):
+            Measure.parse("median:na_sales")
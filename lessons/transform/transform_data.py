@@ -1,6 +1,48 @@
 import pandas as pd
+import numpy as np
 import logging
-from typing import List, Dict
+from attrs import define
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FUNCTIONS = ("count", "sum", "mean", "quantile")
+
+@define
+class Measure:
+    """
+    Class storing a measure computed for every group by `Transform.aggregate`
+    """
+    function: str
+    column: Optional[str] = None
+    q: float = 0.5
+
+    @classmethod
+    def parse(cls, spec: str) -> "Measure":
+        """
+        Args:
+            spec: Measure written as "count", "<function>:<column>" or "quantile:<column>:<q>", 
+                e.g. "sum:na_sales" or "quantile:global_sales:0.9"
+
+        Returns:
+            Measure: Parsed measure
+        """
+        function, *arguments = spec.split(":")
+        if function not in FUNCTIONS or len(arguments) != {"count": 0, "quantile": 2}.get(function, 1):
+            raise ValueError(f"Invalid measure: {spec}")
+        if function == "quantile":
+            return cls(function, arguments[0], float(arguments[1]))
+        return cls(function, arguments[0] if arguments else None)
+
+    @property
+    def name(self) -> str:
+        """
+        Returns:
+            str: Name of the column of the measure, e.g. "count", "na_sales_sum" or "global_sales_q0.9"
+        """
+        if self.function == "count":
+            return "count"
+        if self.function == "quantile":
+            return f"{self.column}_q{self.q:g}"
+        return f"{self.column}_{self.function}"
 
 class Transform:
     """
@@ -10,32 +52,49 @@ class Transform:
     def __init__(self, 
                  df: pd.DataFrame, 
                  features: List[str], 
-                 classes: Dict[str, List[str]]
+                 classes: Dict[str, List[str]],
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby",
+                 measures: Optional[List[Measure]] = None
                  ) -> None:
         """       
         Args:
             df: Data before transformation
             features: Features to select
             classes: A dictionary storing feature and their classes to select
+            legacy_dropna: If True, samples with an empty field in any column 
+                are deleted, not only in the selected features
+            engine: Counting engine of `group_and_count`, "groupby" or "bincount"
+            measures: Measures computed by `group_and_count` instead of the count alone, 
+                their columns are kept by `clean_data` next to the features
         """
         self.df = df
         self.features = features
         self.classes = classes
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+        self.measures = measures or []
+        self._presorted = False
         
     def clean_data(self) -> pd.DataFrame:
         """
-        Cleans the data: deletes samples with empty fields and selects 
-        only necessary features and specified feature classes from the data
+        Cleans the data: deletes samples with empty fields in the selected features 
+        and selects only necessary features and specified feature classes from the data.
+        All conditions are combined into one boolean mask, so the data is copied once
 
         Returns: 
             pd.DataFrame: Data after transformation
         """
         try:
-            self.df = self.df.dropna()
-            self.df = self.df[self.features]
+            mask = np.ones(len(self.df), dtype=bool)
+            for column in (self.df.columns if self.legacy_dropna else self.features):
+                mask &= self.df[column].notna().to_numpy()
             for feature, class_list in self.classes.items():
-                self.df = self.df[self.df[feature].isin(class_list)]
-            self.df = self.df.reset_index(drop=True)
+                mask &= self.df[feature].isin(class_list).to_numpy(dtype=bool, na_value=False)
+
+            columns = list(dict.fromkeys([*self.features, *(measure.column for measure in self.measures
+                                                              if measure.column is not None)]))
+            self.df = pd.DataFrame({column: self.df[column].array[mask] for column in columns})
             logging.info("Data has been cleaned")
             return self.df
         except KeyError as e:
@@ -49,8 +108,13 @@ class Transform:
         Returns: 
             pd.DataFrame: Data after transformation
         """
+        if self.measures:
+            return self.aggregate()
         try:
-            self.df = self.df.groupby(self.df.columns.tolist()).size().reset_index(name='count')
+            if self.engine == "bincount":
+                self.df = self._bincount()
+            else:
+                self.df = self.df.groupby(self.df.columns.tolist(), observed=True).size().sort_index().reset_index(name='count')
             logging.info("Data has been grouped and counted")
             return self.df
         except AttributeError as e:
@@ -61,9 +125,13 @@ class Transform:
         """
         Sorts the data ascended
         """
+        if self._presorted:
+            logging.info("Data has been sorted")
+            return self.df
         try:
             for feature, class_list in self.classes.items():
-                self.df[feature] = pd.Categorical(self.df[feature], categories=class_list, ordered=True)
+                if feature in self.features:
+                    self.df[feature] = pd.Categorical(self.df[feature], categories=class_list, ordered=True)
     
             self.df = self.df.sort_values(by=self.features, ascending=[True, True])
             self.df = self.df.reset_index(drop=True)
@@ -72,3 +140,187 @@ class Transform:
         except KeyError as e:
             logging.error("Provided features are not found in the DataFrame: %s", e)
             return None
+
+    def aggregate_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Cleans, groups and counts the data chunk by chunk and adds the partial 
+        counts into a running total, so memory depends on the number of unique 
+        pairs instead of the number of rows
+
+        Args:
+            chunks: Consecutive chunks of the data before transformation
+
+        Returns: 
+            pd.DataFrame: Data after transformation, equal to calling `clean_data` 
+                and `group_and_count` on the concatenated chunks
+        """
+        total = None
+        for chunk in chunks:
+            self.df = chunk
+            if self.clean_data() is None or self.group_and_count() is None:
+                return None
+            total = self.df if total is None else self.merge_counts([total, self.df])
+
+        self.df = pd.DataFrame(columns=self.features + ['count']) if total is None else total
+        self._presorted = False
+        logging.info("Data chunks have been aggregated")
+        return self.df
+
+    def merge_counts(self, counts: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Adds up partial results of `group_and_count` computed on separate 
+        parts of the data
+
+        Args:
+            counts: Grouped and counted parts of the data
+
+        Returns: 
+            pd.DataFrame: Data after transformation, equal to calling `group_and_count` 
+                on the concatenated parts
+        """
+        self.df = pd.concat(counts, ignore_index=True)
+        self.df = self.df.groupby(self.features, observed=True)['count'].sum().sort_index().reset_index()
+        self._presorted = False
+        return self.df
+
+    def aggregate(self) -> pd.DataFrame:
+        """
+        Groups the samples and computes all measures in one pass: the group 
+        codes are built once as in the "bincount" engine, sums and non-empty 
+        counts are weighted `np.bincount` calls over those codes, means reuse 
+        the sums and all quantiles of a column share a single sort of its values 
+        by group. Empty values of a measured column are skipped like in pandas
+
+        Returns: 
+            pd.DataFrame: Grouped data with a column per measure in the format 
+                returned by `sort_data`
+        """
+        try:
+            combined, labels, shape, valid = self._group_codes(self.features)
+            values = {}
+            for column in dict.fromkeys(measure.column for measure in self.measures if measure.column is not None):
+                column_values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                values[column] = column_values if valid is None else column_values[valid]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logging.error("Error while aggregating the data: %s", e)
+            return None
+
+        counts = np.bincount(combined, minlength=int(np.prod(shape)))
+        observed = np.flatnonzero(counts)
+        groups = len(observed)
+        group = (np.cumsum(counts > 0) - 1)[combined]
+        sizes = counts[observed]
+
+        result = {}
+        for column, label, column_codes in zip(self.features, labels, np.unravel_index(observed, shape)):
+            if isinstance(label, pd.CategoricalDtype):
+                result[column] = pd.Categorical.from_codes(column_codes, dtype=label)
+            else:
+                result[column] = label.take(column_codes)
+
+        cache = {}
+        def statistic(kind: str, column: str) -> np.ndarray:
+            if (kind, column) not in cache:
+                x = values[column]
+                present = ~np.isnan(x)
+                if kind == "present":
+                    cache[kind, column] = np.bincount(group[present], minlength=groups)
+                elif kind == "sum":
+                    cache[kind, column] = np.bincount(group, weights=np.where(present, x, 0.0), minlength=groups)
+                else:
+                    cache[kind, column] = x[np.lexsort((x, group))]
+            return cache[kind, column]
+
+        starts = np.cumsum(sizes) - sizes
+        for measure in self.measures:
+            if measure.function == "count":
+                result[measure.name] = sizes.astype('int64')
+                continue
+            present = statistic("present", measure.column)
+            if measure.function == "sum":
+                result[measure.name] = statistic("sum", measure.column)
+            elif measure.function == "mean":
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    result[measure.name] = np.where(present > 0, statistic("sum", measure.column) / present, np.nan)
+            else:
+                ordered = statistic("sorted", measure.column)
+                position = (present - 1).clip(0) * measure.q
+                lower = np.floor(position).astype(np.intp)
+                upper = np.ceil(position).astype(np.intp)
+                low, high = ordered[starts + lower], ordered[starts + upper]
+                with np.errstate(invalid='ignore'):
+                    value = low + (high - low) * (position - lower)
+                result[measure.name] = np.where(present > 0, value, np.nan)
+
+        self.df = pd.DataFrame(result)
+        self._presorted = True
+        logging.info("Data has been grouped and aggregated")
+        return self.df
+
+    def _group_codes(self, columns: List[str]) -> Tuple[np.ndarray, list, Tuple[int, ...], Optional[np.ndarray]]:
+        """
+        Maps every column to integer codes, in class order for features with 
+        specified classes and in sorted order for the others, and combines them 
+        into a single code per sample
+
+        Args:
+            columns: Columns to group by
+
+        Returns: 
+            Tuple: Combined codes of samples without an empty field, labels and 
+                number of codes of every column, and the mask of those samples 
+                or None if no field is empty
+        """
+        codes, labels = [], []
+        for column in columns:
+            series = self.df[column]
+            if column in self.classes:
+                dtype = pd.CategoricalDtype(self.classes[column], ordered=True)
+                codes.append(pd.Categorical(series, dtype=dtype).codes)
+                labels.append(dtype)
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                codes.append(series.cat.codes.to_numpy())
+                labels.append(series.dtype)
+            else:
+                column_codes, uniques = pd.factorize(series, sort=True)
+                codes.append(column_codes)
+                labels.append(uniques)
+
+        shape = tuple(len(label.categories) if isinstance(label, pd.CategoricalDtype) else len(label)
+                      for label in labels)
+        combined = np.zeros(len(self.df), dtype=np.intp)
+        for column_codes, size in zip(codes, shape):
+            combined *= size
+            combined += column_codes
+        missing = [column_codes < 0 for column_codes in codes if column_codes.min(initial=0) < 0]
+        valid = None
+        if missing:
+            valid = ~np.logical_or.reduce(missing)
+            combined = combined[valid]
+        return combined, labels, shape, valid
+
+    def _bincount(self) -> pd.DataFrame:
+        """
+        Counts each unique combination of samples by mapping every feature to
+        integer codes with `_group_codes` and counting the combined codes with a 
+        single `np.bincount`. The combinations come out in the order produced 
+        by `sort_data`, which is therefore skipped afterwards
+
+        Returns: 
+            pd.DataFrame: Counted data in the format returned by `sort_data`
+        """
+        columns = self.df.columns.tolist()
+        combined, labels, shape, _ = self._group_codes(columns)
+        counts = np.bincount(combined, minlength=int(np.prod(shape)))
+        observed = np.flatnonzero(counts)
+
+        result = {}
+        for column, label, column_codes in zip(columns, labels, np.unravel_index(observed, shape)):
+            if isinstance(label, pd.CategoricalDtype):
+                result[column] = pd.Categorical.from_codes(column_codes, dtype=label)
+            else:
+                result[column] = label.take(column_codes)
+        result['count'] = counts[observed].astype('int64')
+
+        self._presorted = columns == self.features
+        return pd.DataFrame(result)
@@ -1,6 +1,9 @@
 from unittest import TestCase, mock
 from visualization import BarPlot, EmptyDataFrameError
+import os
+import tempfile
 import pandas as pd
+import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib.axes._axes import Axes
 
@@ -78,3 +81,109 @@ class TestBarPlot(TestCase):
             with self.assertRaises(FileNotFoundError):
                 self.bar_plot.save_image(plot_path)
             self.assertIn("Path to save the image is incorrect", log.output[0])
+
+    def test_create_fast_plot_success(self):
+        """
+        Tests that the fast mode draws all bars as one collection on a figure unknown to pyplot
+        """
+        df = pd.DataFrame({
+            'Platform': ['PC', 'PC', 'PlayStation'],
+            'Genre': ['Action', 'Adventure', 'Adventure'],
+            'Count': [10, 5, 20]
+            })
+        bar_plot = BarPlot(fast=True)
+        figures_before = plt.get_fignums()
+
+        bar_plot.create_plot(df)
+
+        self.assertIsInstance(bar_plot.fig, Figure, "Figure was not created")
+        self.assertEqual(bar_plot.ax.get_title(), "Game Genre Distribution Across Platforms")
+        self.assertEqual(bar_plot.ax.get_xlabel(), "Platform")
+        self.assertEqual(bar_plot.ax.get_ylabel(), "Count")
+        self.assertEqual(len(bar_plot.ax.collections), 1)
+        self.assertEqual(len(bar_plot.ax.collections[0].get_paths()), 3)
+        self.assertEqual(len(bar_plot.ax.patches), 0)
+        self.assertEqual(plt.get_fignums(), figures_before)
+
+    def test_create_plot_value_column(self):
+        """
+        Tests that the bars are drawn from the given value column, which labels the y axis
+        """
+        df = pd.DataFrame({
+            'Platform': ['PC', 'PlayStation'],
+            'Genre': ['Action', 'Action'],
+            'count': [10, 20],
+            'na_sales_sum': [1.5, 4.0]
+            })
+        for fast in (False, True):
+            bar_plot = BarPlot(fast=fast, value='na_sales_sum')
+
+            bar_plot.create_plot(df)
+
+            self.assertEqual(bar_plot.ax.get_ylabel(), "na_sales_sum")
+            if fast:
+                self.assertAlmostEqual(bar_plot.ax.get_ylim()[1], 4.0 * 1.05)
+            else:
+                self.assertEqual([patch.get_height() for patch in bar_plot.ax.patches], [1.5, 4.0])
+
+    def test_render_png(self):
+        """
+        Tests that both modes render the plot into PNG bytes without saving a file
+        """
+        df = pd.DataFrame({
+            'Platform': ['PC', 'PlayStation'],
+            'Genre': ['Action', 'Adventure'],
+            'Count': [10, 20]
+            })
+        for fast in (False, True):
+            bar_plot = BarPlot(fast=fast)
+            bar_plot.create_plot(df)
+
+            self.assertTrue(bar_plot.render_png().startswith(b"\x89PNG\r\n\x1a\n"))
+
+    @mock.patch('matplotlib.pyplot.savefig')
+    def test_save_fast_image_reuses_figure(self, mock_savefig: mock.Mock):
+        """
+        Tests that the fast mode saves without pyplot and reuses its figure for the next plot
+        """
+        df = pd.DataFrame({
+            'Platform': ['PC', 'PlayStation'],
+            'Genre': ['Action', 'Adventure'],
+            'Count': [10, 20]
+            })
+        bar_plot = BarPlot(fast=True)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plot_path = os.path.join(tmp_dir, "plot.png")
+            bar_plot.create_plot(df)
+            figure = bar_plot.fig
+            bar_plot.save_image(plot_path)
+            bar_plot.create_plot(df)
+
+            with open(plot_path, 'rb') as file:
+                self.assertEqual(file.read(8), b"\x89PNG\r\n\x1a\n")
+
+        mock_savefig.assert_not_called()
+        self.assertIs(bar_plot.fig, figure)
+        self.assertEqual(len(bar_plot.ax.collections), 1)
+
+    def test_fast_plot_layout_follows_labels(self):
+        """
+        Tests that a reused figure is laid out again for a chart with longer labels, like a new figure
+        """
+        short = pd.DataFrame({'Platform': ['PC', 'PS4'], 'Genre': ['Action', 'Racing'], 'Count': [10, 20]})
+        long = pd.DataFrame({'Platform': ['PC', 'PS4'], 'Genre': ['Action-Adventure Role-Playing', 'Racing'],
+                             'Count': [10, 20]})
+        bar_plot = BarPlot(fast=True)
+        bar_plot.create_plot(short)
+        bar_plot.render_png()
+        bar_plot.create_plot(long)
+        bar_plot.render_png()
+        fresh = BarPlot(fast=True)
+        fresh.create_plot(long)
+        fresh.render_png()
+
+        self.assertAlmostEqual(bar_plot.fig.subplotpars.right, fresh.fig.subplotpars.right, delta=0.01)
+        renderer = bar_plot.fig.canvas.get_renderer()
+        legend = bar_plot.ax.get_legend().get_window_extent(renderer)
+        self.assertLessEqual(legend.x1, bar_plot.fig.bbox.width)
@@ -1,7 +1,25 @@
-import matplotlib.pyplot as plt
+from __future__ import annotations
 import logging
-import pandas as pd
 import numpy as np
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _pyplot():
+    """
+    Imports pyplot pinned to the non-interactive Agg backend. Only the default 
+    plot needs pyplot, so importing this module loads none of matplotlib
+
+    Returns:
+        module: matplotlib.pyplot
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
 
 class EmptyDataFrameError(Exception):
     """Custom exception for handling empty DataFrame errors in BarPlot"""
@@ -12,9 +30,19 @@ class BarPlot:
     Class to create and save bar plot to specified path
     """
 
-    def __init__(self) -> None:
+    def __init__(self, fast: bool = False, value: Optional[str] = None) -> None:
+        """
+        Args:
+            fast: If True, all bars are drawn as a single collection on an Agg 
+                canvas without pyplot, and the figure is reused by later plots
+            value: Column with the heights of the bars, e.g. a measure of 
+                `Transform.aggregate`, by default the third column of the data
+        """
         self.ax = None
         self.fig = None
+        self.fast = fast
+        self.value = value
+        self._layout_labels = None
 
     def create_plot(self, df: pd.DataFrame) -> None:
         """
@@ -30,15 +58,15 @@ class BarPlot:
         try:
             platform = df.columns[0]
             columns = df.columns[1]
-            values = df.columns[2]
+            values = self.value or df.columns[2]
 
             pivot_df = df.pivot(index=platform, columns=columns, values=values)
             genres = pivot_df.columns
+            genre_colors = self._genre_colors(len(genres))
 
-            half_samples = int(len(genres)/2)
-            genre_blues = plt.cm.Blues(np.linspace(0.2, 0.8, half_samples))
-            genre_greens = plt.cm.Greens(np.linspace(0.2, 0.8, len(genres) - half_samples))
-            genre_colors = np.concatenate((genre_blues, genre_greens), axis=0)
+            if self.fast:
+                self._create_fast_plot(pivot_df, genre_colors)
+                return
 
             genre_color_map = {genre: genre_colors[i] for i, genre in enumerate(genres)}
 
@@ -46,6 +74,7 @@ class BarPlot:
             width = 0.05
             multiplier = 0
 
+            plt = _pyplot()
             self.fig, self.ax = plt.subplots(figsize=(12, 6))
 
             for genre in genres:
@@ -63,7 +92,7 @@ class BarPlot:
             self.ax.set_xticks(x + width * (len(genres) - 1) / 2)
             self.ax.set_xticklabels(pivot_df.index)
             self.ax.set_xlabel('Platform')
-            self.ax.set_ylabel('Count')
+            self.ax.set_ylabel(self._value_label())
             self.ax.legend(title='Genre', bbox_to_anchor=(1.05, 1))
             plt.tight_layout()
             plt.grid()
@@ -82,12 +111,109 @@ class BarPlot:
             plot_path: Path to save the image
         """
         try:
-            plt.savefig(plot_path)
-            plt.close(self.fig)
+            if self.fast and plot_path.lower().endswith(".png"):
+                self.fig.canvas.print_png(plot_path)
+            elif self.fast:
+                self.fig.savefig(plot_path)
+            else:
+                plt = _pyplot()
+                plt.savefig(plot_path)
+                plt.close(self.fig)
             logging.info(f"Plot saved to {plot_path}")
         except FileNotFoundError as e:
             logging.error("Path to save the image is incorrect: %s", e)  
             raise e      
 
+    def render_png(self) -> bytes:
+        """
+        Renders the plot into PNG bytes in memory, without a file
 
+        Returns:
+            bytes: PNG image of the plot
+        """
+        import io
+        buffer = io.BytesIO()
+        if self.fast:
+            self.fig.canvas.print_png(buffer)
+        else:
+            self.fig.savefig(buffer, format='png')
+            _pyplot().close(self.fig)
+        return buffer.getvalue()
 
+    def _create_fast_plot(self, pivot_df: pd.DataFrame, genre_colors: np.ndarray) -> None:
+        """
+        Draws the bars of all genres as one PolyCollection on a figure owned 
+        by an Agg canvas. The figure is created by the first plot and reused
+        by the next ones, its layout is computed again only when the labels change
+
+        Args:
+            pivot_df: Counts with platforms as index and genres as columns
+            genre_colors: RGBA color of each genre
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import PolyCollection
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Patch
+
+        genres = pivot_df.columns
+        width = 0.05
+        x = np.arange(len(pivot_df.index))
+        counts = pivot_df.to_numpy(dtype=float)
+
+        lefts = (x[:, None] + width * np.arange(len(genres))[None, :] - width / 2).ravel()
+        heights = counts.ravel()
+        colors = np.tile(genre_colors, (len(x), 1))
+        drawn = np.isfinite(heights)
+        lefts, heights, colors = lefts[drawn], heights[drawn], colors[drawn]
+
+        verts = np.zeros((len(lefts), 4, 2))
+        verts[:, [0, 1], 0] = lefts[:, None]
+        verts[:, [2, 3], 0] = (lefts + width)[:, None]
+        verts[:, [1, 2], 1] = heights[:, None]
+
+        if self.fig is None:
+            self.fig = Figure(figsize=(12, 6))
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.add_subplot()
+        else:
+            self.ax.clear()
+
+        self.ax.add_collection(PolyCollection(verts, facecolors=colors))
+        x_min, x_max = lefts.min(initial=0), (lefts + width).max(initial=width)
+        margin = 0.05 * (x_max - x_min)
+        self.ax.set_xlim(x_min - margin, x_max + margin)
+        self.ax.set_ylim(0, heights.max(initial=0) * 1.05 or 1)
+        self.ax.set_title('Game Genre Distribution Across Platforms')
+        self.ax.set_xticks(x + width * (len(genres) - 1) / 2)
+        self.ax.set_xticklabels(pivot_df.index)
+        self.ax.set_xlabel('Platform')
+        self.ax.set_ylabel(self._value_label())
+        handles = [Patch(color=color, label=genre) for genre, color in zip(genres, genre_colors)]
+        self.ax.legend(handles=handles, title='Genre', bbox_to_anchor=(1.05, 1), loc='upper left')
+        labels = (tuple(map(str, pivot_df.index)), tuple(map(str, genres)), self._value_label())
+        if labels != self._layout_labels:
+            self.fig.tight_layout()
+            self._layout_labels = labels
+        self.ax.grid()
+
+    def _value_label(self) -> str:
+        """
+        Returns:
+            str: Label of the y axis, "Count" unless another value column is plotted
+        """
+        return 'Count' if self.value in (None, 'count') else self.value
+
+    @staticmethod
+    def _genre_colors(n_genres: int) -> np.ndarray:
+        """
+        Args:
+            n_genres: Number of genres
+
+        Returns:
+            np.ndarray: RGBA colors, blues for the first half of genres and greens for the rest
+        """
+        import matplotlib
+        half_samples = int(n_genres/2)
+        genre_blues = matplotlib.colormaps['Blues'](np.linspace(0.2, 0.8, half_samples))
+        genre_greens = matplotlib.colormaps['Greens'](np.linspace(0.2, 0.8, n_genres - half_samples))
+        return np.concatenate((genre_blues, genre_greens), axis=0)
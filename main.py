@@ -1,11 +1,92 @@
 from configuration.config import BaseConfig as config
-from lessons.extract.load_data import Loader
-from lessons.transform.transform_data import Transform
-from lessons.visualize.visualization import BarPlot
+from pipeline.memo import ResultCache
+import glob
 import logging
+import os
 
 logging.basicConfig(level="INFO", format="%(message)s")
 
+
+def compute_counts(shards, loader, instrument):
+    """
+    Ingests, cleans, groups, counts and sorts the data. Modules depending on
+    pandas are imported here, so a run served from the result cache skips them.
+    A compressed dataset is only read through pandas, as the incremental
+    aggregator and the scanner work on raw byte offsets. Measures other than
+    the count are computed on the downloaded dataset in a single eager pass
+
+    Args:
+        shards: Paths of CSV shards, the downloaded dataset is used if empty
+        loader: Loader of the downloaded dataset
+        instrument: Function wrapping methods of an object with the profiler
+
+    Returns:
+        pd.DataFrame: Sorted counts
+    """
+    if shards:
+        from pipeline.parallel import ParallelAggregator
+        aggregator = ParallelAggregator(shards, config.FEATURES, config.CLASSES,
+                                        config.WORKERS, config.LEGACY_DROPNA, config.ENGINE)
+        return instrument(aggregator, ['aggregate']).aggregate()
+
+    if config.MEASURES:
+        from lessons.transform.transform_data import Measure, Transform
+        measures = [Measure.parse(spec) for spec in config.MEASURES]
+        transform = Transform(loader.ingest_data(), config.FEATURES, config.CLASSES,
+                              config.LEGACY_DROPNA, config.ENGINE, measures)
+        transform.clean_data()
+        instrument(transform, ['aggregate']).aggregate()
+        return transform.sort_data()
+
+    if config.INCREMENTAL and not config.COMPRESSION:
+        from pipeline.incremental import IncrementalAggregator
+        aggregator = IncrementalAggregator(config.DATA_PATH, config.INCREMENTAL_STATE_PATH,
+                                           config.FEATURES, config.CLASSES, config.LEGACY_DROPNA,
+                                           config.ENGINE, config.INGEST_CHUNKSIZE)
+        return instrument(aggregator, ['aggregate']).aggregate()
+
+    if config.COUNT_CUBE:
+        from pipeline.cube import CountCube
+        cube = CountCube.for_file(config.CUBE_PATH, loader, config.CUBE_DIMENSIONS)
+        if cube.supports(config.FEATURES, config.CLASSES, config.LEGACY_DROPNA):
+            return instrument(cube, ['query']).query(config.FEATURES, config.CLASSES)
+
+    from pipeline.scanner import MmapCounter
+    counter = MmapCounter(config.DATA_PATH, config.FEATURES, config.CLASSES, config.WORKERS)
+    if config.MMAP_SCAN and not config.COMPRESSION and counter.supports(config.LEGACY_DROPNA, config.DTYPES):
+        try:
+            return instrument(counter, ['count']).count()
+        except ValueError as e:
+            logging.error("File cannot be scanned, counting it with pandas: %s", e)
+
+    from pipeline.plan import LazyTransform
+    plan = LazyTransform(loader, config.FEATURES, config.CLASSES, config.LEGACY_DROPNA, config.ENGINE)
+    plan.clean_data().group_and_count().sort_data()
+    return instrument(plan, ['collect']).collect(config.STREAMING_INGEST, config.INGEST_CHUNKSIZE)
+
+
+def make_loader(instrument):
+    """
+    Args:
+        instrument: Function wrapping methods of an object with the profiler
+
+    Returns:
+        Callable[[], Loader]: Function creating the Loader of the dataset on its first call,
+            so its modules are imported only when the dataset is fetched or ingested
+    """
+    loaders = []
+
+    def get_loader():
+        if not loaders:
+            from lessons.extract.load_data import Loader
+            loader = Loader(config.DATA_URL, config.DATA_PATH, config.CHUNK_SIZE,
+                            config.CACHE_PATH, config.CATEGORICAL_COLUMNS, config.EAGER_CACHE, config.DTYPES,
+                            compression_level=config.COMPRESSION_LEVEL)
+            loaders.append(instrument(loader, ['fetch_file', 'ingest_data']))
+        return loaders[0]
+    return get_loader
+
+
 if __name__ == "__main__":
     """
     Executes whole process:
@@ -15,17 +96,86 @@ if __name__ == "__main__":
     4. Data Cleaning
     5. Data Visualization
     6. Image Saving
+
+    Files listed in BaseConfig.SOURCES are downloaded concurrently before the
+    shards are collected. With BaseConfig.OVERLAP_INGEST the dataset is
+    counted while it downloads.
+    Set PIPELINE_PROFILE=table or PIPELINE_PROFILE=json to measure every stage,
+    and PIPELINE_MEMORY_REPORT=1 to log the memory of every ingested column
+    after the run.
+    Results are memoized in BaseConfig.RESULT_CACHE_DIR, so an unchanged dataset
+    and configuration only copy the cached image
     """
-    loader = Loader(config.DATA_URL, config.DATA_PATH)
-    response = loader.download_file()
-    loader.save_file(response)
-    df = loader.ingest_data()
-
-    transform = Transform(df, config.FEATURES, config.CLASSES)
-    df = transform.clean_data()
-    df = transform.group_and_count()
-    df = transform.sort_data()
-    
-    bar_plot = BarPlot()
-    bar_plot.create_plot(df)
-    bar_plot.save_image(config.GRAPH_PATH)
\ No newline at end of file
+    profiler = None
+    if config.PROFILE:
+        from pipeline.instrumentation import StageProfiler
+        profiler = StageProfiler.from_config(config.PROFILE, config.PROFILE_TRACEMALLOC)
+
+    def instrument(obj, methods):
+        return profiler.instrument(obj, methods) if profiler else obj
+
+    cache = ResultCache(config.RESULT_CACHE_DIR, config.RESULT_CACHE_MAX_BYTES) if config.RESULT_CACHE_DIR else None
+    if config.SOURCES:
+        from pipeline.download import MultiLoader
+        sources = [(url, path) for url, path in config.SOURCES
+                   if not (cache and cache.checked_within(path, config.FETCH_MAX_AGE))]
+        multi_loader = MultiLoader(sources, config.DOWNLOAD_WORKERS, config.DOWNLOAD_PER_HOST,
+                                   config.DOWNLOAD_RETRIES, config.DOWNLOAD_BACKOFF, chunk_size=config.CHUNK_SIZE)
+        for status in instrument(multi_loader, ['fetch_all']).fetch_all():
+            if status.ok and cache:
+                cache.mark_checked(status.path)
+
+    shards = sorted(glob.glob(config.SHARDS_PATTERN))
+    get_loader = None
+    streamed = None
+    if not shards:
+        get_loader = make_loader(instrument)
+        if not (cache and cache.checked_within(config.DATA_PATH, config.FETCH_MAX_AGE)):
+            if config.OVERLAP_INGEST and not config.MEASURES:
+                from pipeline.streaming import StreamingAggregator
+                aggregator = StreamingAggregator(get_loader(), config.FEATURES, config.CLASSES, config.LEGACY_DROPNA,
+                                                 config.ENGINE, config.OVERLAP_QUEUE_SIZE)
+                streamed = instrument(aggregator, ['aggregate']).aggregate()
+            else:
+                get_loader().fetch_file()
+            if cache and get_loader().up_to_date:
+                cache.mark_checked(config.DATA_PATH)
+
+    counts_key = image_key = entry = None
+    if cache:
+        counts_key = cache.key(cache.input_hash(shards or [config.DATA_PATH]),
+                               config.FEATURES, config.CLASSES, config.LEGACY_DROPNA, config.MEASURES)
+        entry = cache.get_counts(counts_key)
+        if entry is not None:
+            image_key = cache.key(entry["hash"], config.FAST_PLOT, config.PLOT_VALUE)
+
+    if image_key is not None and cache.get_image(image_key, config.GRAPH_PATH):
+        logging.info("Plot served from result cache: %s", config.GRAPH_PATH)
+    else:
+        if entry is not None:
+            import pandas as pd
+            from lessons.transform.transform_data import Transform
+            df = Transform(pd.DataFrame(entry["columns"]), config.FEATURES, config.CLASSES).sort_data()
+        else:
+            if streamed is not None:
+                df = streamed
+            else:
+                df = compute_counts(shards, get_loader() if get_loader else None, instrument)
+            if cache:
+                table_hash = cache.put_counts(counts_key, {column: df[column].tolist() for column in df.columns})
+                image_key = cache.key(table_hash, config.FAST_PLOT, config.PLOT_VALUE)
+
+        from lessons.visualize.visualization import BarPlot
+        bar_plot = instrument(BarPlot(config.FAST_PLOT, config.PLOT_VALUE), ['create_plot', 'save_image'])
+        bar_plot.create_plot(df)
+        bar_plot.save_image(config.GRAPH_PATH)
+        if cache and os.path.exists(config.GRAPH_PATH):
+            cache.put_image(image_key, config.GRAPH_PATH)
+
+    if profiler:
+        profiler.report()
+
+    if config.MEMORY_REPORT and not shards:
+        from lessons.extract.load_data import Loader
+        Loader.memory_report(Loader(None, config.DATA_PATH, cache_path=config.CACHE_PATH,
+                                    categorical_columns=config.CATEGORICAL_COLUMNS, dtypes=config.DTYPES).ingest_data())
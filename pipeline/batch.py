@@ -0,0 +1,188 @@
+import argparse
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import matplotlib
+import pandas as pd
+from attrs import define, field
+
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from lessons.visualize.visualization import BarPlot
+
+_bar_plot = None
+
+
+@define
+class ChartConfig:
+    """
+    Class storing parameters of a single chart
+    """
+    graph_path: str
+    classes: Dict[str, list]
+    features: List[str] = field(factory=lambda: list(config.FEATURES))
+    region: Optional[str] = None
+
+
+@define
+class ChartResult:
+    """
+    Class storing timings of a single chart
+    """
+    graph_path: str
+    rows: int
+    transform_seconds: float
+    render_seconds: float
+
+
+def _init_worker() -> None:
+    """
+    Pins the worker process to the Agg backend and creates the figure it reuses
+    """
+    global _bar_plot
+    matplotlib.use("Agg")
+    _bar_plot = BarPlot(fast=True)
+
+
+def render_chart(df: pd.DataFrame, graph_path: str) -> float:
+    """
+    Renders one chart with the figure of the current worker
+
+    Args:
+        df: Sorted counts to visualize
+        graph_path: Path to save the image
+
+    Returns:
+        float: Render time in seconds
+    """
+    start = time.perf_counter()
+    _bar_plot.create_plot(df)
+    _bar_plot.save_image(graph_path)
+    return time.perf_counter() - start
+
+
+class BatchCharts:
+    """
+    Class to generate many charts from a single ingest of the data
+    """
+
+    def __init__(self,
+                 data_path: str,
+                 charts: List[ChartConfig],
+                 workers: Optional[int] = None,
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby"
+                 ) -> None:
+        """
+        Args:
+            data_path: Path of the CSV file
+            charts: Parameters of the charts to generate
+            workers: Number of render processes, one per CPU if None
+            legacy_dropna: Cleaning semantics passed to Transform
+            engine: Counting engine passed to Transform
+        """
+        self.data_path = data_path
+        self.charts = charts
+        self.workers = workers
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+
+    def run(self) -> List[ChartResult]:
+        """
+        Ingests the data once, keeps only the columns any chart needs, computes
+        the counts of every chart from that shared frame and renders the charts
+        in a process pool
+
+        Returns:
+            List[ChartResult]: Timings of every chart, in the order of the configurations
+        """
+        columns = self._required_columns()
+        df = Loader(None, self.data_path, dtypes=config.DTYPES).ingest_data(columns)
+        logging.info("Data ingested once for %d charts", len(self.charts))
+
+        counted = [self._count(df, chart) for chart in self.charts]
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            render_seconds = list(executor.map(render_chart,
+                                               [counts for counts, _ in counted],
+                                               [chart.graph_path for chart in self.charts]))
+
+        results = [ChartResult(chart.graph_path, len(counts), transform_time, render_time)
+                   for chart, (counts, transform_time), render_time
+                   in zip(self.charts, counted, render_seconds)]
+        self._log_summary(results)
+        return results
+
+    def _required_columns(self) -> List[str]:
+        """
+        Returns:
+            List[str]: Columns used by the features, classes or regions of any chart
+        """
+        columns = []
+        for chart in self.charts:
+            needed = chart.features + list(chart.classes)
+            if chart.region is not None:
+                needed.append(f"{chart.region}_sales")
+            columns.extend(column for column in needed if column not in columns)
+        return columns
+
+    def _count(self, df: pd.DataFrame, chart: ChartConfig) -> Tuple[pd.DataFrame, float]:
+        """
+        Computes the sorted counts of one chart from the shared frame
+
+        Args:
+            df: Shared ingested data
+            chart: Parameters of the chart
+
+        Returns:
+            Tuple[pd.DataFrame, float]: Sorted counts and the time spent computing them
+        """
+        start = time.perf_counter()
+        if chart.region is not None:
+            df = df[df[f"{chart.region}_sales"] > 0]
+        transform = Transform(df, chart.features, chart.classes, self.legacy_dropna, self.engine)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data(), time.perf_counter() - start
+
+    @staticmethod
+    def _log_summary(results: List[ChartResult]) -> None:
+        """
+        Logs a table of per-chart timings
+
+        Args:
+            results: Timings of every chart
+        """
+        lines = [f"{'chart':<40}{'rows':>6}{'transform [ms]':>16}{'render [ms]':>13}"]
+        for result in results:
+            lines.append(f"{result.graph_path[-40:]:<40}{result.rows:>6}"
+                         f"{result.transform_seconds * 1000:>16.1f}{result.render_seconds * 1000:>13.1f}")
+        logging.info("\n".join(lines))
+
+
+def load_charts(path: str) -> List[ChartConfig]:
+    """
+    Reads chart configurations from a JSON list of objects with the fields of ChartConfig
+
+    Args:
+        path: Path of the JSON file
+
+    Returns:
+        List[ChartConfig]: Parameters of the charts
+    """
+    with open(path, 'r') as file:
+        return [ChartConfig(**chart) for chart in json.load(file)]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level="INFO", format="%(message)s")
+    parser = argparse.ArgumentParser(description="Generates one chart per configuration from a single ingest")
+    parser.add_argument("charts", help="JSON file with a list of chart configurations")
+    args = parser.parse_args()
+
+    batch = BatchCharts(config.DATA_PATH, load_charts(args.charts), config.WORKERS,
+                        config.LEGACY_DROPNA, config.ENGINE)
+    batch.run()
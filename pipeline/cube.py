@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+
+DIMENSIONS = ['platform', 'genre', 'year_of_release', 'rating']
+
+
+class CountCube:
+    """
+    Class storing the number of rows for every combination of values of a few
+    low-cardinality columns as one dense array, so counts for any subset of
+    those columns and any classes are answered by slicing and summing the
+    array instead of scanning the rows
+    """
+
+    def __init__(self,
+                 dimensions: List[str],
+                 categories: List[list],
+                 dtypes: List[str],
+                 counts: np.ndarray,
+                 source: Optional[Dict[str, Any]] = None
+                 ) -> None:
+        """
+        Args:
+            dimensions: Columns forming the axes of the cube
+            categories: Distinct values of every dimension as native Python values, 
+                the last slot of every axis counts rows with a missing value
+            dtypes: Data type of the values of every dimension, "category" for
+                dimensions read as categoricals
+            counts: Number of rows for every combination of category codes
+            source: Size, modification time and data types of the counted file
+        """
+        self.dimensions = dimensions
+        self.categories = categories
+        self.dtypes = dtypes
+        self.counts = counts
+        self.source = source or {}
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, dimensions: List[str] = DIMENSIONS,
+              source: Optional[Dict[str, Any]] = None) -> "CountCube":
+        """
+        Counts the rows of the data with a single `np.bincount` over combined category codes.
+        Categories are stored as native values, so they survive the JSON metadata of `save`
+
+        Args:
+            df: Data before transformation
+            dimensions: Columns forming the axes of the cube
+            source: Size, modification time and data types of the counted file
+
+        Returns:
+            CountCube: Counts of the data
+        """
+        categories, dtypes, shape = [], [], []
+        combined = np.zeros(len(df), dtype=np.intp)
+        for dimension in dimensions:
+            series = df[dimension]
+            categorical = series.array if isinstance(series.dtype, pd.CategoricalDtype) else pd.Categorical(series)
+            codes = np.asarray(categorical.codes, dtype=np.intp)
+            size = len(categorical.categories) + 1
+            codes[codes < 0] = size - 1
+            combined *= size
+            combined += codes
+            categories.append([value.item() if isinstance(value, np.generic) else value
+                               for value in categorical.categories.tolist()])
+            dtypes.append('category' if isinstance(series.dtype, pd.CategoricalDtype)
+                          else str(categorical.categories.dtype))
+            shape.append(size)
+
+        counts = np.bincount(combined, minlength=int(np.prod(shape))).reshape(shape).astype(np.int64)
+        logging.info("Count cube has been built: %s", " x ".join(map(str, shape)))
+        return cls(list(dimensions), categories, dtypes, counts, source)
+
+    @classmethod
+    def for_file(cls, cube_path: str, loader: Loader, dimensions: List[str] = DIMENSIONS) -> "CountCube":
+        """
+        Loads the cube of the file under the path of the loader, rebuilding
+        and saving it if the file or its ingestion profile has changed
+
+        Args:
+            cube_path: Path of the saved cube
+            loader: Loader of the counted file
+            dimensions: Columns forming the axes of the cube
+
+        Returns:
+            CountCube: Counts of the file
+        """
+        stat = os.stat(loader.save_path)
+        profile = loader.dtypes
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                  "dtypes": {dimension: str(profile[dimension]) for dimension in dimensions if dimension in profile}}
+        try:
+            cube = cls.load(cube_path)
+            if cube.source == source and cube.dimensions == list(dimensions):
+                logging.info("Count cube loaded from: %s", cube_path)
+                return cube
+        except (FileNotFoundError, KeyError, ValueError):
+            pass
+        cube = cls.build(loader.ingest_data(usecols=list(dimensions)), dimensions, source)
+        cube.save(cube_path)
+        return cube
+
+    def save(self, path: str) -> None:
+        """
+        Atomically saves the counts with their category dictionaries
+
+        Args:
+            path: Path of the saved cube
+        """
+        metadata = {"dimensions": self.dimensions, "categories": self.categories,
+                    "dtypes": self.dtypes, "source": self.source}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", 'wb') as file:
+            np.savez(file, counts=self.counts, metadata=np.array(json.dumps(metadata, default=str)))
+        os.replace(path + ".tmp", path)
+        logging.info("Count cube saved into: %s", path)
+
+    @classmethod
+    def load(cls, path: str) -> "CountCube":
+        """
+        Args:
+            path: Path of the saved cube
+
+        Returns:
+            CountCube: Saved counts with their category dictionaries
+        """
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(data["metadata"].item())
+            counts = data["counts"]
+        return cls(metadata["dimensions"], metadata["categories"], metadata["dtypes"], counts, metadata["source"])
+
+    def supports(self, features: List[str], classes: Dict[str, list], legacy_dropna: bool) -> bool:
+        """
+        Args:
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+            legacy_dropna: Cleaning semantics of Transform
+
+        Returns:
+            bool: True if the counts can be answered from the cube: cleaning checks
+                only the selected features and all columns involved are dimensions
+        """
+        return (not legacy_dropna and len(set(features)) == len(features)
+                and all(column in self.dimensions for column in [*features, *classes]))
+
+    def query(self, features: List[str], classes: Dict[str, list]) -> pd.DataFrame:
+        """
+        Selects the codes of the classes on their axes, drops the missing-value
+        slot on the axes of features and classes, and sums out the other axes
+
+        Args:
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+
+        Returns:
+            pd.DataFrame: Sorted counts equal to `clean_data`, `group_and_count`
+                and `sort_data` of Transform on the counted data
+        """
+        selections = []
+        for dimension, values in zip(self.dimensions, self.categories):
+            if dimension in classes:
+                lookup = {value: code for code, value in enumerate(values)}
+                selected = [lookup[value] for value in classes[dimension] if value in lookup]
+            elif dimension in features:
+                selected = range(len(values))
+            else:
+                selected = range(len(values) + 1)
+            selections.append(np.asarray(selected, dtype=np.intp))
+
+        counts = self.counts[np.ix_(*selections)]
+        kept = [axis for axis, dimension in enumerate(self.dimensions) if dimension in features]
+        counts = counts.sum(axis=tuple(axis for axis in range(counts.ndim) if axis not in kept))
+        axes = [self.dimensions.index(feature) for feature in features]
+        counts = np.transpose(counts, [sorted(axes).index(axis) for axis in axes])
+
+        observed = np.nonzero(counts)
+        result = {}
+        for feature, axis, codes in zip(features, axes, observed):
+            if self.dtypes[axis] == 'category':
+                result[feature] = pd.Categorical.from_codes(selections[axis][codes], categories=self.categories[axis])
+            else:
+                values = pd.array(self.categories[axis], dtype=self.dtypes[axis])
+                result[feature] = values.take(selections[axis][codes])
+        result['count'] = counts[observed].astype('int64')
+        return Transform(pd.DataFrame(result), features, classes).sort_data()
@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from attrs import define
+from requests.adapters import HTTPAdapter
+
+from lessons.extract.load_data import Loader
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@define
+class DownloadStatus:
+    """
+    Class storing the outcome of a single download
+    """
+    url: str
+    path: str
+    ok: bool
+    updated: bool = False
+    attempts: int = 0
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+class MultiLoader:
+    """
+    Class to download many files concurrently over pooled connections
+    """
+
+    def __init__(self,
+                 sources: List[Tuple[str, str]],
+                 workers: int = 8,
+                 per_host: int = 4,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 timeout: Optional[float] = 60.0,
+                 chunk_size: int = 1024 * 1024
+                 ) -> None:
+        """
+        Args:
+            sources: Pairs of a URL and the path to save its file
+            workers: Number of downloads running at once
+            per_host: Number of downloads running at once against a single host
+            retries: Number of retries of a failed download
+            backoff: Seconds before the first retry, doubled before every next one
+            max_backoff: Upper limit of the seconds between retries
+            timeout: Seconds to wait for the connection and for every read, no limit if None
+            chunk_size: Number of bytes written to disk at once
+        """
+        self.sources = sources
+        self.workers = workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._limits_lock = threading.Lock()
+
+    def fetch_all(self) -> List[DownloadStatus]:
+        """
+        Fetches every source with a bounded thread pool sharing one Session,
+        so connections to a host are kept alive and reused. Sources are
+        submitted round-robin across hosts, so workers rarely wait on the
+        limit of a single host
+
+        Returns:
+            List[DownloadStatus]: Outcome of every source, in the order of `sources`
+        """
+        by_host = defaultdict(list)
+        for index, (url, _) in enumerate(self.sources):
+            by_host[urlsplit(url).netloc].append(index)
+        order = [index for index in chain.from_iterable(zip_longest(*by_host.values())) if index is not None]
+
+        statuses = [None] * len(self.sources)
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_connections=max(1, len(by_host)), pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {index: executor.submit(self.fetch, *self.sources[index], session) for index in order}
+                for index, future in futures.items():
+                    statuses[index] = future.result()
+
+        failed = [status for status in statuses if not status.ok]
+        logging.info("Fetched %d of %d files, %d updated", len(statuses) - len(failed), len(statuses),
+                     sum(status.updated for status in statuses))
+        for status in failed:
+            logging.error("Failed to fetch %s after %d attempts: %s", status.url, status.attempts, status.error)
+        return statuses
+
+    def fetch(self, url: str, path: str, session: requests.Session) -> DownloadStatus:
+        """
+        Fetches a single file, retrying connection errors, interrupted
+        transfers and transient HTTP statuses with exponential backoff.
+        An interrupted transfer is resumed from the bytes already on disk
+
+        Args:
+            url: URL of the file
+            path: Path to save the file
+            session: Session shared by all downloads
+
+        Returns:
+            DownloadStatus: Outcome of the download
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        loader = Loader(url, path, self.chunk_size, session=session)
+        status = DownloadStatus(url, path, ok=False)
+        start = time.perf_counter()
+        while True:
+            status.attempts += 1
+            try:
+                with self._limit(urlsplit(url).netloc):
+                    status.updated = self._attempt(loader, status)
+                status.ok, status.error = True, None
+                break
+            except requests.exceptions.RequestException as e:
+                status.error = str(e)
+                response = getattr(e, "response", None)
+                retryable = response is None or response.status_code in RETRY_STATUSES
+                if not retryable or status.attempts > self.retries:
+                    break
+                delay = min(self.max_backoff, self.backoff * 2 ** (status.attempts - 1))
+                logging.info("Retrying %s in %.2f s: %s", url, delay, e)
+                time.sleep(delay)
+            except OSError as e:
+                status.error = str(e)
+                break
+        status.seconds = time.perf_counter() - start
+        return status
+
+    def _limit(self, host: str) -> threading.BoundedSemaphore:
+        """
+        Args:
+            host: Host of a URL
+
+        Returns:
+            threading.BoundedSemaphore: Limit of the downloads running at once against the host,
+                created under a lock, so threads reaching a new host at once share one limit
+        """
+        with self._limits_lock:
+            if host not in self._limits:
+                self._limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._limits[host]
+
+    def _attempt(self, loader: Loader, status: DownloadStatus) -> bool:
+        """
+        Args:
+            loader: Loader of the file, downloading through the shared Session
+            status: Outcome of the download, updated with the HTTP status
+
+        Returns:
+            bool: True if the file has been rewritten, False if it is up to date
+        """
+        response = loader.session.get(loader.url, stream=True, headers=loader.conditional_headers(),
+                                      timeout=self.timeout)
+        status.status_code = response.status_code
+        if response.status_code == 304:
+            response.close()
+            return False
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return loader.save_stream(response) > 0
@@ -0,0 +1,244 @@
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from lessons.transform.transform_data import Transform
+
+BLOCK_SIZE = 64 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def last_row_end(file: io.BufferedReader, eof_ends_row: bool = False) -> int:
+    """
+    Args:
+        file: The CSV file
+        eof_ends_row: If True, the end of the file also ends a last row without 
+            a trailing newline, e.g. when the file is known to be complete
+
+    Returns:
+        int: Offset right after the last complete row, so a row that is still
+            being appended is left for a later run
+    """
+    position = os.fstat(file.fileno()).st_size
+    if eof_ends_row:
+        return position
+    while position > 0:
+        start = max(0, position - BLOCK_SIZE)
+        file.seek(start)
+        block = file.read(position - start)
+        newline = block.rfind(b"\n")
+        if newline != -1:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+def prefix_digest(file: io.BufferedReader, end: int, digest: Optional[Any] = None, start: int = 0) -> Any:
+    """
+    Hashes the processed part of the file as a whole, so a rewrite anywhere in
+    it is detected. A digest of the bytes before `start` is extended in place,
+    e.g. by the appended bytes once the part processed before has been checked
+
+    Args:
+        file: The CSV file
+        end: End of the processed part of the file
+        digest: SHA-256 of the bytes before `start`, a new one if None
+        start: Offset of the first byte added to the digest
+
+    Returns:
+        Any: SHA-256 of the bytes before `end`
+    """
+    digest = hashlib.sha256() if digest is None else digest
+    file.seek(start)
+    position = start
+    while position < end:
+        block = file.read(min(HASH_BLOCK_SIZE, end - position))
+        if not block:
+            break
+        digest.update(block)
+        position += len(block)
+    return digest
+
+
+def continues_row(file: io.BufferedReader, offset: int) -> bool:
+    """
+    Args:
+        file: The CSV file
+        offset: End of the processed part of the file
+
+    Returns:
+        bool: True if bytes after the offset continue a last row processed 
+            without a trailing newline, so that row has to be processed again
+    """
+    if offset == 0 or os.fstat(file.fileno()).st_size <= offset:
+        return False
+    file.seek(offset - 1)
+    previous, following = file.read(2)
+    return previous != ord("\n") and following not in b"\r\n"
+
+
+class _FileSlice(io.RawIOBase):
+    """
+    Read-only view of an open binary file that ends at a fixed offset
+    """
+
+    def __init__(self, file: io.BufferedReader, end: int) -> None:
+        """
+        Args:
+            file: File positioned at the start of the slice
+            end: Offset at which reading stops
+        """
+        self._file = file
+        self._end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        remaining = max(0, self._end - self._file.tell())
+        return self._file.readinto(memoryview(buffer)[:remaining])
+
+
+class IncrementalAggregator:
+    """
+    Class to keep the counts of a growing CSV file up to date by parsing only its appended rows
+    """
+
+    def __init__(self,
+                 data_path: str,
+                 state_path: str,
+                 features: List[str],
+                 classes: Dict[str, List[str]],
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby",
+                 chunksize: int = 100_000
+                 ) -> None:
+        """
+        Args:
+            data_path: Path of the CSV file
+            state_path: Path of the stored counts and high-water mark
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+            legacy_dropna: Cleaning semantics passed to Transform
+            engine: Counting engine passed to Transform
+            chunksize: Number of rows parsed at once
+        """
+        self.data_path = data_path
+        self.state_path = state_path
+        self.features = features
+        self.classes = classes
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+        self.chunksize = chunksize
+
+    def aggregate(self) -> pd.DataFrame:
+        """
+        Counts the rows appended since the last run and adds them to the stored
+        counts. Falls back to counting the whole file if it has been rewritten
+        rather than appended, which is told by hashing the whole part counted 
+        before, or if the features or classes changed. A last row
+        without a trailing newline is counted by a full count and once the file
+        has not changed since the previous run, otherwise it is left for a later
+        run as it may still be being appended
+
+        Returns:
+            pd.DataFrame: Sorted counts of the whole file
+        """
+        with open(self.data_path, 'rb') as file:
+            header = file.readline()
+            stat = os.fstat(file.fileno())
+            state = self._read_state()
+            digest = None if state is None else self._appended_digest(file, state)
+
+            if digest is not None:
+                offset = state["offset"]
+                counts = pd.DataFrame(state["counts"])
+                end = last_row_end(file, state.get("stat") == [stat.st_size, stat.st_mtime_ns])
+                logging.info("Counting %d appended bytes of: %s", end - offset, self.data_path)
+            else:
+                offset = len(header)
+                counts = None
+                end = last_row_end(file, eof_ends_row=True)
+                logging.info("Counting the whole file: %s", self.data_path)
+
+            transform = Transform(None, self.features, self.classes, self.legacy_dropna, self.engine)
+            if end > offset:
+                file.seek(offset)
+                reader = io.BufferedReader(_FileSlice(file, end))
+                columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+                chunks = pd.read_csv(reader, names=columns, header=None, chunksize=self.chunksize)
+                new_counts = transform.aggregate_chunks(chunks)
+                counts = new_counts if counts is None else transform.merge_counts([counts, new_counts])
+            elif counts is None:
+                counts = transform.aggregate_chunks([])
+
+            digest = prefix_digest(file, end) if digest is None else prefix_digest(file, end, digest, offset)
+            self._write_state(end, counts, [stat.st_size, stat.st_mtime_ns], digest.hexdigest())
+
+        transform.df = counts
+        return transform.sort_data()
+
+    def _read_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+            Optional[Dict[str, Any]]: Stored state, None if it is missing or
+                was computed with other features, classes or cleaning semantics
+        """
+        try:
+            with open(self.state_path, 'r') as file:
+                state = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if state.get("config") != self._config():
+            return None
+        return state
+
+    def _write_state(self, offset: int, counts: pd.DataFrame, stat: List[int], sha256: str) -> None:
+        """
+        Atomically stores the counts together with the processed offset,
+        the hash of the processed part of the file and its size and 
+        modification time
+
+        Args:
+            offset: Offset up to which the file has been counted
+            counts: Counts of the file up to the offset
+            stat: Size and modification time of the file in nanoseconds
+            sha256: SHA-256 of the file up to the offset
+        """
+        state = {"config": self._config(),
+                 "offset": offset,
+                 "stat": stat,
+                 "sha256": sha256,
+                 "counts": {column: counts[column].tolist() for column in counts.columns}}
+        with open(self.state_path + ".tmp", 'w') as state_file:
+            json.dump(state, state_file)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def _appended_digest(self, file: io.BufferedReader, state: Dict[str, Any]) -> Optional[Any]:
+        """
+        Args:
+            file: The CSV file
+            state: Stored state
+
+        Returns:
+            Optional[Any]: SHA-256 of the part of the file counted before if it is 
+                unchanged and is not continued by the appended bytes, None otherwise
+        """
+        size = os.fstat(file.fileno()).st_size
+        offset = state["offset"]
+        if size < offset or continues_row(file, offset):
+            return None
+        digest = prefix_digest(file, offset)
+        return digest if digest.hexdigest() == state.get("sha256") else None
+
+    def _config(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Parameters the stored counts depend on
+        """
+        return {"features": self.features, "classes": self.classes, "legacy_dropna": self.legacy_dropna}
@@ -0,0 +1,191 @@
+import functools
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, TextIO
+
+from attrs import asdict, define
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+@define
+class StageRecord:
+    """
+    Class storing measurements of a single pipeline stage
+    """
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    rss_peak_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+
+
+def _max_rss_mb() -> Optional[float]:
+    """
+    Returns:
+        Optional[float]: Peak resident memory of the process in MiB, None where it is not available
+    """
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _rows(value: Any) -> Optional[int]:
+    """
+    Returns:
+        Optional[int]: Number of rows if the value is a DataFrame. A DataFrame
+            only exists once pandas is imported, so the profiler never imports it
+    """
+    pd = sys.modules.get("pandas")
+    return len(value) if pd is not None and isinstance(value, pd.DataFrame) else None
+
+
+class StageProfiler:
+    """
+    Class to measure wall time, CPU time, rows and memory of pipeline stages
+    """
+
+    def __init__(self, output: str = "table", trace_memory: bool = False, stream: Optional[TextIO] = None) -> None:
+        """
+        Args:
+            output: "json" to write one JSON line per stage, "table" to log a summary table in `report`
+            trace_memory: If True, peak Python allocations of each stage are traced with tracemalloc
+            stream: Stream for JSON lines, standard error if None
+        """
+        self.output = output
+        self.trace_memory = trace_memory
+        self.stream = stream
+        self.records: List[StageRecord] = []
+        self._traced_peaks: List[int] = []
+
+    @classmethod
+    def from_config(cls, output: Optional[str], trace_memory: bool = False) -> Optional["StageProfiler"]:
+        """
+        Args:
+            output: Output format, profiling is off if empty
+            trace_memory: If True, peak Python allocations are traced
+
+        Returns:
+            Optional[StageProfiler]: Profiler, None if profiling is off
+        """
+        if not output:
+            return None
+        return cls(output, trace_memory)
+
+    def instrument(self, obj: Any, methods: List[str]) -> Any:
+        """
+        Wraps the given methods of an object, so every call is recorded as a stage
+
+        Args:
+            obj: Loader, Transform, BarPlot or any other pipeline object
+            methods: Names of the methods to measure, missing ones are skipped
+
+        Returns:
+            Any: The same object
+        """
+        for name in methods:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self._wrap(obj, method, f"{type(obj).__name__}.{name}"))
+        return obj
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """
+        Measures the enclosed block as one stage. Stages can be nested: the
+        traced peak reached inside a nested stage is carried over to the
+        enclosing stages, as tracemalloc keeps a single peak that every stage resets
+
+        Args:
+            name: Name of the stage
+
+        Yields:
+            StageRecord: Record of the stage, rows can be filled in by the caller
+        """
+        record = StageRecord(name)
+        rss_before = _max_rss_mb()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if self._traced_peaks:
+                self._traced_peaks[-1] = max(self._traced_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+            self._traced_peaks.append(traced_before)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall_start
+            record.cpu_seconds = time.process_time() - cpu_start
+            if self.trace_memory:
+                traced_peak = max(self._traced_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._traced_peaks:
+                    self._traced_peaks[-1] = max(self._traced_peaks[-1], traced_peak)
+                record.traced_peak_mb = (traced_peak - traced_before) / 2**20
+            record.rss_peak_mb = _max_rss_mb()
+            if rss_before is not None:
+                record.rss_growth_mb = record.rss_peak_mb - rss_before
+            self.records.append(record)
+            if self.output == "json":
+                print(json.dumps(asdict(record)), file=self.stream or sys.stderr)
+
+    def report(self) -> str:
+        """
+        Logs a summary table of all recorded stages
+
+        Returns:
+            str: The summary table
+        """
+        lines = [f"{'stage':<32}{'wall [s]':>10}{'cpu [s]':>10}{'rows in':>10}{'rows out':>10}"
+                 f"{'rss peak [MiB]':>16}{'traced [MiB]':>14}"]
+        for record in self.records:
+            lines.append(f"{record.stage:<32}{record.wall_seconds:>10.3f}{record.cpu_seconds:>10.3f}"
+                         f"{_format(record.rows_in):>10}{_format(record.rows_out):>10}"
+                         f"{_format(record.rss_peak_mb):>16}{_format(record.traced_peak_mb):>14}")
+        table = "\n".join(lines)
+        if self.output == "table":
+            logging.info(table)
+        return table
+
+    def _wrap(self, obj: Any, method: Any, name: str) -> Any:
+        """
+        Args:
+            obj: Object owning the method
+            method: Bound method to measure
+            name: Name of the stage
+
+        Returns:
+            Any: Function recording every call of the method
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            rows_in = next((_rows(arg) for arg in args if _rows(arg) is not None), _rows(getattr(obj, "df", None)))
+            with self.stage(name) as record:
+                record.rows_in = rows_in
+                result = method(*args, **kwargs)
+                record.rows_out = _rows(result)
+            return result
+        return wrapper
+
+
+def _format(value: Optional[float]) -> str:
+    """
+    Returns:
+        str: Value formatted for the summary table, "-" if missing
+    """
+    if value is None:
+        return "-"
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
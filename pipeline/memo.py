@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+CACHE_VERSION = 1
+
+
+class ResultCache:
+    """
+    Content-addressed cache of pipeline results: count tables keyed on the
+    hash of the input files and the transform parameters, and rendered images
+    keyed on the count table and the plot parameters. Only the standard
+    library is used, so a fully cached run never imports pandas or matplotlib
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Args:
+            cache_dir: Directory of the cached results
+            max_bytes: Size above which the least recently used results are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._inputs_path = os.path.join(cache_dir, "inputs.json")
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """
+        Args:
+            parts: JSON-serializable parts of the key, e.g. input hashes and parameters
+
+        Returns:
+            str: SHA-256 of the serialized parts
+        """
+        payload = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def input_hash(self, paths: List[str]) -> str:
+        """
+        Hashes the content of input files. The SHA-256 of every file is stored
+        with its size and modification time and only recomputed once they change
+
+        Args:
+            paths: Paths of the input files
+
+        Returns:
+            str: Hash of the content of all files
+        """
+        inputs = self._read_inputs()
+        hashes, changed = [], False
+        for path in paths:
+            stat = os.stat(path)
+            record = inputs.get(os.path.abspath(path), {})
+            if record.get("size") != stat.st_size or record.get("mtime_ns") != stat.st_mtime_ns:
+                digest = hashlib.sha256()
+                with open(path, 'rb') as file:
+                    for block in iter(lambda: file.read(1024 * 1024), b""):
+                        digest.update(block)
+                record.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=digest.hexdigest())
+                inputs[os.path.abspath(path)] = record
+                changed = True
+            hashes.append(record["sha256"])
+        if changed:
+            self._write_inputs(inputs)
+        return self.key(hashes)
+
+    def checked_within(self, path: str, max_age: float) -> bool:
+        """
+        Args:
+            path: Path of a downloaded file
+            max_age: Number of seconds a check of the remote copy stays valid
+
+        Returns:
+            bool: True if the file exists and its remote copy was checked less than `max_age` seconds ago
+        """
+        checked_at = self._read_inputs().get(os.path.abspath(path), {}).get("checked_at", 0)
+        return os.path.exists(path) and time.time() - checked_at < max_age
+
+    def mark_checked(self, path: str) -> None:
+        """
+        Records that the remote copy of a downloaded file has just been checked
+
+        Args:
+            path: Path of the downloaded file
+        """
+        inputs = self._read_inputs()
+        inputs.setdefault(os.path.abspath(path), {})["checked_at"] = time.time()
+        self._write_inputs(inputs)
+
+    def get_counts(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            key: Key of the count table
+
+        Returns:
+            Optional[Dict[str, Any]]: Columns of the count table and its content hash, None if not cached
+        """
+        path = self._entry("counts", key, ".json")
+        try:
+            with open(path, 'r') as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+        return entry
+
+    def put_counts(self, key: str, columns: Dict[str, list]) -> str:
+        """
+        Args:
+            key: Key of the count table
+            columns: Values of every column of the count table
+
+        Returns:
+            str: Content hash of the count table
+        """
+        table_hash = self.key(columns)
+        self._write(self._entry("counts", key, ".json"), json.dumps({"columns": columns, "hash": table_hash}).encode())
+        return table_hash
+
+    def get_image(self, key: str, target_path: str) -> bool:
+        """
+        Copies a cached image to the target path
+
+        Args:
+            key: Key of the image
+            target_path: Path to save the image
+
+        Returns:
+            bool: True if the image was cached
+        """
+        path = self._entry("images", key, ".png")
+        if not os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+        shutil.copyfile(path, target_path)
+        os.utime(path)
+        return True
+
+    def put_image(self, key: str, source_path: str) -> None:
+        """
+        Args:
+            key: Key of the image
+            source_path: Path of the rendered image
+        """
+        with open(source_path, 'rb') as file:
+            self._write(self._entry("images", key, ".png"), file.read())
+
+    def _entry(self, kind: str, key: str, suffix: str) -> str:
+        """
+        Returns:
+            str: Path of a cached result
+        """
+        return os.path.join(self.cache_dir, kind, key + suffix)
+
+    def _write(self, path: str, content: bytes) -> None:
+        """
+        Atomically stores a result and evicts the least recently used
+        results while the cache is larger than its limit
+
+        Args:
+            path: Path of the result
+            content: Content of the result
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", 'wb') as file:
+            file.write(content)
+        os.replace(path + ".tmp", path)
+
+        entries = []
+        for kind in ("counts", "images"):
+            directory = os.path.join(self.cache_dir, kind)
+            if os.path.isdir(directory):
+                entries.extend(os.path.join(directory, name) for name in os.listdir(directory))
+        stats = {entry: os.stat(entry) for entry in entries}
+        total = sum(stat.st_size for stat in stats.values())
+        for entry in sorted(entries, key=lambda entry: stats[entry].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            if entry != path:
+                os.remove(entry)
+                total -= stats[entry].st_size
+                logging.info("Evicted cached result: %s", entry)
+
+    def _read_inputs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            Dict[str, Dict[str, Any]]: Stored size, modification time, hash and check time of every input file
+        """
+        try:
+            with open(self._inputs_path, 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_inputs(self, inputs: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Args:
+            inputs: Stored size, modification time, hash and check time of every input file
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._inputs_path + ".tmp", 'w') as file:
+            json.dump(inputs, file)
+        os.replace(self._inputs_path + ".tmp", self._inputs_path)
@@ -0,0 +1,88 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+
+
+def count_shard(path: str,
+                features: List[str],
+                classes: Dict[str, List[str]],
+                legacy_dropna: bool = False,
+                engine: str = "groupby"
+                ) -> pd.DataFrame:
+    """
+    Ingests, cleans, groups and counts a single shard. A shard that cannot be
+    cleaned or counted, e.g. without a feature column, raises a ValueError
+    instead of being silently left out of the merge
+
+    Args:
+        path: Path of the CSV shard
+        features: Features to select
+        classes: A dictionary storing feature and their classes to select
+        legacy_dropna: Cleaning semantics passed to Transform
+        engine: Counting engine passed to Transform
+
+    Returns:
+        pd.DataFrame: Counts of the shard
+    """
+    df = Loader(None, path).ingest_data()
+    transform = Transform(df, features, classes, legacy_dropna, engine)
+    if transform.clean_data() is None or transform.group_and_count() is None:
+        raise ValueError(f"Shard cannot be counted: {path}")
+    return transform.df
+
+
+class ParallelAggregator:
+    """
+    Class to aggregate many CSV shards across processes
+    """
+
+    def __init__(self,
+                 paths: List[str],
+                 features: List[str],
+                 classes: Dict[str, List[str]],
+                 workers: Optional[int] = None,
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby"
+                 ) -> None:
+        """
+        Args:
+            paths: Paths of the CSV shards
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+            workers: Number of worker processes, one per CPU if None
+            legacy_dropna: Cleaning semantics passed to Transform
+            engine: Counting engine passed to Transform
+        """
+        self.paths = paths
+        self.features = features
+        self.classes = classes
+        self.workers = workers
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+
+    def aggregate(self) -> pd.DataFrame:
+        """
+        Counts every shard in a process pool, so only the small count tables 
+        travel between processes, then merges them and sorts the result once
+
+        Returns:
+            pd.DataFrame: Sorted counts of all shards, equal to running the 
+                pipeline on the concatenated shards
+        """
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            counts = list(executor.map(count_shard,
+                                       self.paths,
+                                       [self.features] * len(self.paths),
+                                       [self.classes] * len(self.paths),
+                                       [self.legacy_dropna] * len(self.paths),
+                                       [self.engine] * len(self.paths)))
+        logging.info("Counted %d shards", len(counts))
+
+        transform = Transform(None, self.features, self.classes, self.legacy_dropna, self.engine)
+        transform.merge_counts(counts)
+        return transform.sort_data()
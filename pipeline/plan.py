@@ -0,0 +1,357 @@
+import copy
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from attrs import define, field
+
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+
+NUMERIC_SAMPLE_ROWS = 1000
+
+@define
+class Scan:
+    """
+    Reads the CSV file, optionally only some columns and with given data types.
+    Columns in `numeric` keep the type of the ingestion profile or the inferred one
+    """
+    usecols: Optional[List[str]] = None
+    dtype: Dict[str, Any] = field(factory=dict)
+    numeric: List[str] = field(factory=list)
+
+
+@define
+class Filter:
+    """
+    Keeps rows without missing values in `notna` (every column if None)
+    and with values from the specified classes in `isin`
+    """
+    notna: Optional[List[str]] = field(factory=list)
+    isin: Dict[str, List[str]] = field(factory=dict)
+
+
+@define
+class Project:
+    """
+    Keeps only the given columns
+    """
+    columns: List[str]
+
+
+@define
+class Aggregate:
+    """
+    Counts each unique combination of the columns
+    """
+    engine: str = "groupby"
+
+
+@define
+class Sort:
+    """
+    Sorts by the features, in class order for features with specified classes
+    """
+    features: List[str]
+    classes: Dict[str, List[str]]
+
+
+def optimize(operations: List[Any]) -> List[Any]:
+    """
+    Rewrites a plan into an equivalent one that reads and copies less data:
+    consecutive filters are merged into one mask, class filters become
+    categorical types of the read, only the referenced columns are read and
+    the sort is dropped when the counts already come out in category order
+
+    Args:
+        operations: Plan starting with a Scan
+
+    Returns:
+        List[Any]: Optimized plan
+    """
+    operations = _merge_filters(copy.deepcopy(operations))
+    operations = _push_class_filters(operations)
+    operations = _push_projection(operations)
+    return _eliminate_sort(operations)
+
+
+def _merge_filters(operations: List[Any]) -> List[Any]:
+    """
+    Combines consecutive filters, so the data is masked and copied once
+    """
+    merged = []
+    for operation in operations:
+        if isinstance(operation, Filter) and merged and isinstance(merged[-1], Filter):
+            previous = merged[-1]
+            if previous.notna is None or operation.notna is None:
+                notna = None
+            else:
+                notna = previous.notna + [column for column in operation.notna if column not in previous.notna]
+            isin = dict(previous.isin)
+            for column, class_list in operation.isin.items():
+                isin[column] = [value for value in isin[column] if value in class_list] if column in isin else class_list
+            merged[-1] = Filter(notna, isin)
+        else:
+            merged.append(operation)
+    return merged
+
+
+def _push_class_filters(operations: List[Any]) -> List[Any]:
+    """
+    Moves class filters right after the read into the read itself: the column is
+    parsed as an ordered categorical of its classes, so values of other classes
+    come out missing and the class filter becomes part of the missing-value check
+    """
+    scan = operations[0]
+    if len(operations) > 1 and isinstance(operations[1], Filter):
+        selection = operations[1]
+        for column, class_list in selection.isin.items():
+            scan.dtype[column] = pd.CategoricalDtype(class_list, ordered=True)
+            if selection.notna is not None and column not in selection.notna:
+                selection.notna.append(column)
+        selection.isin = {}
+    return operations
+
+
+def _push_projection(operations: List[Any]) -> List[Any]:
+    """
+    Reads only the columns referenced by the plan, and parses text grouping
+    keys without specified classes as categoricals, whose codes are counted
+    directly. Numeric keys keep their type, as categories of a read are strings
+    """
+    scan = operations[0]
+    if any(isinstance(operation, Filter) and operation.notna is None for operation in operations):
+        return operations
+
+    columns = []
+    for operation in operations[1:]:
+        if isinstance(operation, Filter):
+            referenced = operation.notna + list(operation.isin)
+        elif isinstance(operation, Project):
+            referenced = operation.columns
+        else:
+            continue
+        columns.extend(column for column in referenced if column not in columns)
+    if not columns:
+        return operations
+    scan.usecols = columns
+
+    if any(isinstance(operation, Aggregate) for operation in operations):
+        for column in _projected_columns(operations):
+            if column not in scan.numeric:
+                scan.dtype.setdefault(column, 'category')
+    return operations
+
+
+def _eliminate_sort(operations: List[Any]) -> List[Any]:
+    """
+    Drops a sort right after counting when every feature is read as a
+    categorical, because the counts then come out in category order, which
+    is class order for features with specified classes and sorted order otherwise
+    """
+    scan = operations[0]
+    result = []
+    for operation in operations:
+        if isinstance(operation, Sort) and result and isinstance(result[-1], Aggregate):
+            if all(_in_sort_order(scan.dtype.get(feature), operation.classes.get(feature))
+                   for feature in operation.features):
+                continue
+        result.append(operation)
+    return result
+
+
+def _in_sort_order(dtype: Any, class_list: Optional[List[str]]) -> bool:
+    """
+    Returns:
+        bool: True if codes of the data type follow the order of `sort_data`
+    """
+    if class_list is None:
+        return dtype == 'category'
+    return isinstance(dtype, pd.CategoricalDtype) and list(dtype.categories) == list(class_list)
+
+
+def _projected_columns(operations: List[Any]) -> List[str]:
+    """
+    Returns:
+        List[str]: Columns kept by the last projection of the plan, empty if there is none
+    """
+    projections = [operation for operation in operations if isinstance(operation, Project)]
+    return projections[-1].columns if projections else []
+
+
+class LazyTransform:
+    """
+    Class recording transform operations as a plan, which is optimized and
+    executed only on `collect`, on either the eager or the streaming backend
+    """
+
+    def __init__(self,
+                 loader: Loader,
+                 features: List[str],
+                 classes: Dict[str, List[str]],
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby"
+                 ) -> None:
+        """
+        Args:
+            loader: Loader of the saved CSV file
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+            legacy_dropna: Cleaning semantics of Transform
+            engine: Counting engine of Transform
+        """
+        self.loader = loader
+        self.features = features
+        self.classes = classes
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+        self.operations: List[Any] = [Scan()]
+
+    def clean_data(self) -> "LazyTransform":
+        """
+        Records the cleaning of `Transform.clean_data`
+        """
+        self.operations += [Filter(None if self.legacy_dropna else list(self.features)),
+                            Filter(isin=dict(self.classes)),
+                            Project(list(self.features))]
+        return self
+
+    def group_and_count(self) -> "LazyTransform":
+        """
+        Records the counting of `Transform.group_and_count`
+        """
+        self.operations.append(Aggregate(self.engine))
+        return self
+
+    def sort_data(self) -> "LazyTransform":
+        """
+        Records the sorting of `Transform.sort_data`
+        """
+        self.operations.append(Sort(list(self.features), dict(self.classes)))
+        return self
+
+    def explain(self) -> str:
+        """
+        Returns:
+            str: Optimized plan, one operation per line
+        """
+        return "\n".join(repr(operation) for operation in self._optimized())
+
+    def collect(self, streaming: bool = False, chunksize: int = 100_000) -> pd.DataFrame:
+        """
+        Optimizes and executes the recorded plan
+
+        Args:
+            streaming: If True, the file is read and counted chunk by chunk
+            chunksize: Number of rows in each chunk when streaming
+
+        Returns:
+            pd.DataFrame: Data after transformation, equal to calling the
+                recorded methods of Transform in the same order
+        """
+        operations = self._optimized()
+        logging.info("Executing plan:\n%s", "\n".join(repr(operation) for operation in operations))
+        scan, operations = operations[0], operations[1:]
+        if not streaming:
+            df = self.loader.ingest_data(scan.usecols, scan.dtype or None)
+            return self._execute(operations, df)
+
+        split = next((index + 1 for index, operation in enumerate(operations)
+                      if isinstance(operation, Aggregate)), len(operations))
+        chunks = self.loader.ingest_chunks(scan.usecols, chunksize, scan.dtype or None)
+        parts = [self._execute(operations[:split], chunk) for chunk in chunks]
+        if split == len(operations) and not isinstance(operations[-1], Aggregate):
+            return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=self.features)
+
+        transform = Transform(None, _projected_columns(operations) or self.features, {})
+        df = transform.merge_counts(parts) if parts else pd.DataFrame(columns=self.features + ['count'])
+        return self._execute(operations[split:], df)
+
+    def _optimized(self) -> List[Any]:
+        """
+        Returns:
+            List[Any]: Optimized plan, whose Scan knows the numeric features
+        """
+        self.operations[0].numeric = self._numeric_features()
+        return optimize(self.operations)
+
+    def _numeric_features(self) -> List[str]:
+        """
+        Returns:
+            List[str]: Features with a numeric type in the ingestion profile of the loader 
+                or, for features outside the profile, in the first rows of the file
+        """
+        profile = self.loader.dtypes
+        unprofiled = [feature for feature in self.features if feature not in profile]
+        sample = pd.read_csv(self.loader.save_path, usecols=unprofiled, nrows=NUMERIC_SAMPLE_ROWS) \
+            if unprofiled else pd.DataFrame()
+        dtypes = {feature: pd.api.types.pandas_dtype(profile[feature]) if feature in profile else sample[feature].dtype
+                  for feature in self.features}
+        return [feature for feature, dtype in dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+
+    def _execute(self, operations: List[Any], df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Executes operations on the data, applying a filter followed by a
+        projection as one step, which copies only the projected columns
+
+        Args:
+            operations: Plan without the Scan
+            df: Data read by the Scan
+
+        Returns:
+            pd.DataFrame: Data after the operations
+        """
+        index = 0
+        while index < len(operations):
+            operation = operations[index]
+            if isinstance(operation, Filter):
+                fused = index + 1 < len(operations) and isinstance(operations[index + 1], Project)
+                columns = operations[index + 1].columns if fused else df.columns.tolist()
+                df = self._filter(df, operation, columns)
+                index += fused
+            elif isinstance(operation, Project):
+                df = df[operation.columns]
+            elif isinstance(operation, Aggregate):
+                df = self._aggregate(df, operation)
+            elif isinstance(operation, Sort):
+                df = Transform(df, operation.features, operation.classes).sort_data()
+            index += 1
+        return df
+
+    @staticmethod
+    def _filter(df: pd.DataFrame, operation: Filter, columns: List[str]) -> pd.DataFrame:
+        """
+        Args:
+            df: Data to filter
+            operation: Filter to apply
+            columns: Columns to keep
+
+        Returns:
+            pd.DataFrame: Kept rows of the kept columns
+        """
+        mask = np.ones(len(df), dtype=bool)
+        for column in (df.columns if operation.notna is None else operation.notna):
+            mask &= df[column].notna().to_numpy()
+        for column, class_list in operation.isin.items():
+            mask &= df[column].isin(class_list).to_numpy(dtype=bool, na_value=False)
+        return pd.DataFrame({column: df[column].array[mask] for column in columns})
+
+    @staticmethod
+    def _aggregate(df: pd.DataFrame, operation: Aggregate) -> pd.DataFrame:
+        """
+        Counts the data and turns the categorical types introduced by the read back into
+        plain values, so only features with specified classes stay categorical as after `sort_data`
+
+        Args:
+            df: Data to count
+            operation: Aggregate to apply
+
+        Returns:
+            pd.DataFrame: Counted data
+        """
+        df = Transform(df, df.columns.tolist(), {}, engine=operation.engine).group_and_count()
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype) and not df[column].dtype.ordered:
+                df[column] = df[column].astype(object)
+        return df
@@ -0,0 +1,328 @@
+import csv
+import logging
+import mmap
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from lessons.transform.transform_data import Transform
+
+BLOCK_SIZE = 8 * 1024 * 1024
+QUOTE, COMMA, NEWLINE, CARRIAGE_RETURN = ord('"'), ord(','), ord('\n'), ord('\r')
+NA_VALUES = frozenset({'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+                       '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'n/a', 'nan', 'null'})
+TEXT_SAMPLE_ROWS = 1000
+
+
+def _read_header(data: mmap.mmap) -> Tuple[List[str], int]:
+    """
+    Args:
+        data: Memory-mapped CSV file
+
+    Returns:
+        Tuple[List[str], int]: Column names and the offset of the first row
+    """
+    end = data.find(b"\n")
+    end = len(data) if end == -1 else end + 1
+    header = next(csv.reader([data[:end].decode("utf-8-sig").rstrip("\r\n")]), [])
+    return header, end
+
+
+def _row_boundaries(data: mmap.mmap, start: int, end: int, parts: int) -> List[int]:
+    """
+    Splits a range of rows into parts which end right after a newline outside
+    quoted fields, so no row and no quoted field is cut in two
+
+    Args:
+        data: Memory-mapped CSV file
+        start: Offset of the first row of the range
+        end: End of the range
+        parts: Number of parts
+
+    Returns:
+        List[int]: Offsets of the part boundaries, from `start` to `end`
+    """
+    bytes_view = np.frombuffer(data, dtype=np.uint8)
+    boundaries = [start]
+    position, quotes = start, 0
+    for part in range(1, parts):
+        target = max(position, start + (end - start) * part // parts)
+        while True:
+            newline = data.find(b"\n", target, end)
+            if newline == -1:
+                break
+            quotes += np.count_nonzero(bytes_view[position:newline] == QUOTE)
+            position = target = newline + 1
+            if quotes % 2 == 0:
+                break
+        if newline == -1:
+            break
+        if position > boundaries[-1]:
+            boundaries.append(position)
+    boundaries.append(end)
+    return boundaries
+
+
+def _field_value(raw: bytes) -> Optional[str]:
+    """
+    Args:
+        raw: Bytes of one field as stored in the file
+
+    Returns:
+        Optional[str]: Value of the field as parsed by `pd.read_csv`, None if missing
+    """
+    if raw.startswith(b'"'):
+        raw = raw[1:-1].replace(b'""', b'"') if raw.endswith(b'"') and len(raw) > 1 else raw[1:]
+    value = raw.decode("utf-8")
+    return None if value in NA_VALUES else value
+
+
+def scan_range(path: str,
+               start: int,
+               end: int,
+               columns: List[int],
+               classes: List[Optional[List[str]]],
+               keys: int
+               ) -> Counter:
+    """
+    Counts combinations of fields in a range of rows of a CSV file. The range
+    is scanned block by block as raw bytes: separators outside quoted fields
+    are located with vectorized comparisons, the fields of the requested
+    columns are compared as fixed-width byte strings and only their distinct
+    values are decoded and checked against the classes
+
+    Args:
+        path: Path of the CSV file
+        start: Offset of the first row of the range
+        end: End of the range, right after a newline or the end of the file
+        columns: Indices of the scanned columns
+        classes: Classes to keep for every scanned column, any value if None
+        keys: Number of leading scanned columns forming the counted combination,
+            the remaining ones only filter rows
+
+    Returns:
+        Counter: Number of rows for every combination of values of the key columns
+    """
+    counts = Counter()
+    if end <= start:
+        return counts
+    scanned = True
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        blocks = _row_boundaries(data, start, end, max(1, (end - start) // BLOCK_SIZE))
+        for block_start, block_end in zip(blocks, blocks[1:]):
+            block_counts = _scan_block(np.frombuffer(data, np.uint8, block_end - block_start, block_start),
+                                       columns, classes, keys)
+            if block_counts is None:
+                scanned = False
+                break
+            counts.update(block_counts)
+    if not scanned:
+        raise ValueError(f"Quotes outside quoted fields cannot be scanned: {path}")
+    return counts
+
+
+def _scan_block(block: np.ndarray, columns: List[int], classes: List[Optional[List[str]]], keys: int) -> Counter:
+    """
+    Args:
+        block: Bytes of whole rows, starting outside a quoted field
+        columns: Indices of the scanned columns
+        classes: Classes to keep for every scanned column, any value if None
+        keys: Number of leading scanned columns forming the counted combination
+
+    Returns:
+        Counter: Number of rows for every combination of values of the key columns, 
+            None if a quote is found inside an unquoted field
+    """
+    positions = np.flatnonzero((block == COMMA) | (block == NEWLINE) | (block == QUOTE))
+    kinds = block[positions]
+    is_quote = kinds == QUOTE
+    if is_quote.any():
+        if not _quotes_enclose_fields(block, positions[is_quote]):
+            return None
+        outside = (np.cumsum(is_quote, dtype=np.uint8) & 1) == 0
+        positions, kinds = positions[outside & ~is_quote], kinds[outside & ~is_quote]
+    if block[-1] != NEWLINE:
+        positions, kinds = np.append(positions, len(block)), np.append(kinds, NEWLINE)
+
+    row_ends = np.flatnonzero(kinds == NEWLINE)
+    row_firsts = np.empty_like(row_ends)
+    row_firsts[0] = 0
+    row_firsts[1:] = row_ends[:-1] + 1
+    codes = np.full((len(columns), len(row_ends)), -1, dtype=np.int64)
+    labels = []
+
+    for position, (column, class_list) in enumerate(zip(columns, classes)):
+        present = np.flatnonzero(row_firsts + column <= row_ends)
+        separator = row_firsts[present] + column
+        field_ends = positions[separator]
+        field_starts = np.zeros_like(field_ends)
+        previous = separator > 0
+        field_starts[previous] = positions[separator[previous] - 1] + 1
+        line_end = (separator == row_ends[present]) & (field_ends > field_starts)
+        line_end[line_end] = block[field_ends[line_end] - 1] == CARRIAGE_RETURN
+        field_ends -= line_end
+        uniques, inverse = _distinct_fields(block, field_starts, field_ends - field_starts)
+
+        values, column_codes = [], np.full(len(uniques), -1, dtype=np.int64)
+        for index, raw in enumerate(uniques):
+            value = _field_value(raw)
+            if value is None or (class_list is not None and value not in class_list):
+                continue
+            if value not in values:
+                values.append(value)
+            column_codes[index] = values.index(value)
+        codes[position, present] = column_codes[inverse]
+        labels.append(values)
+
+    valid = (codes >= 0).all(axis=0)
+    codes, labels = codes[:keys], labels[:keys]
+    shape = tuple(max(1, len(values)) for values in labels)
+    combined, counts = np.unique(np.ravel_multi_index(codes[:, valid], shape), return_counts=True)
+    return Counter({tuple(values[code] for values, code in zip(labels, np.unravel_index(key, shape))): int(count)
+                    for key, count in zip(combined, counts)})
+
+
+def _quotes_enclose_fields(block: np.ndarray, quotes: np.ndarray) -> bool:
+    """
+    Args:
+        block: Bytes of whole rows, starting outside a quoted field
+        quotes: Offsets of all quotes in the block
+
+    Returns:
+        bool: True if every quote opens a field, closes it or escapes a quote inside it.
+            Quoted parts of the block are told apart by the parity of quotes, which a 
+            quote inside an unquoted field, e.g. `5" disc`, would flip for all later rows
+    """
+    opening, closing = quotes[0::2], quotes[1::2]
+    before = block[np.maximum(opening - 1, 0)]
+    opens_field = (opening == 0) | (before == COMMA) | (before == NEWLINE) | (before == QUOTE)
+    after = block[np.minimum(closing + 1, len(block) - 1)]
+    closes_field = ((closing == len(block) - 1) | (after == COMMA) | (after == NEWLINE)
+                    | (after == CARRIAGE_RETURN) | (after == QUOTE))
+    return len(opening) == len(closing) and bool(opens_field.all()) and bool(closes_field.all())
+
+
+def _distinct_fields(block: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> Tuple[List[bytes], np.ndarray]:
+    """
+    Groups equal fields by hashing their bytes, padded with zero bytes to a
+    common width of whole 8-byte words, and checks the groups for collisions
+
+    Args:
+        block: Bytes of whole rows
+        starts: Offsets of the fields
+        lengths: Lengths of the fields in bytes
+
+    Returns:
+        Tuple[List[bytes], np.ndarray]: Distinct fields and the index of every field among them
+    """
+    width = -(-int(lengths.max(initial=0)) // 8) * 8
+    if width == 0:
+        return [b""], np.zeros(len(starts), dtype=np.intp)
+    offsets = np.arange(width)
+    fixed = block.take(starts[:, None] + offsets, mode='clip')
+    fixed *= offsets < lengths[:, None]
+
+    words = fixed.view(np.uint64)
+    hashes = words[:, 0].copy()
+    for column in range(1, words.shape[1]):
+        hashes *= np.uint64(0x9E3779B97F4A7C15)
+        hashes ^= words[:, column]
+    inverse, _ = pd.factorize(hashes)
+    first = np.zeros(inverse.max(initial=-1) + 1, dtype=np.intp)
+    first[inverse[::-1]] = np.arange(len(inverse))[::-1]
+    if not (words == words[first[inverse]]).all():
+        _, first, inverse = np.unique(fixed.view(np.dtype((np.void, width))).ravel(),
+                                      return_index=True, return_inverse=True)
+    distinct = [block[start:start + length].tobytes() for start, length in zip(starts[first], lengths[first])]
+    return distinct, inverse.ravel()
+
+
+class MmapCounter:
+    """
+    Class to count combinations of text features straight from the bytes of a
+    memory-mapped CSV file, without building a Python object for every cell
+    """
+
+    def __init__(self,
+                 path: str,
+                 features: List[str],
+                 classes: Dict[str, List[str]],
+                 workers: Optional[int] = None
+                 ) -> None:
+        """
+        Args:
+            path: Path of the CSV file
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+            workers: Number of worker processes, one per CPU if None
+        """
+        self.path = path
+        self.features = features
+        self.classes = classes
+        self.workers = workers or os.cpu_count() or 1
+
+    def supports(self, legacy_dropna: bool, dtypes: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Args:
+            legacy_dropna: Cleaning semantics of Transform
+            dtypes: Ingestion profile of the loader, mapping columns to their types
+
+        Returns:
+            bool: True if the counts can be scanned: cleaning checks only the selected
+                features, every class is text and every scanned column is text in the
+                profile or, for columns outside it, in the first rows of the file, 
+                so no field has to be parsed as a number
+        """
+        if legacy_dropna or not all(isinstance(value, str)
+                                    for class_list in self.classes.values() for value in class_list):
+            return False
+        dtypes = dtypes or {}
+        names = list(dict.fromkeys([*self.features, *self.classes]))
+        unprofiled = [name for name in names if name not in dtypes]
+        try:
+            sample = pd.read_csv(self.path, usecols=unprofiled, nrows=TEXT_SAMPLE_ROWS) if unprofiled else None
+        except ValueError as e:
+            logging.error("Columns cannot be scanned: %s", e)
+            return False
+        types = [pd.api.types.pandas_dtype(dtypes[name]) if name in dtypes else sample[name].dtype for name in names]
+        return all(isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype) for dtype in types)
+
+    def count(self) -> pd.DataFrame:
+        """
+        Splits the rows at newlines outside quoted fields, scans the parts in
+        a process pool and merges their counts
+
+        Returns:
+            pd.DataFrame: Sorted counts equal to `clean_data`, `group_and_count`
+                and `sort_data` of Transform on the data read by `pd.read_csv`.
+                A quote inside an unquoted field raises a ValueError instead
+        """
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header, start = _read_header(data)
+            boundaries = _row_boundaries(data, start, len(data), self.workers)
+
+        names = self.features + [column for column in self.classes if column not in self.features]
+        missing = [name for name in names if name not in header]
+        if missing:
+            raise KeyError(f"Columns not found in {self.path}: {missing}")
+        columns = [header.index(name) for name in names]
+        classes = [self.classes.get(name) for name in names]
+
+        parts = len(boundaries) - 1
+        arguments = ([self.path] * parts, boundaries[:-1], boundaries[1:],
+                     [columns] * parts, [classes] * parts, [len(self.features)] * parts)
+        if parts > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(scan_range, *arguments))
+        else:
+            results = list(map(scan_range, *arguments))
+        logging.info("Scanned %d parts of: %s", parts, self.path)
+
+        counts = sum(results, Counter())
+        df = pd.DataFrame([(*key, count) for key, count in counts.items()],
+                          columns=self.features + ['count']).astype({'count': 'int64'})
+        return Transform(df, self.features, self.classes).sort_data()
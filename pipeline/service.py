@@ -0,0 +1,434 @@
+import argparse
+import collections
+import hashlib
+import http.client
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from configuration.config import BaseConfig as config
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+from lessons.visualize.visualization import BarPlot, EmptyDataFrameError
+from pipeline.incremental import continues_row, last_row_end, prefix_digest
+
+LATENCY_WINDOW = 10_000
+
+
+class ChartService:
+    """
+    Class keeping the dataset, the figure and recent charts in memory, so a
+    chart request only groups the resident data and renders it. Categorical
+    columns hold their values as integer codes, the file is watched for
+    changes and appended rows are parsed without reading the file again
+    """
+
+    def __init__(self,
+                 data_path: str,
+                 features: List[str],
+                 classes: Dict[str, list],
+                 dtypes: Optional[Dict[str, Any]] = None,
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby",
+                 cache_size: int = 128,
+                 poll_interval: float = 1.0
+                 ) -> None:
+        """
+        Args:
+            data_path: Path of the CSV file
+            features: Features of a request that does not specify them
+            classes: Classes of a request that does not specify features
+            dtypes: Ingestion profile passed to Loader
+            legacy_dropna: Cleaning semantics passed to Transform
+            engine: Counting engine passed to Transform
+            cache_size: Number of recent charts kept as PNG bytes
+            poll_interval: Seconds between checks of the file for changes
+        """
+        self.features = features
+        self.classes = classes
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+        self.cache_size = cache_size
+        self.poll_interval = poll_interval
+        self.loader = Loader(None, data_path, dtypes=dtypes)
+        self.df = None
+        self.version = 0
+        self._file = None
+        self._renders = collections.OrderedDict()
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._counters = collections.Counter()
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._bar_plot = BarPlot(fast=True)
+        self._stopped = threading.Event()
+        self._watcher = None
+
+    def reload(self) -> bool:
+        """
+        Loads the file if it changed since the last load. If the rows loaded
+        before are unchanged, as told by hashing them as a whole, only the
+        appended rows are parsed, otherwise the whole file is. A last row without a trailing newline is loaded by a full
+        load and once the file has not changed since the previous load, otherwise
+        it is left for the next load as it may still be being appended.
+        A compressed file is always loaded as a whole through the loader
+
+        Returns:
+            bool: True if the data changed
+        """
+        with open(self.loader.save_path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            stat = [stat.st_size, stat.st_mtime_ns]
+            stable = self._file is not None and self._file["stat"] == stat
+            if stable and self._file["offset"] == stat[0]:
+                return False
+            if self.loader.compressed:
+                df = self.loader.ingest_data()
+                logging.info("Loaded %d rows of: %s", len(df), self.loader.save_path)
+                self._file = {"stat": stat, "offset": stat[0]}
+                return self._replace(df)
+            header = file.readline()
+            digest = None if self._file is None else self._appended_digest(file)
+
+            if digest is not None:
+                offset = self._file["offset"]
+                end = max(offset, last_row_end(file, eof_ends_row=stable))
+                file.seek(offset)
+                tail = file.read(end - offset)
+                digest.update(tail)
+                appended = self._parse([header, tail])
+                df = None
+                if len(appended):
+                    df = self._concat([self.df, appended])
+                    logging.info("Loaded %d appended rows of: %s", len(appended), self.loader.save_path)
+            else:
+                end = last_row_end(file, eof_ends_row=True)
+                file.seek(0)
+                data = file.read(end)
+                digest = hashlib.sha256(data)
+                df = self._parse([data])
+                if len(df.columns) == 0:
+                    df = pd.read_csv(self.loader.save_path, nrows=0)
+                logging.info("Loaded %d rows of: %s", len(df), self.loader.save_path)
+
+            self._file = {"stat": stat, "offset": end, "sha256": digest.hexdigest()}
+
+        return self._replace(df)
+
+    def chart(self, features: Optional[List[str]] = None,
+              classes: Optional[Dict[str, list]] = None) -> Tuple[bytes, bool]:
+        """
+        Renders the chart of the given features and classes, or returns it from
+        the cache of recent charts if the data has not changed since
+
+        Args:
+            features: Two features to count, the default features and classes if None
+            classes: A dictionary storing feature and their classes to select
+
+        Returns:
+            Tuple[bytes, bool]: PNG image of the chart and whether it came from the cache
+        """
+        start = time.perf_counter()
+        if features is None:
+            features = self.features
+            classes = self.classes if classes is None else classes
+        classes = classes or {}
+        if len(features) != 2 or len(set(features)) != 2:
+            raise ValueError(f"Two different features are required: {features}")
+        if not isinstance(classes, dict) or not all(isinstance(class_list, list) for class_list in classes.values()):
+            raise ValueError(f"Classes have to map features to lists of classes: {classes}")
+
+        with self._lock:
+            df, version = self.df, self.version
+            key = json.dumps([version, features, classes], sort_keys=True, default=str)
+            png = self._renders.get(key)
+            if png is not None:
+                self._renders.move_to_end(key)
+        hit = png is not None
+
+        if not hit:
+            transform = Transform(df, list(features), classes, self.legacy_dropna, self.engine)
+            if transform.clean_data() is None:
+                raise ValueError(f"Unknown columns in: {[*features, *classes]}")
+            transform.group_and_count()
+            counts = transform.sort_data()
+            with self._render_lock:
+                self._bar_plot.create_plot(counts)
+                png = self._bar_plot.render_png()
+            with self._lock:
+                if version == self.version:
+                    self._renders[key] = png
+                    while len(self._renders) > self.cache_size:
+                        self._renders.popitem(last=False)
+
+        with self._lock:
+            self._counters["hits" if hit else "misses"] += 1
+            self._latencies.append(time.perf_counter() - start)
+        return png, hit
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Number of answered requests, cache hits, misses and
+                reloads, p50 and p99 latency of the recent requests in
+                milliseconds, and the number of resident rows
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            stats = {"requests": self._counters["hits"] + self._counters["misses"],
+                     **{name: self._counters[name] for name in ("hits", "misses", "errors", "reloads")},
+                     "cached": len(self._renders), "rows": 0 if self.df is None else len(self.df),
+                     "version": self.version}
+        p50, p99 = (float(value) for value in np.percentile(latencies, [50, 99]) * 1000) \
+            if len(latencies) else (None, None)
+        stats.update({"p50_ms": p50, "p99_ms": p99})
+        return stats
+
+    def record_error(self) -> None:
+        """
+        Counts a request that could not be answered
+        """
+        with self._lock:
+            self._counters["errors"] += 1
+
+    def start(self) -> None:
+        """
+        Loads the file and starts a thread reloading it when it changes
+        """
+        self.reload()
+        self._stopped.clear()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """
+        Stops watching the file
+        """
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def _watch(self) -> None:
+        """
+        Checks the file for changes every `poll_interval` seconds until stopped
+        """
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.reload()
+            except (OSError, ValueError) as e:
+                logging.error("Error while reloading the data: %s", e)
+
+    def _replace(self, df: Optional[pd.DataFrame]) -> bool:
+        """
+        Makes the data resident and clears the charts rendered from the previous data
+
+        Args:
+            df: Loaded data, None if no rows were added
+
+        Returns:
+            bool: True if the data changed
+        """
+        if df is None:
+            return False
+        with self._lock:
+            self.df = df
+            self.version += 1
+            self._renders.clear()
+            self._counters["reloads"] += 1
+        return True
+
+    def _appended_digest(self, file: Any) -> Optional[Any]:
+        """
+        Args:
+            file: The CSV file
+
+        Returns:
+            Optional[Any]: SHA-256 of the part of the file loaded before if it is
+                unchanged and the bytes after it do not continue its last row, None otherwise
+        """
+        offset = self._file["offset"]
+        if os.fstat(file.fileno()).st_size < offset or continues_row(file, offset):
+            return None
+        digest = prefix_digest(file, offset)
+        return digest if digest.hexdigest() == self._file["sha256"] else None
+
+    def _parse(self, chunks: List[bytes]) -> pd.DataFrame:
+        """
+        Args:
+            chunks: Bytes of the CSV data, starting with the header
+
+        Returns:
+            pd.DataFrame: Parsed data with the ingestion profile of the loader
+        """
+        return self._concat(list(self.loader.ingest_stream(chunks)))
+
+    @staticmethod
+    def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenates parsed parts of the data, merging the categories of
+        categorical columns in sorted order instead of falling back to objects
+
+        Args:
+            frames: Parsed parts of the data
+
+        Returns:
+            pd.DataFrame: Concatenated data
+        """
+        if len(frames) <= 1:
+            return frames[0] if frames else pd.DataFrame()
+        columns = {}
+        for column in frames[0].columns:
+            parts = [frame[column] for frame in frames]
+            if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+                columns[column] = pd.api.types.union_categoricals([part.array for part in parts],
+                                                                  sort_categories=True)
+            else:
+                columns[column] = pd.concat(parts, ignore_index=True)
+        return pd.DataFrame(columns)
+
+
+class ChartRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handler answering `GET /chart?features=a,b&classes={"a": [...]}` with
+    a PNG image and `GET /metrics` with the statistics of the service
+    """
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self._send(200, "application/json", json.dumps(self.service.stats()).encode())
+            return
+        if url.path != "/chart":
+            self._send(404, "text/plain", b"Not found")
+            return
+
+        query = parse_qs(url.query)
+        try:
+            features = query["features"][0].split(",") if "features" in query else None
+            classes = json.loads(query["classes"][0]) if "classes" in query else None
+            png, hit = self.service.chart(features, classes)
+        except (KeyError, ValueError) as e:
+            self.service.record_error()
+            self._send(400, "text/plain", str(e).encode())
+            return
+        except EmptyDataFrameError as e:
+            self.service.record_error()
+            self._send(404, "text/plain", str(e).encode())
+            return
+        self._send(200, "image/png", png, {"X-Cache": "hit" if hit else "miss"})
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug("%s %s", self.address_string(), format % args)
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Args:
+            status: HTTP status code
+            content_type: Type of the body
+            body: Body of the response
+            headers: Additional headers
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    HTTP server listening on a Unix socket, one thread per connection
+    """
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP client connection to a Unix socket
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60) -> None:
+        """
+        Args:
+            socket_path: Path of the socket
+            timeout: Seconds to wait for the server
+        """
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def create_server(service: ChartService, host: str = "127.0.0.1", port: int = 0,
+                  socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """
+    Args:
+        service: Service answering the requests
+        host: Host of the HTTP server
+        port: Port of the HTTP server, a free port if 0
+        socket_path: Path of a Unix socket to listen on instead of the port
+
+    Returns:
+        socketserver.BaseServer: Server ready for `serve_forever`
+    """
+    if socket_path:
+        handler = type("BoundChartRequestHandler", (ChartRequestHandler,), {"service": service})
+        return UnixHTTPServer(socket_path, handler)
+    # Headers and body are written separately, without TCP_NODELAY the body waits for a delayed ACK
+    handler = type("BoundChartRequestHandler", (ChartRequestHandler,),
+                   {"service": service, "disable_nagle_algorithm": True})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level="INFO", format="%(message)s")
+    parser = argparse.ArgumentParser(description="Serves charts of the resident dataset over HTTP")
+    parser.add_argument("--data", default=config.DATA_PATH, help="CSV file to serve")
+    parser.add_argument("--host", default=config.SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    parser.add_argument("--socket", default=config.SERVICE_SOCKET, help="Unix socket to listen on instead of the port")
+    args = parser.parse_args()
+
+    chart_service = ChartService(args.data, config.FEATURES, config.CLASSES, config.DTYPES, config.LEGACY_DROPNA,
+                                 config.ENGINE, config.SERVICE_CACHE_SIZE, config.SERVICE_POLL_INTERVAL)
+    chart_service.start()
+    server = create_server(chart_service, args.host, args.port, args.socket)
+    logging.info("Serving charts on: %s", args.socket or "http://%s:%d" % server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        chart_service.stop()
@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+
+
+class StreamingAggregator:
+    """
+    Class to download a CSV file and count it at the same time: a producer
+    thread streams the response to disk and hands every chunk over through
+    a bounded queue to the consumer, which parses complete rows and adds
+    their counts to a running total while the rest is still downloading
+    """
+
+    def __init__(self,
+                 loader: Loader,
+                 features: List[str],
+                 classes: Dict[str, List[str]],
+                 legacy_dropna: bool = False,
+                 engine: str = "groupby",
+                 queue_size: int = 16,
+                 block_size: int = 4 * 1024 * 1024
+                 ) -> None:
+        """
+        Args:
+            loader: Loader of the downloaded file
+            features: Features to select
+            classes: A dictionary storing feature and their classes to select
+            legacy_dropna: Cleaning semantics passed to Transform
+            engine: Counting engine passed to Transform
+            queue_size: Number of downloaded chunks waiting to be parsed, after
+                which the download waits for the parser
+            block_size: Minimal number of bytes parsed at once
+        """
+        self.loader = loader
+        self.features = features
+        self.classes = classes
+        self.legacy_dropna = legacy_dropna
+        self.engine = engine
+        self.queue_size = queue_size
+        self.block_size = block_size
+
+    def aggregate(self) -> Optional[pd.DataFrame]:
+        """
+        Downloads the file unless the saved copy is up to date, teeing its
+        bytes to the path of the loader, and counts it during the download.
+        The eager cache of the loader is built once the download is counted,
+        so building it does not hold up the parser
+
+        Returns:
+            Optional[pd.DataFrame]: Sorted counts of the downloaded file, None if the
+                saved copy is up to date or the download failed, which `up_to_date`
+                of the loader tells apart
+        """
+        self.loader.up_to_date = False
+        headers = {name: value for name, value in self.loader.conditional_headers().items()
+                   if name in ("If-None-Match", "If-Modified-Since")}
+        response = self.loader.download_file(stream=True, headers=headers)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            response.close()
+            logging.info("File is up to date: %s", self.loader.save_path)
+            self.loader.up_to_date = True
+            return None
+
+        chunks = queue.Queue(self.queue_size)
+        stopped = threading.Event()
+        errors = []
+
+        def put(chunk: bytes) -> None:
+            if stopped.is_set():
+                raise RuntimeError("Parsing stopped before the download finished")
+            chunks.put(chunk)
+
+        def produce() -> None:
+            try:
+                self.loader.save_stream(response, on_chunk=put, defer_cache=True)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                chunks.put(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            usecols = None if self.legacy_dropna else list(dict.fromkeys([*self.features, *self.classes]))
+            transform = Transform(None, self.features, self.classes, self.legacy_dropna, self.engine)
+            counts = transform.aggregate_chunks(self.loader.ingest_stream(iter(chunks.get, None), usecols,
+                                                                          block_size=self.block_size))
+        finally:
+            stopped.set()
+            while producer.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+        if errors:
+            raise errors[0]
+        if counts is None:
+            return None
+        logging.info("File has been counted while downloading: %s", self.loader.save_path)
+        if self.loader.eager_cache and self.loader.cache_path is not None:
+            self.loader.build_cache()
+        return transform.sort_data()
@@ -0,0 +1,53 @@
+from unittest import TestCase
+from pipeline.batch import BatchCharts, ChartConfig, load_charts
+import json
+import os
+import tempfile
+import pandas as pd
+
+
+class TestBatchCharts(TestCase):
+    """
+    Unit tests for the BatchCharts class, focusing on shared ingestion and per-chart output
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        pd.DataFrame({'platform': ['PS4', 'PC', 'XOne', 'PS4', 'PC', 'WiiU'],
+                      'genre': ['Action', 'Sports', 'Action', 'Racing', 'Action', 'Misc'],
+                      'year_of_release': [2015, 2015, 2016, 2016, 2015, 2014],
+                      'jp_sales': [0.3, 0.0, 0.0, 0.1, 0.0, 0.2]}).to_csv(self.data_path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def graph_path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_run_renders_every_chart(self):
+        """
+        Tests that every configuration gets its own image and correctly filtered counts
+        """
+        charts = [ChartConfig(self.graph_path("all.png"), {'platform': ['PS4', 'PC', 'XOne']}),
+                  ChartConfig(self.graph_path("2015.png"), {'platform': ['PS4', 'PC'], 'year_of_release': [2015]}),
+                  ChartConfig(self.graph_path("jp.png"), {'platform': ['PS4', 'WiiU']}, region='jp')]
+
+        with self.assertLogs(level='INFO') as log:
+            results = BatchCharts(self.data_path, charts, workers=2).run()
+            self.assertIn("Data ingested once for 3 charts", log.output[0])
+
+        self.assertEqual([result.rows for result in results], [5, 3, 3])
+        for chart in charts:
+            self.assertTrue(os.path.getsize(chart.graph_path) > 0)
+
+    def test_load_charts(self):
+        """
+        Tests reading chart configurations from a JSON file
+        """
+        charts_path = self.graph_path("charts.json")
+        with open(charts_path, 'w') as file:
+            json.dump([{"graph_path": "a.png", "classes": {"platform": ["PC"]}, "region": "eu"}], file)
+
+        charts = load_charts(charts_path)
+
+        self.assertEqual(charts, [ChartConfig("a.png", {"platform": ["PC"]}, ['platform', 'genre'], "eu")])
@@ -0,0 +1,116 @@
+from unittest import TestCase, mock
+from pipeline.cube import CountCube
+from configuration.config import BaseConfig
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+import os
+import tempfile
+import pandas as pd
+
+
+class TestCountCube(TestCase):
+    """
+    Unit tests for the CountCube class, focusing on equality with the eager Transform
+    """
+    def setUp(self):
+        """
+        Saves a small dataset as CSV
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.cube_path = os.path.join(self.tmp_dir.name, "cube", "dataset.cube.npz")
+        pd.DataFrame({'name': list('abcdefghijkl'),
+                      'platform': ['PS4', 'PC', 'XOne', 'PS4', 'Wii', 'PC', None, 'PS4', 'XOne', 'PC', 'PS4', 'PC'],
+                      'year_of_release': [2015, 2015, None, 2016, 2015, 2016, 2015, 2015, 2016, 2015, 2014, 2016],
+                      'genre': ['Action', 'Sports', 'Action', 'Action', 'Racing', 'Action', 'Misc', None, 'Sports',
+                                'Action', 'Action', 'Sports'],
+                      'rating': ['M', None, 'E', 'M', 'E', None, 'T', 'E', 'M', 'E', 'M', 'T']}).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def eager(self, features, classes) -> pd.DataFrame:
+        transform = Transform(pd.read_csv(self.path), features, classes)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data()
+
+    def test_query_matches_eager(self):
+        """
+        Tests that slicing the cube returns the counts of the eager Transform
+        """
+        cube = CountCube.build(pd.read_csv(self.path))
+        cases = [(['platform', 'genre'], {'platform': ['PS4', 'XOne', 'PC', 'WiiU']}),
+                 (['platform', 'genre'], {}),
+                 (['genre', 'platform'], {'platform': ['PC', 'PS4'], 'year_of_release': [2015]}),
+                 (['platform', 'rating'], {'rating': ['M', 'E']}),
+                 (['year_of_release', 'genre'], {'genre': ['Action']}),
+                 (['rating', 'year_of_release'], {'platform': ['PS4']})]
+        for features, classes in cases:
+            with self.subTest(features=features, classes=classes):
+                pd.testing.assert_frame_equal(cube.query(features, classes), self.eager(features, classes))
+
+    def test_save_and_load(self):
+        """
+        Tests that the counts and category dictionaries survive a round trip to disk
+        """
+        cube = CountCube.build(pd.read_csv(self.path))
+        cube.save(self.cube_path)
+        loaded = CountCube.load(self.cube_path)
+
+        self.assertEqual(loaded.dimensions, cube.dimensions)
+        self.assertEqual(loaded.categories, cube.categories)
+        self.assertTrue((loaded.counts == cube.counts).all())
+        self.assertEqual(int(loaded.counts.sum()), 12)
+        features, classes = ['platform', 'year_of_release'], {'platform': ['PC', 'PS4']}
+        pd.testing.assert_frame_equal(loaded.query(features, classes), self.eager(features, classes))
+
+    def test_for_file_with_profile(self):
+        """
+        Tests that a cube built with the ingestion profile answers with the values
+        and data types of the eager Transform after a round trip to disk
+        """
+        loader = Loader(None, self.path, dtypes=BaseConfig.DTYPES)
+        CountCube.for_file(self.cube_path, loader)
+        with mock.patch.object(loader, 'ingest_data', wraps=loader.ingest_data) as ingest:
+            cube = CountCube.for_file(self.cube_path, loader)
+        ingest.assert_not_called()
+
+        df = loader.ingest_data()
+        cases = [(['platform', 'genre'], {'platform': ['PS4', 'XOne', 'PC', 'WiiU'], 'year_of_release': [2015]}),
+                 (['year_of_release', 'genre'], {'genre': ['Action']}),
+                 (['rating', 'year_of_release'], {'platform': ['PS4']})]
+        for features, classes in cases:
+            with self.subTest(features=features, classes=classes):
+                transform = Transform(df, features, classes)
+                transform.clean_data()
+                transform.group_and_count()
+                expected = transform.sort_data()
+                self.assertGreater(len(expected), 0)
+                pd.testing.assert_frame_equal(cube.query(features, classes), expected)
+
+    def test_for_file_rebuilds_changed_file(self):
+        """
+        Tests that the saved cube is reused until the counted file changes
+        """
+        loader = Loader(None, self.path)
+        CountCube.for_file(self.cube_path, loader)
+        with mock.patch.object(loader, 'ingest_data', wraps=loader.ingest_data) as ingest:
+            CountCube.for_file(self.cube_path, loader)
+        ingest.assert_not_called()
+
+        with open(self.path, 'a') as file:
+            file.write("m,PC,2015,Action,E\n")
+        cube = CountCube.for_file(self.cube_path, loader)
+        self.assertEqual(int(cube.counts.sum()), 13)
+
+    def test_supports(self):
+        """
+        Tests that columns outside the cube and legacy cleaning are left to the row scan
+        """
+        cube = CountCube.build(pd.read_csv(self.path))
+        self.assertTrue(cube.supports(['platform', 'genre'], {'year_of_release': [2015]}, legacy_dropna=False))
+        self.assertFalse(cube.supports(['platform', 'genre'], {}, legacy_dropna=True))
+        self.assertFalse(cube.supports(['platform', 'name'], {}, legacy_dropna=False))
+        self.assertFalse(cube.supports(['platform'], {'name': ['a']}, legacy_dropna=False))
+
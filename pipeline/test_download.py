@@ -0,0 +1,83 @@
+from unittest import TestCase
+from pipeline.download import MultiLoader
+from lessons.extract.stub_server import StubServer
+import os
+import tempfile
+
+
+class TestMultiLoader(TestCase):
+    """
+    Unit tests for the MultiLoader class, focusing on concurrency, retries and per-file status
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.payload = b"platform,genre\n" + b"PS4,Action\n" * 1000
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def sources(self, servers, count):
+        return [(servers[index % len(servers)].url, os.path.join(self.tmp_dir.name, "regions", f"sales_{index}.csv"))
+                for index in range(count)]
+
+    def test_fetch_all_concurrently_within_host_limit(self):
+        """
+        Tests that slow sources are downloaded in parallel without exceeding the limit per host
+        """
+        with StubServer(self.payload, latency=0.2) as first, StubServer(self.payload, latency=0.2) as second:
+            sources = self.sources([first, second], 8)
+            statuses = MultiLoader(sources, workers=8, per_host=2).fetch_all()
+
+        self.assertTrue(all(status.ok and status.updated for status in statuses))
+        self.assertEqual([status.path for status in statuses], [path for _, path in sources])
+        for _, path in sources:
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), self.payload)
+        self.assertEqual((first.max_active, second.max_active), (2, 2))
+
+    def test_fetch_reuses_connections(self):
+        """
+        Tests that downloads from one host share a kept-alive connection
+        """
+        with StubServer(self.payload, keep_alive=True) as server:
+            statuses = MultiLoader(self.sources([server], 4), workers=1, per_host=1).fetch_all()
+
+        self.assertTrue(all(status.ok for status in statuses))
+        self.assertEqual(server.connections, 1)
+
+    def test_fetch_retries_transient_errors(self):
+        """
+        Tests that `503 Service Unavailable` answers are retried with backoff
+        """
+        with StubServer(self.payload, fail_first=2) as server:
+            status, = MultiLoader(self.sources([server], 1), retries=3, backoff=0.01).fetch_all()
+
+        self.assertTrue(status.ok)
+        self.assertEqual(status.attempts, 3)
+        self.assertEqual(status.status_code, 200)
+
+    def test_fetch_reports_failures(self):
+        """
+        Tests that a source failing after all retries gets a failed status instead of None
+        """
+        with StubServer(self.payload, fail_first=10) as failing, StubServer(self.payload) as server:
+            sources = self.sources([failing, server], 2)
+            statuses = MultiLoader(sources, retries=1, backoff=0.01).fetch_all()
+
+        self.assertEqual([status.ok for status in statuses], [False, True])
+        self.assertEqual(statuses[0].attempts, 2)
+        self.assertEqual(statuses[0].status_code, 503)
+        self.assertIn("503", statuses[0].error)
+        self.assertFalse(os.path.exists(sources[0][1]))
+
+    def test_fetch_skips_unchanged_files(self):
+        """
+        Tests that a second run only revalidates files which did not change
+        """
+        with StubServer(self.payload, etag='"v1"') as server:
+            sources = self.sources([server], 3)
+            MultiLoader(sources).fetch_all()
+            statuses = MultiLoader(sources).fetch_all()
+
+        self.assertTrue(all(status.ok and not status.updated for status in statuses))
+        self.assertEqual([status.status_code for status in statuses], [304] * 3)
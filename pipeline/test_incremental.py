@@ -0,0 +1,152 @@
+from unittest import TestCase
+from pipeline.incremental import IncrementalAggregator
+from lessons.transform.transform_data import Transform
+import os
+import tempfile
+import pandas as pd
+
+
+class TestIncrementalAggregator(TestCase):
+    """
+    Unit tests for the IncrementalAggregator class, focusing on appended and rewritten files
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.state_path = os.path.join(self.tmp_dir.name, "dataset.counts.json")
+        self.features = ['platform', 'genre']
+        self.classes = {'platform': ['PS4', 'XOne', 'PC']}
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\n"
+                       "Halo 5,XOne,Shooter,2.5\n"
+                       "\"Ratchet, Clank\",PS4,Platform,1.1\n"
+                       "FIFA 16,PS4,Sports,1.0\n"
+                       "Minecraft,PC,,0.4\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def aggregator(self) -> IncrementalAggregator:
+        return IncrementalAggregator(self.data_path, self.state_path, self.features, self.classes, chunksize=2)
+
+    def full_recompute(self) -> pd.DataFrame:
+        transform = Transform(pd.read_csv(self.data_path), self.features, self.classes)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data()
+
+    def append(self, text: str) -> None:
+        with open(self.data_path, 'a') as file:
+            file.write(text)
+
+    def test_aggregate_first_run(self):
+        """
+        Tests that the first run counts the whole file
+        """
+        with self.assertLogs(level='INFO') as log:
+            result = self.aggregator().aggregate()
+            self.assertIn("Counting the whole file", log.output[0])
+        pd.testing.assert_frame_equal(result, self.full_recompute())
+
+    def test_aggregate_appended_rows(self):
+        """
+        Tests that a later run parses only the appended rows and matches a full recompute
+        """
+        self.aggregator().aggregate()
+        appended = "Forza 6,XOne,Racing,1.9\nFIFA 17,PS4,Sports,1.2\n"
+        self.append(appended)
+
+        with self.assertLogs(level='INFO') as log:
+            result = self.aggregator().aggregate()
+            self.assertIn(f"Counting {len(appended)} appended bytes", log.output[0])
+        pd.testing.assert_frame_equal(result, self.full_recompute())
+
+    def test_aggregate_incomplete_last_line(self):
+        """
+        Tests that a row still being appended is counted only once it is complete
+        """
+        self.aggregator().aggregate()
+        self.append("Forza 6,XOne,Rac")
+        partial = self.aggregator().aggregate()
+        self.assertEqual(partial['count'].sum(), 3)
+
+        self.append("ing,1.9\n")
+        pd.testing.assert_frame_equal(self.aggregator().aggregate(), self.full_recompute())
+
+    def test_aggregate_last_row_without_newline(self):
+        """
+        Tests that a last row without a trailing newline is counted by a full count and once the file is stable
+        """
+        self.append("Forza 6,XOne,Racing,1.9")
+        pd.testing.assert_frame_equal(self.aggregator().aggregate(), self.full_recompute())
+
+        self.append("\nFIFA 17,PS4,Sports,1.2")
+        with self.assertLogs(level='INFO') as log:
+            self.assertEqual(self.aggregator().aggregate()['count'].sum(), 4)
+            self.assertIn("appended bytes", log.output[0])
+        pd.testing.assert_frame_equal(self.aggregator().aggregate(), self.full_recompute())
+
+        self.append("\nGran Turismo,PS4,Racing,0")
+        self.assertEqual(self.aggregator().aggregate()['count'].sum(), 5)
+        self.assertEqual(self.aggregator().aggregate()['count'].sum(), 6)
+        self.append(".8\n")
+        with self.assertLogs(level='INFO') as log:
+            result = self.aggregator().aggregate()
+            self.assertIn("Counting the whole file", log.output[0])
+        pd.testing.assert_frame_equal(result, self.full_recompute())
+
+    def test_aggregate_two_rows_without_newline(self):
+        """
+        Tests that both rows of a file without a final newline are counted on the first run
+        """
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\nHalo 5,XOne,Shooter,2.5\nFIFA 16,PS4,Sports,1.0")
+
+        self.assertEqual(self.aggregator().aggregate()['count'].sum(), 2)
+
+    def test_aggregate_rewritten_file(self):
+        """
+        Tests that a rewritten file is detected and counted from the start
+        """
+        self.aggregator().aggregate()
+        with open(self.data_path, 'r') as file:
+            content = file.read()
+        with open(self.data_path, 'w') as file:
+            file.write(content.replace("Halo 5,XOne,Shooter", "Halo 5,PC,Shooter") + "Forza 6,XOne,Racing,1.9\n")
+
+        with self.assertLogs(level='INFO') as log:
+            result = self.aggregator().aggregate()
+            self.assertIn("Counting the whole file", log.output[0])
+        pd.testing.assert_frame_equal(result, self.full_recompute())
+
+    def test_aggregate_rewritten_middle(self):
+        """
+        Tests that a rewrite in the middle of a large file, keeping its size, is counted again as a whole
+        """
+        rows = ["Halo 5,XOne,Shooter,2.5\n"] * 10000
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\n" + "".join(rows))
+        aggregator = IncrementalAggregator(self.data_path, self.state_path, self.features, self.classes)
+        aggregator.aggregate()
+
+        rows[5000] = "FIFA 16,PS4,Sports,1.00\n"
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\n" + "".join(rows))
+        self.append("Forza 6,XOne,Racing,1.9\n")
+
+        with self.assertLogs(level='INFO') as log:
+            result = aggregator.aggregate()
+            self.assertIn("Counting the whole file", log.output[0])
+        pd.testing.assert_frame_equal(result, self.full_recompute())
+
+    def test_aggregate_changed_classes(self):
+        """
+        Tests that stored counts are not reused for other classes
+        """
+        self.aggregator().aggregate()
+        self.classes = {'platform': ['PS4']}
+
+        with self.assertLogs(level='INFO') as log:
+            result = self.aggregator().aggregate()
+            self.assertIn("Counting the whole file", log.output[0])
+        pd.testing.assert_frame_equal(result, self.full_recompute())
@@ -0,0 +1,82 @@
+from unittest import TestCase
+from pipeline.instrumentation import StageProfiler
+from lessons.transform.transform_data import Transform
+import io
+import json
+import pandas as pd
+
+
+class TestStageProfiler(TestCase):
+    """
+    Unit tests for the StageProfiler class, focusing on recorded measurements and outputs
+    """
+    def setUp(self):
+        self.df = pd.DataFrame({'feature1': ['X', 'Y', 'X', None],
+                                'feature2': ['A', 'B', 'A', 'B']})
+
+    def test_from_config_disabled(self):
+        """
+        Tests that no profiler is created when profiling is off
+        """
+        self.assertIsNone(StageProfiler.from_config(""))
+        self.assertIsInstance(StageProfiler.from_config("json"), StageProfiler)
+
+    def test_instrument_records_rows(self):
+        """
+        Tests that instrumented methods record rows in and out and return unchanged results
+        """
+        profiler = StageProfiler(output="table", trace_memory=True)
+        transform = profiler.instrument(Transform(self.df, ['feature1', 'feature2'], {}), ['clean_data', 'group_and_count', 'missing'])
+
+        transform.clean_data()
+        result = transform.group_and_count()
+
+        self.assertEqual([record.stage for record in profiler.records], ['Transform.clean_data', 'Transform.group_and_count'])
+        self.assertEqual([(record.rows_in, record.rows_out) for record in profiler.records], [(4, 3), (3, 2)])
+        self.assertEqual(result['count'].tolist(), [2, 1])
+        self.assertTrue(all(record.wall_seconds >= 0 and record.traced_peak_mb is not None for record in profiler.records))
+
+    def test_json_output(self):
+        """
+        Tests that the JSON output writes one parsable line per stage
+        """
+        stream = io.StringIO()
+        profiler = StageProfiler(output="json", stream=stream)
+
+        with profiler.stage("custom") as record:
+            record.rows_out = 7
+
+        line = json.loads(stream.getvalue())
+        self.assertEqual(line["stage"], "custom")
+        self.assertEqual(line["rows_out"], 7)
+        self.assertIsNone(line["traced_peak_mb"])
+
+    def test_report_table(self):
+        """
+        Tests that the summary table lists every stage
+        """
+        profiler = StageProfiler(output="table")
+        with profiler.stage("first"):
+            pass
+
+        with self.assertLogs(level='INFO') as log:
+            table = profiler.report()
+            self.assertIn("first", log.output[0])
+        self.assertEqual(len(table.splitlines()), 2)
+
+    def test_nested_stage_traced_peak(self):
+        """
+        Tests that the traced peak of a nested stage is carried over to the enclosing stage
+        """
+        profiler = StageProfiler(output="table", trace_memory=True)
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                block = bytearray(8 * 2**20)
+                del block
+            with profiler.stage("after"):
+                pass
+
+        traced = {record.stage: record.traced_peak_mb for record in profiler.records}
+        self.assertGreaterEqual(traced["inner"], 8)
+        self.assertLess(traced["after"], 1)
+        self.assertGreaterEqual(traced["outer"], traced["inner"])
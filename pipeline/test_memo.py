@@ -0,0 +1,98 @@
+from unittest import TestCase
+from pipeline.memo import ResultCache
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+class TestResultCache(TestCase):
+    """
+    Unit tests for the ResultCache class
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(os.path.join(self.tmp_dir.name, "cache"), max_bytes=1024)
+        self.data_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        with open(self.data_path, 'w') as file:
+            file.write("platform,genre\nPS4,Action\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_input_hash_follows_content(self):
+        """
+        Tests that the input hash changes with the content but not with the modification time alone
+        """
+        first = self.cache.input_hash([self.data_path])
+        os.utime(self.data_path, ns=(0, 0))
+        self.assertEqual(self.cache.input_hash([self.data_path]), first)
+
+        with open(self.data_path, 'a') as file:
+            file.write("PC,Sports\n")
+        self.assertNotEqual(self.cache.input_hash([self.data_path]), first)
+
+    def test_key_depends_on_parameters(self):
+        """
+        Tests that keys differ for other features or classes and ignore the order of dictionary keys
+        """
+        self.assertEqual(ResultCache.key("h", {"a": [1], "b": [2]}), ResultCache.key("h", {"b": [2], "a": [1]}))
+        self.assertNotEqual(ResultCache.key("h", ['platform', 'genre']), ResultCache.key("h", ['genre', 'platform']))
+
+    def test_counts_and_image_round_trip(self):
+        """
+        Tests that stored count tables and images are returned under their keys
+        """
+        columns = {'platform': ['PS4'], 'genre': ['Action'], 'count': [1]}
+        table_hash = self.cache.put_counts("counts", columns)
+        self.assertEqual(self.cache.get_counts("counts"), {"columns": columns, "hash": table_hash})
+        self.assertIsNone(self.cache.get_counts("missing"))
+
+        image_path = os.path.join(self.tmp_dir.name, "graph.png")
+        with open(image_path, 'wb') as file:
+            file.write(b"png")
+        self.cache.put_image("image", image_path)
+        target_path = os.path.join(self.tmp_dir.name, "graphs", "copy.png")
+
+        self.assertTrue(self.cache.get_image("image", target_path))
+        with open(target_path, 'rb') as file:
+            self.assertEqual(file.read(), b"png")
+        self.assertFalse(self.cache.get_image("missing", target_path))
+
+    def test_evicts_least_recently_used(self):
+        """
+        Tests that the least recently used results are evicted once the cache exceeds its size
+        """
+        image_path = os.path.join(self.tmp_dir.name, "graph.png")
+        with open(image_path, 'wb') as file:
+            file.write(b"x" * 400)
+        for key in ("a", "b"):
+            self.cache.put_image(key, image_path)
+            time.sleep(0.01)
+        self.assertTrue(self.cache.get_image("a", os.path.join(self.tmp_dir.name, "a.png")))
+        time.sleep(0.01)
+        self.cache.put_image("c", image_path)
+
+        target_path = os.path.join(self.tmp_dir.name, "out.png")
+        self.assertTrue(self.cache.get_image("a", target_path))
+        self.assertFalse(self.cache.get_image("b", target_path))
+        self.assertTrue(self.cache.get_image("c", target_path))
+
+    def test_checked_within(self):
+        """
+        Tests that a check of the remote copy expires after the given age
+        """
+        self.assertFalse(self.cache.checked_within(self.data_path, 60))
+        self.cache.mark_checked(self.data_path)
+        self.assertTrue(self.cache.checked_within(self.data_path, 60))
+        self.assertFalse(self.cache.checked_within(self.data_path, 0))
+
+    def test_import_skips_pandas_and_matplotlib(self):
+        """
+        Tests that the cache module loads neither pandas nor matplotlib
+        """
+        code = "import sys, pipeline.memo; print('pandas' in sys.modules or 'matplotlib' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertEqual(output.strip(), "False")
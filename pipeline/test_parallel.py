@@ -0,0 +1,67 @@
+from unittest import TestCase
+from pipeline.parallel import ParallelAggregator
+from lessons.transform.transform_data import Transform
+import os
+import tempfile
+import pandas as pd
+
+
+class TestParallelAggregator(TestCase):
+    """
+    Unit tests for the ParallelAggregator class, focusing on equality with a serial run
+    """
+    def setUp(self):
+        """
+        Splits a small dataset into CSV shards
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({'platform': ['PS4', 'PC', 'XOne', 'PS4', 'Wii', 'PC', None, 'PS4', 'XOne'],
+                                'genre': ['Action', 'Sports', 'Action', 'Action', 'Racing', 'Action', 'Misc', None, 'Sports'],
+                                'na_sales': [6.03, 0.5, 1.2, None, 0.3, 0.1, 0.2, 0.9, 1.1]})
+        self.features = ['platform', 'genre']
+        self.classes = {'platform': ['PS4', 'XOne', 'PC']}
+        self.paths = []
+        for shard, start in enumerate(range(0, len(self.df), 4)):
+            path = os.path.join(self.tmp_dir.name, f"shard_{shard}.csv")
+            self.df.iloc[start:start + 4].to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def serial(self, engine: str) -> pd.DataFrame:
+        df = pd.concat([pd.read_csv(path) for path in self.paths], ignore_index=True)
+        transform = Transform(df, self.features, self.classes, engine=engine)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data()
+
+    def test_aggregate_matches_serial(self):
+        """
+        Tests that the merged counts of all shards equal the counts of the concatenated shards
+        """
+        for engine in ("groupby", "bincount"):
+            with self.subTest(engine=engine):
+                aggregator = ParallelAggregator(self.paths, self.features, self.classes, workers=2, engine=engine)
+                pd.testing.assert_frame_equal(aggregator.aggregate(), self.serial(engine))
+
+    def test_aggregate_missing_shard(self):
+        """
+        Tests that a missing shard is reported instead of silently skipped
+        """
+        self.paths.append(os.path.join(self.tmp_dir.name, "missing.csv"))
+        aggregator = ParallelAggregator(self.paths, self.features, self.classes, workers=2)
+
+        with self.assertRaises(FileNotFoundError):
+            aggregator.aggregate()
+
+    def test_aggregate_shard_missing_feature(self):
+        """
+        Tests that a shard without a feature column is reported instead of silently left out of the merge
+        """
+        self.df.drop(columns='genre').to_csv(self.paths[0], index=False)
+        aggregator = ParallelAggregator(self.paths, self.features, self.classes, workers=2)
+
+        with self.assertRaises(ValueError) as context:
+            aggregator.aggregate()
+        self.assertIn(self.paths[0], str(context.exception))
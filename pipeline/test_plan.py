@@ -0,0 +1,117 @@
+from unittest import TestCase
+from pipeline.plan import Aggregate, Filter, LazyTransform, Project, Scan, Sort, optimize
+from lessons.extract.load_data import Loader
+from lessons.transform.transform_data import Transform
+import os
+import tempfile
+import pandas as pd
+
+
+class TestLazyTransform(TestCase):
+    """
+    Unit tests for the LazyTransform class, focusing on equality with the eager Transform
+    """
+    def setUp(self):
+        """
+        Saves a small dataset as CSV
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        pd.DataFrame({'platform': ['PS4', 'PC', 'XOne', 'PS4', 'Wii', 'PC', None, 'PS4', 'XOne', 'PC'],
+                      'year': [2015, 2015, None, 2016, 2015, 2016, 2015, 2015, 2016, 2015],
+                      'genre': ['Action', 'Sports', 'Action', 'Action', 'Racing', 'Action', 'Misc', None, 'Sports', 'Action'],
+                      'rating': ['M', None, 'E', 'M', 'E', None, 'T', 'E', 'M', 'E']}).to_csv(self.path, index=False)
+        self.loader = Loader(None, self.path)
+        self.features = ['platform', 'genre']
+        self.classes = {'platform': ['PS4', 'XOne', 'PC']}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def eager(self, classes, legacy_dropna=False, engine="groupby") -> pd.DataFrame:
+        transform = Transform(pd.read_csv(self.path), self.features, classes, legacy_dropna, engine)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data()
+
+    def test_collect_matches_eager(self):
+        """
+        Tests that both backends return the counts of the eager Transform
+        """
+        for classes in (self.classes, {'platform': ['PS4', 'PC'], 'year': [2015]}):
+            for legacy_dropna in (False, True):
+                for engine in ("groupby", "bincount"):
+                    for streaming in (False, True):
+                        with self.subTest(classes=classes, legacy_dropna=legacy_dropna, engine=engine, streaming=streaming):
+                            plan = LazyTransform(self.loader, self.features, classes, legacy_dropna, engine)
+                            df = plan.clean_data().group_and_count().sort_data().collect(streaming, chunksize=3)
+                            pd.testing.assert_frame_equal(df, self.eager(classes, legacy_dropna, engine))
+
+    def test_collect_numeric_feature(self):
+        """
+        Tests that a numeric feature keeps the type of the eager Transform, inferred or from the profile
+        """
+        self.features = ['platform', 'year']
+        for dtypes in ({}, {'year': 'Int16'}):
+            loader = Loader(None, self.path, dtypes=dtypes)
+            transform = Transform(loader.ingest_data(), self.features, self.classes)
+            transform.clean_data()
+            transform.group_and_count()
+            expected = transform.sort_data()
+            for engine in ("groupby", "bincount"):
+                for streaming in (False, True):
+                    with self.subTest(dtypes=dtypes, engine=engine, streaming=streaming):
+                        plan = LazyTransform(loader, self.features, self.classes, engine=engine)
+                        df = plan.clean_data().group_and_count().sort_data().collect(streaming, chunksize=3)
+                        self.assertNotIn('year', plan.operations[0].dtype)
+                        pd.testing.assert_frame_equal(df, expected)
+
+    def test_collect_cleaned_rows(self):
+        """
+        Tests that a plan without counting returns the cleaned rows
+        """
+        plan = LazyTransform(self.loader, self.features, self.classes).clean_data()
+        expected = Transform(pd.read_csv(self.path), self.features, self.classes).clean_data()
+
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                df = plan.collect(streaming, chunksize=4)
+                self.assertEqual(df.astype(object).values.tolist(), expected.values.tolist())
+
+    def test_collect_is_lazy(self):
+        """
+        Tests that recording operations does not read the file
+        """
+        plan = LazyTransform(Loader(None, os.path.join(self.tmp_dir.name, "missing.csv")), self.features, self.classes)
+        plan.clean_data().group_and_count().sort_data()
+
+        with self.assertRaises(FileNotFoundError):
+            plan.collect()
+
+    def test_optimize(self):
+        """
+        Tests that filters are merged, class filters and columns are pushed into
+        the read and the sort after counting is dropped
+        """
+        plan = LazyTransform(self.loader, self.features, {'platform': ['PS4', 'PC'], 'year': [2015]})
+        plan.clean_data().group_and_count().sort_data()
+        operations = optimize(plan.operations)
+
+        self.assertEqual([type(operation) for operation in operations], [Scan, Filter, Project, Aggregate])
+        scan, selection = operations[0], operations[1]
+        self.assertEqual(scan.usecols, ['platform', 'genre', 'year'])
+        self.assertEqual(list(scan.dtype['platform'].categories), ['PS4', 'PC'])
+        self.assertEqual(scan.dtype['genre'], 'category')
+        self.assertEqual(selection.notna, ['platform', 'genre', 'year'])
+        self.assertEqual(selection.isin, {})
+        self.assertEqual(len(plan.operations), 6)
+
+    def test_optimize_keeps_sort_for_legacy_dropna(self):
+        """
+        Tests that every column is read and the sort kept when cleaning checks every column
+        """
+        plan = LazyTransform(self.loader, self.features, self.classes, legacy_dropna=True)
+        operations = optimize(plan.clean_data().group_and_count().sort_data().operations)
+
+        self.assertIsNone(operations[0].usecols)
+        self.assertIsInstance(operations[-1], Sort)
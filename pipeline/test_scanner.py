@@ -0,0 +1,93 @@
+from unittest import TestCase, mock
+from pipeline.scanner import MmapCounter
+from lessons.transform.transform_data import Transform
+import os
+import tempfile
+import pandas as pd
+
+CSV = (b'name,platform,year,genre,rating\r\n'
+       b'"Call of Duty, Black Ops",PS4,2015,Shooter,M\r\n'
+       b'"Multi\nline ""title""",PC,2016,Action,E\r\n'
+       b'Plain,XOne,2015,"Sports",NA\r\n'
+       b'Short,PS4\r\n'
+       b'\r\n'
+       b'"Quoted, again",PS4,2014,Shooter,T\r\n'
+       b'Other,Wii,2015,Racing,E\r\n'
+       b'Missing,,2015,Action,E\r\n'
+       b'Empty genre,PC,2016,"",M\r\n'
+       b'"A ""B"", C","PC",2015,Action,E\r\n'
+       b'Last,XOne,2016,Sports,E')
+
+
+class TestMmapCounter(TestCase):
+    """
+    Unit tests for the MmapCounter class, focusing on equality with the pandas path
+    """
+    def setUp(self):
+        """
+        Saves a CSV file with quoted separators, CRLF line ends, short and blank rows
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        with open(self.path, 'wb') as file:
+            file.write(CSV)
+        self.features = ['platform', 'genre']
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def expected(self, classes) -> pd.DataFrame:
+        transform = Transform(pd.read_csv(self.path), self.features, classes)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data()
+
+    def test_count_matches_pandas(self):
+        """
+        Tests that the scanned counts equal the counts of the pandas path
+        """
+        for classes in ({'platform': ['PS4', 'XOne', 'PC', 'WiiU']}, {}, {'platform': ['PC', 'PS4'], 'rating': ['E', 'M']}):
+            for workers in (1, 3):
+                with self.subTest(classes=classes, workers=workers):
+                    counter = MmapCounter(self.path, self.features, classes, workers)
+                    pd.testing.assert_frame_equal(counter.count(), self.expected(classes))
+
+    def test_count_in_small_blocks(self):
+        """
+        Tests that splitting the file into blocks never cuts a quoted field
+        """
+        classes = {'platform': ['PS4', 'XOne', 'PC']}
+        with mock.patch('pipeline.scanner.BLOCK_SIZE', 16):
+            df = MmapCounter(self.path, self.features, classes, 1).count()
+        pd.testing.assert_frame_equal(df, self.expected(classes))
+
+    def test_count_missing_column(self):
+        """
+        Tests that a feature missing in the header is reported
+        """
+        with self.assertRaises(KeyError):
+            MmapCounter(self.path, ['platform', 'publisher'], {}, 1).count()
+
+    def test_count_stray_quote(self):
+        """
+        Tests that a quote inside an unquoted field is reported instead of shifting the later rows
+        """
+        with open(self.path, 'wb') as file:
+            file.write(CSV.replace(b'Plain,XOne', b'Plain 5" disc,XOne'))
+        self.assertEqual(len(self.expected({})), 4)
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                with self.assertRaises(ValueError):
+                    MmapCounter(self.path, self.features, {}, workers).count()
+
+    def test_supports(self):
+        """
+        Tests that numeric features and classes and legacy cleaning are left to the pandas path
+        """
+        self.assertTrue(MmapCounter(self.path, self.features, {'platform': ['PS4']}).supports(legacy_dropna=False))
+        self.assertFalse(MmapCounter(self.path, self.features, {'platform': ['PS4']}).supports(legacy_dropna=True))
+        self.assertFalse(MmapCounter(self.path, self.features, {'year': [2015]}).supports(legacy_dropna=False))
+        self.assertFalse(MmapCounter(self.path, ['platform', 'year'], {}).supports(legacy_dropna=False))
+        self.assertFalse(MmapCounter(self.path, ['platform', 'year'], {}).supports(False, {'year': 'Int16'}))
+        self.assertTrue(MmapCounter(self.path, ['platform', 'year'], {}).supports(False, {'year': 'category'}))
+        self.assertFalse(MmapCounter(self.path, ['platform', 'publisher'], {}).supports(legacy_dropna=False))
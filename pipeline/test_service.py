@@ -0,0 +1,264 @@
+from unittest import TestCase
+from pipeline.service import ChartService, UnixHTTPConnection, create_server
+from lessons.transform.transform_data import Transform
+import http.client
+import json
+import os
+import tempfile
+import threading
+import pandas as pd
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class TestChartService(TestCase):
+    """
+    Unit tests for the ChartService class, focusing on reloading, caching and the HTTP interface
+    """
+    def setUp(self):
+        """
+        Saves a small dataset as CSV and creates a service with a categorical profile
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.features = ['platform', 'genre']
+        self.classes = {'platform': ['PS4', 'XOne', 'PC']}
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\n"
+                       "Halo 5,XOne,Shooter,2.5\n"
+                       "\"Ratchet, Clank\",PS4,Platform,1.1\n"
+                       "FIFA 16,PS4,Sports,1.0\n"
+                       "Minecraft,PC,,0.4\n")
+        self.service = ChartService(self.data_path, self.features, self.classes,
+                                    {'platform': 'category', 'genre': 'category'}, cache_size=2)
+
+    def tearDown(self):
+        """
+        Removes the temporary directory with the dataset
+        """
+        self.tmp_dir.cleanup()
+
+    def append(self, text: str) -> None:
+        """
+        Args:
+            text: Text appended to the dataset
+        """
+        with open(self.data_path, 'a') as file:
+            file.write(text)
+
+    def full_load(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: The whole dataset read with the profile of the service
+        """
+        return pd.read_csv(self.data_path, dtype={'platform': 'category', 'genre': 'category'})
+
+    def serve(self, **kwargs):
+        """
+        Starts a server of the service in a thread, stopped when the test ends
+
+        Args:
+            kwargs: Arguments passed to `create_server`
+
+        Returns:
+            socketserver.BaseServer: The running server
+        """
+        server = create_server(self.service, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_reload_appended_rows(self):
+        """
+        Tests that appended rows are parsed alone and give the same data as loading the whole file
+        """
+        self.assertTrue(self.service.reload())
+        self.append("Forza 6,XOne,Racing,1.9\nFIFA 17,PS4,Sports,1.2\nGran")
+
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(self.service.reload())
+            self.assertIn("Loaded 2 appended rows", log.output[0])
+        self.assertEqual(self.service.version, 2)
+
+        self.append(" Turismo,PS4,Racing,0.8\n")
+        self.service.reload()
+        pd.testing.assert_frame_equal(self.service.df, self.full_load())
+        self.assertFalse(self.service.reload())
+
+    def test_reload_last_row_without_newline(self):
+        """
+        Tests that a last row without a trailing newline is loaded by a full load and once
+        the file is stable, and loaded again when further bytes continue it
+        """
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\nHalo 5,XOne,Shooter,2.5\nFIFA 16,PS4,Sports,1.0")
+        self.service.reload()
+        self.assertEqual(len(self.service.df), 2)
+
+        self.append("\nGran Turismo,PS4,Racing,0")
+        self.assertFalse(self.service.reload())
+        self.assertEqual(len(self.service.df), 2)
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(self.service.reload())
+            self.assertIn("Loaded 1 appended rows", log.output[0])
+
+        self.append(".8\n")
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(self.service.reload())
+            self.assertIn("Loaded 3 rows", log.output[0])
+        pd.testing.assert_frame_equal(self.service.df, self.full_load())
+
+    def test_reload_rewritten_file(self):
+        """
+        Tests that a rewritten file is loaded again as a whole
+        """
+        self.service.reload()
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\nForza 6,XOne,Racing,1.9\n")
+
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(self.service.reload())
+            self.assertIn("Loaded 1 rows", log.output[0])
+        pd.testing.assert_frame_equal(self.service.df, self.full_load())
+
+    def test_reload_compressed_file(self):
+        """
+        Tests that a gzipped file is decompressed and loaded again as a whole when it changes
+        """
+        gzip_path = self.data_path + ".gz"
+        self.full_load().to_csv(gzip_path, index=False)
+        service = ChartService(gzip_path, self.features, self.classes, {'platform': 'category', 'genre': 'category'})
+
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(service.reload())
+            self.assertIn("Loaded 4 rows", log.output[0])
+        pd.testing.assert_frame_equal(service.df, self.full_load())
+        self.assertFalse(service.reload())
+
+        self.append("Forza 6,XOne,Racing,1.9\n")
+        self.full_load().to_csv(gzip_path, index=False)
+        self.assertTrue(service.reload())
+        pd.testing.assert_frame_equal(service.df, self.full_load())
+
+    def test_reload_rewritten_middle(self):
+        """
+        Tests that a rewrite in the middle of a large file, keeping its size, is loaded again as a whole
+        """
+        rows = ["Halo 5,XOne,Shooter,2.5\n"] * 10000
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\n" + "".join(rows))
+        self.service.reload()
+
+        rows[5000] = "FIFA 16,PS4,Sports,1.00\n"
+        with open(self.data_path, 'w') as file:
+            file.write("name,platform,genre,na_sales\n" + "".join(rows))
+        self.append("Forza 6,XOne,Racing,1.9\n")
+
+        with self.assertLogs(level='INFO') as log:
+            self.assertTrue(self.service.reload())
+            self.assertIn("Loaded 10001 rows", log.output[0])
+        pd.testing.assert_frame_equal(self.service.df, self.full_load())
+
+    def test_chart_cache(self):
+        """
+        Tests that repeated charts are served from the cache until the data changes, evicting the least recent
+        """
+        self.service.reload()
+        png, hit = self.service.chart()
+        self.assertTrue(png.startswith(PNG_SIGNATURE))
+        self.assertFalse(hit)
+        self.assertEqual(self.service.chart(), (png, True))
+
+        self.service.chart(['genre', 'platform'], {})
+        self.service.chart(['platform', 'genre'], {})
+        self.assertFalse(self.service.chart()[1])
+
+        self.append("Forza 6,XOne,Racing,1.9\n")
+        self.service.reload()
+        self.assertFalse(self.service.chart()[1])
+
+        stats = self.service.stats()
+        self.assertEqual((stats["requests"], stats["hits"], stats["misses"]), (6, 1, 5))
+        self.assertGreater(stats["p99_ms"], 0)
+
+    def test_chart_counts(self):
+        """
+        Tests that the charted counts equal those of Transform on the resident data
+        """
+        self.service.reload()
+        transform = Transform(self.full_load(), self.features, self.classes)
+        transform.clean_data()
+        transform.group_and_count()
+        expected = transform.sort_data()
+
+        self.service.chart()
+
+        heights = [path.vertices[1, 1] for path in self.service._bar_plot.ax.collections[0].get_paths()]
+        self.assertEqual(sorted(heights), sorted(expected['count'].astype(float)))
+
+    def test_chart_invalid_features(self):
+        """
+        Tests that a chart of other than two known features or of malformed classes is rejected
+        """
+        self.service.reload()
+        with self.assertRaises(ValueError):
+            self.service.chart(['platform'])
+        with self.assertLogs(level='ERROR'):
+            with self.assertRaises(ValueError):
+                self.service.chart(['platform', 'publisher'])
+        for classes in (["PS4"], {'platform': "PS4"}):
+            with self.subTest(classes=classes):
+                with self.assertRaises(ValueError):
+                    self.service.chart(self.features, classes)
+
+    def test_http_interface(self):
+        """
+        Tests charts, errors and metrics served over HTTP on a free port
+        """
+        self.service.reload()
+        server = self.serve(port=0)
+        connection = http.client.HTTPConnection(*server.server_address)
+        self.addCleanup(connection.close)
+
+        query = "/chart?features=genre,platform&classes=" + json.dumps({'genre': ['Sports', 'Racing']})
+        for cache in ("miss", "hit"):
+            connection.request("GET", query.replace(" ", "%20"))
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.getheader("Content-Type"), "image/png")
+            self.assertEqual(response.getheader("X-Cache"), cache)
+            self.assertTrue(response.read().startswith(PNG_SIGNATURE))
+
+        with self.assertLogs(level='ERROR'):
+            connection.request("GET", "/chart?features=platform,publisher")
+            response = connection.getresponse()
+        self.assertEqual(response.status, 400)
+        response.read()
+        for classes in (["PS4"], {'platform': "PS4"}):
+            connection.request("GET", "/chart?features=platform,genre&classes=" + json.dumps(classes).replace(" ", ""))
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400)
+            response.read()
+
+        connection.request("GET", "/metrics")
+        metrics = json.loads(connection.getresponse().read())
+        self.assertEqual((metrics["hits"], metrics["misses"], metrics["errors"]), (1, 1, 3))
+
+    def test_unix_socket_interface(self):
+        """
+        Tests charts served over a Unix socket
+        """
+        self.service.reload()
+        socket_path = os.path.join(self.tmp_dir.name, "charts.sock")
+        self.serve(socket_path=socket_path)
+        connection = UnixHTTPConnection(socket_path)
+        self.addCleanup(connection.close)
+
+        connection.request("GET", "/chart")
+        response = connection.getresponse()
+
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.read().startswith(PNG_SIGNATURE))
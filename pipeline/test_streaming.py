@@ -0,0 +1,136 @@
+from unittest import TestCase, mock
+from pipeline.streaming import StreamingAggregator
+from lessons.extract.load_data import Loader
+from lessons.extract.stub_server import StubServer
+from lessons.transform.transform_data import Transform
+import io
+import os
+import tempfile
+import threading
+import time
+import pandas as pd
+import requests
+
+
+class TestStreamingAggregator(TestCase):
+    """
+    Unit tests for the StreamingAggregator class, focusing on equality with the sequential path
+    """
+    def setUp(self):
+        """
+        Builds a CSV payload with quoted separators and line breaks
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        df = pd.DataFrame({'name': ['Call of Duty, "Black Ops"', 'Multi\nline', 'Plain', 'Other'] * 50,
+                           'platform': ['PS4', 'PC', None, 'XOne'] * 50,
+                           'genre': ['Shooter', 'Action', 'Sports', None] * 50,
+                           'rating': ['M', None, 'E', 'T'] * 50})
+        self.payload = df.to_csv(index=False).encode()
+        self.features = ['platform', 'genre']
+        self.classes = {'platform': ['PS4', 'XOne', 'PC']}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def expected(self, legacy_dropna=False) -> pd.DataFrame:
+        transform = Transform(pd.read_csv(io.BytesIO(self.payload)), self.features, self.classes, legacy_dropna)
+        transform.clean_data()
+        transform.group_and_count()
+        return transform.sort_data()
+
+    def test_aggregate_matches_sequential(self):
+        """
+        Tests that counting during the download equals counting the saved file
+        and that the downloaded bytes are saved unchanged
+        """
+        for legacy_dropna in (False, True):
+            for engine in ("groupby", "bincount"):
+                with self.subTest(legacy_dropna=legacy_dropna, engine=engine):
+                    with StubServer(self.payload, chunk_size=100) as server:
+                        aggregator = StreamingAggregator(Loader(server.url, self.save_path, chunk_size=64),
+                                                         self.features, self.classes, legacy_dropna, engine,
+                                                         queue_size=2, block_size=256)
+                        df = aggregator.aggregate()
+                    pd.testing.assert_frame_equal(df, self.expected(legacy_dropna))
+                    with open(self.save_path, 'rb') as file:
+                        self.assertEqual(file.read(), self.payload)
+
+    def test_aggregate_builds_cache_after_counting(self):
+        """
+        Tests that the eager cache is built once the download is counted, not in the download thread
+        """
+        cache_path = os.path.join(self.tmp_dir.name, "dataset.feather")
+        with StubServer(self.payload) as server:
+            loader = Loader(server.url, self.save_path, cache_path=cache_path, eager_cache=True)
+            threads = []
+            with mock.patch.object(loader, 'build_cache', side_effect=lambda: threads.append(threading.current_thread())):
+                df = StreamingAggregator(loader, self.features, self.classes).aggregate()
+
+        self.assertEqual(threads, [threading.main_thread()])
+        pd.testing.assert_frame_equal(df, self.expected())
+
+    def test_aggregate_overlaps_download(self):
+        """
+        Tests that rows are parsed before a throttled download finishes
+        """
+        parsed_at = []
+        with StubServer(self.payload, chunk_size=1024, throttle=0.1) as server:
+            loader = Loader(server.url, self.save_path, chunk_size=1024)
+            ingest_stream = loader.ingest_stream
+
+            def record(*args, **kwargs):
+                for block in ingest_stream(*args, **kwargs):
+                    parsed_at.append(time.perf_counter())
+                    yield block
+
+            with mock.patch.object(loader, 'ingest_stream', side_effect=record):
+                StreamingAggregator(loader, self.features, self.classes, block_size=1024).aggregate()
+            finished_at = time.perf_counter()
+
+        self.assertGreater(len(parsed_at), 1)
+        self.assertLess(parsed_at[0], finished_at - 0.2)
+
+    def test_aggregate_skips_unchanged_file(self):
+        """
+        Tests that an up-to-date file is neither downloaded nor counted again,
+        unlike a failed download
+        """
+        with StubServer(self.payload, etag='"v1"') as server:
+            loader = Loader(server.url, self.save_path)
+            self.assertIsNotNone(StreamingAggregator(loader, self.features, self.classes).aggregate())
+            self.assertIsNone(StreamingAggregator(loader, self.features, self.classes).aggregate())
+            self.assertEqual(server.requests[-1].get("If-None-Match"), '"v1"')
+            self.assertTrue(loader.up_to_date)
+
+        with self.assertLogs(level='ERROR'):
+            self.assertIsNone(StreamingAggregator(loader, self.features, self.classes).aggregate())
+        self.assertFalse(loader.up_to_date)
+
+    def test_aggregate_failed_parsing(self):
+        """
+        Tests that a parsing error stops the download and removes the partial file
+        """
+        def ingest_stream(chunks, *args, **kwargs):
+            next(chunks)
+            raise ValueError("Unparsable chunk")
+            yield
+
+        with StubServer(self.payload, chunk_size=100) as server:
+            loader = Loader(server.url, self.save_path, chunk_size=64)
+            with mock.patch.object(loader, 'ingest_stream', side_effect=ingest_stream):
+                with self.assertRaises(ValueError):
+                    StreamingAggregator(loader, self.features, self.classes, queue_size=1).aggregate()
+        self.assertFalse(os.path.exists(self.save_path))
+        self.assertFalse(os.path.exists(self.save_path + ".part"))
+
+    def test_aggregate_interrupted_download(self):
+        """
+        Tests that an interrupted download raises instead of returning partial counts
+        """
+        with StubServer(self.payload, truncate_at=len(self.payload) // 2) as server:
+            aggregator = StreamingAggregator(Loader(server.url, self.save_path), self.features, self.classes,
+                                             block_size=256)
+            with self.assertRaises(requests.exceptions.RequestException):
+                aggregator.aggregate()
+        self.assertFalse(os.path.exists(self.save_path))